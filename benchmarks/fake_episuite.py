@@ -0,0 +1,219 @@
+# benchmarks/fake_episuite.py
+
+"""A fake EPI Suite installation for benchmarks and integration tests.
+
+``install`` writes ``epiwin1.exe`` and ``STPWIN32.exe`` into a directory as
+executable copies of this module. When run, they sleep for a configurable
+model latency and write realistic ``tabout.txt``, ``sumbrief.epi`` and
+``cas_res.txt`` files, so the whole runner can be exercised without EPI
+Suite. The executables are Python scripts and need a POSIX platform.
+"""
+
+import hashlib
+import json
+import stat
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CONFIG_NAME = "fake_config.json"
+
+KNOWN_SMILES = {
+    "71-43-2": "c1ccccc1",
+    "67-64-1": "CC(=O)C",
+    "67-66-3": "ClC(Cl)Cl",
+    "50-32-8": "c1ccc2c(c1)cc1ccc3cccc4ccc2c1c34",
+    "108-88-3": "Cc1ccccc1",
+    "64-17-5": "CCO",
+}
+
+TABOUT_COLUMNS = [
+    "Chemical name",
+    "SMILES",
+    "CAS Number",
+    "Mol Wt",
+    "Estimated Log Kow ",
+    "Measured Log Kow  ",
+    "Water Solubility (mg/L)",
+    "Henry LC (atm-m3/mole)",
+    "BIOWIN1 (Linear)",
+    "BIOWIN2 (Non-Linear)",
+    "BIOWIN3 (Ultimate)",
+    "BIOWIN4 (Primary)",
+    "BIOWIN5 (MITI Linear)",
+    "BIOWIN6 (MITI Non-Linear)",
+    "BIOWIN7 (Anaerobic)",
+    "Ready Biodegradability Prediction",
+    "Biowin Model",
+    "Half-life Units",
+    "Experimental Database Match",
+    "STP Total Removal (%)",
+    "STP Biodegradation (%)",
+    "STP Sludge Adsorption (%)",
+    "STP Volatilization (%)",
+    "User Notes",
+    "Reserved",
+]
+
+STP_COLUMNS = TABOUT_COLUMNS[-6:-2]
+
+
+def _unit(smiles: str, salt: str) -> float:
+    """Deterministic pseudo-random value in [0, 1) for a structure."""
+    digest = hashlib.md5(f"{salt}:{smiles}".encode("utf-8")).hexdigest()
+    return int(digest[:8], 16) / 0x100000000
+
+
+def _stp_values(smiles: str, halflife: float) -> List[str]:
+    """STP removal percentages for a structure and biodegradation half-life."""
+    biodeg = 100 * _unit(smiles, "biodeg") / (1 + halflife / 10)
+    sludge = (100 - biodeg) * _unit(smiles, "sludge") * 0.5
+    volatil = (100 - biodeg - sludge) * _unit(smiles, "air") * 0.5
+    return [f"{biodeg + sludge + volatil:.2f}", f"{biodeg:.2f}", f"{sludge:.2f}", f"{volatil:.2f}"]
+
+
+def _tabout_row(name: str, smiles: str, halflife: float) -> List[str]:
+    """One realistic tabout row, with padded numbers and blank columns."""
+    log_kow = 6 * _unit(smiles, "kow") - 1
+    biowins = [f" {_unit(smiles, f'biowin{i}'):.4f}" for i in range(1, 8)]
+    return [
+        name,
+        smiles,
+        name,
+        f"{12.011 * len(smiles):.2f}",
+        f" {log_kow:.2f}",
+        f"{log_kow + 0.1:.2f} " if _unit(smiles, "measured") > 0.5 else "",
+        f"{10 ** (4 - log_kow):.4g}",
+        f"{_unit(smiles, 'henry') * 1e-3:.3E}",
+        *biowins,
+        "Yes" if _unit(smiles, "ready") > 0.5 else "No",
+        "BIOWIN",
+        "hours",
+        "",
+        *_stp_values(smiles, halflife),
+        "",
+        "",
+    ]
+
+
+def _read_config() -> Dict:
+    """Read the fake's behaviour settings from the working directory."""
+    path = Path(CONFIG_NAME)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _halflife() -> float:
+    """Read the active biodegradation half-life from stpvalsx."""
+    lines = Path("stpvalsx").read_text().split()
+    return float(lines[2]) if len(lines) > 2 and lines[0] != "1" else 10000.0
+
+
+def _epiwin(args: List[str], config: Dict) -> int:
+    """Emulate epiwin1.exe in batch mode."""
+    lines = Path(args[0]).read_text().splitlines()
+    time.sleep(config.get("startup", 0.0))
+
+    if lines and lines[0] == "CAS":
+        time.sleep(config.get("latency", 0.0))
+        known = {**KNOWN_SMILES, **config.get("smiles", {})}
+        Path("cas_res.txt").write_text(known.get(lines[1].strip(), "") + "\n")
+        return 0
+
+    rows = []
+    summary = []
+    halflife = _halflife()
+    for i, line in enumerate(lines):
+        if line.strip() != "CALCULATE":
+            continue
+        smiles, name = lines[i + 1].strip(), lines[i + 2].strip()
+        if config.get("hang") and config["hang"] in smiles:
+            time.sleep(3600)
+        if config.get("fail") and config["fail"] in smiles:
+            return 1
+        time.sleep(config.get("latency", 0.0))
+        row = _tabout_row(name, smiles, halflife)
+        rows.append("\t".join(row))
+        summary = [f"{col.strip()}: {value.strip()}" for col, value in zip(TABOUT_COLUMNS, row) if value.strip()]
+
+    Path("tabout.txt").write_text("\n".join(["\t".join(TABOUT_COLUMNS)] + rows) + "\n")
+    Path("sumbrief.epi").write_text("\n".join(summary) + "\n")
+    Path("epi_temp.epi").write_text("\n".join(rows))
+    return 0
+
+
+def _stpwin(config: Dict) -> int:
+    """Emulate STPWIN32.exe rerunning STP for the staged chemical."""
+    lines = Path("epi_inp.txt").read_text().splitlines()
+    time.sleep(config.get("stp_latency", 0.0))
+    rows = [
+        "\t".join(_stp_values(lines[i + 1].strip(), _halflife()))
+        for i, line in enumerate(lines) if line.strip() == "CALCULATE"
+    ]
+    Path("tabout.txt").write_text("\n".join(["\t".join(STP_COLUMNS)] + rows) + "\n")
+    return 0
+
+
+def main() -> int:
+    """Dispatch on the executable name."""
+    config = _read_config()
+    if Path(sys.argv[0]).name.lower().startswith("stpwin"):
+        return _stpwin(config)
+    return _epiwin(sys.argv[1:], config)
+
+
+def install(
+    path: Path,
+    latency: float = 0.0,
+    startup: float = 0.0,
+    stp_latency: float = 0.0,
+    fail: Optional[str] = None,
+    hang: Optional[str] = None,
+    smiles: Optional[Dict[str, str]] = None
+) -> Path:
+    """
+    Create a fake EPI Suite installation.
+
+    Args:
+        path: Directory to install into (created if missing)
+        latency: Seconds of simulated model time per chemical
+        startup: Seconds of simulated process startup per launch
+        stp_latency: Seconds of simulated STPWIN32 model time per launch
+        fail: Exit with an error when a SMILES contains this substring (optional)
+        hang: Never finish when a SMILES contains this substring (optional)
+        smiles: Extra CAS RN to SMILES lookups (optional)
+
+    Returns:
+        The installation directory, suitable for ``EPySuiteConfig.es_dir``
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    source = f"#!{sys.executable}\n" + Path(__file__).read_text()
+    for name in ("epiwin1.exe", "STPWIN32.exe"):
+        executable = path / name
+        executable.write_text(source)
+        executable.chmod(executable.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    settings = {
+        "latency": latency,
+        "startup": startup,
+        "stp_latency": stp_latency,
+        "fail": fail,
+        "hang": hang,
+        "smiles": smiles or {},
+    }
+    (path / CONFIG_NAME).write_text(json.dumps(settings))
+    return path
+
+
+def write_tabout(path: Path, rows: int) -> Path:
+    """Write a tabout file with ``rows`` synthetic chemicals, for parser benchmarks."""
+    with open(path, "w") as file:
+        file.write("\t".join(TABOUT_COLUMNS) + "\n")
+        for i in range(rows):
+            smiles = "C" * (1 + i % 40) + "O" * (i % 3)
+            file.write("\t".join(_tabout_row(f"{i}-00-0", smiles, 10000.0)) + "\n")
+    return path
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# benchmarks/run_benchmarks.py
+
+"""Benchmark EPYSuite's own overhead, parsing throughput and batch and job queue scaling.
+
+Runs against the fake installation from ``benchmarks.fake_episuite`` and
+writes machine-readable JSON for comparing releases:
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --quick
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import replace
+from itertools import product
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import epysuite
+from epysuite import EPySuiteConfig, EPySuiteRunner, STPConfig
+from epysuite.accumulator import ResultAccumulator
+from epysuite.jobs import JobQueue
+from epysuite.utils import clean_outputs, iter_tabout, parse_tabout, read_tabout
+from epysuite.workspace import Workspace, tmpfs_root
+
+from .fake_episuite import install, write_tabout
+
+
+def _timings(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Time repeated calls of ``func`` in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "mean": statistics.mean(samples),
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "repeat": repeat,
+    }
+
+
+def bench_call_overhead(root: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Measure per-call time spent in epysuite itself around the EPI Suite process."""
+    es_dir = install(root / "overhead")
+    runner = EPySuiteRunner(EPySuiteConfig(es_dir=es_dir))
+    config = runner.config
+    runner.get_data("71-43-2", smiles="c1ccccc1")
+
+    results = {
+        "update_input_config": _timings(lambda: runner._update_input_config("71-43-2", "c1ccccc1"), repeat),
+        "update_stp_config": _timings(lambda: runner._update_stp_config(STPConfig()), repeat),
+        "clean_outputs": _timings(lambda: clean_outputs(config.es_dir), repeat),
+        "clean_outputs_tracked": _timings(runner._clean_outputs, repeat),
+    }
+    runner._run_episuite()
+    results["parse_tabout"] = _timings(lambda: parse_tabout(config.tabout_path), repeat)
+    results["subprocess"] = _timings(
+        lambda: subprocess.run(runner._command(), cwd=str(config.es_dir), check=True), repeat
+    )
+    results["get_data"] = _timings(lambda: runner.get_data("71-43-2", smiles="c1ccccc1"), repeat)
+    results["overhead"] = {
+        "mean": results["get_data"]["mean"] - results["subprocess"]["mean"],
+        "median": results["get_data"]["median"] - results["subprocess"]["median"],
+    }
+
+    # The same calls from a workspace staged on tmpfs, where available
+    if tmpfs_root() is not None:
+        with Workspace.create(replace(config, workspace_tmpfs=True)) as workspace:
+            tmpfs_runner = runner._for_workspace(workspace)
+            results["get_data_tmpfs"] = _timings(
+                lambda: tmpfs_runner._compute("71-43-2", "c1ccccc1", STPConfig(), None), repeat
+            )
+    return results
+
+
+def bench_parse(root: Path, sizes: List[int], repeat: int) -> List[Dict[str, float]]:
+    """Measure tabout parsing throughput for both DataFrame backends, whole and in chunks."""
+    results = []
+    for rows in sizes:
+        path = write_tabout(root / f"tabout_{rows}.txt", rows)
+        for format, mode in product(("polars", "pandas"), ("whole", "chunked")):
+            if mode == "whole":
+                timing = _timings(lambda: parse_tabout(path, format=format), repeat)
+            else:
+                timing = _timings(lambda: deque(iter_tabout(path, format=format, chunk_rows=10000), 0), repeat)
+            results.append({
+                "rows": rows,
+                "format": format,
+                "mode": mode,
+                "bytes": path.stat().st_size,
+                "rows_per_second": rows / timing["median"],
+                **timing,
+            })
+    return results
+
+
+def bench_assembly(root: Path, rows: int, repeat: int) -> List[Dict[str, float]]:
+    """Compare assembling per-chemical results with reading them as one table."""
+    path = write_tabout(root / f"assembly_{rows}.txt", rows)
+    columns, cells = read_tabout(path)
+
+    def assemble(format: str) -> None:
+        results = ResultAccumulator()
+        for i, row in enumerate(cells):
+            results.add(columns, [row], cas_rn=f"{i}-00-0")
+        results.to_frame(format)
+
+    results = []
+    for format in ("polars", "pandas"):
+        methods = {
+            "one_table": lambda: parse_tabout(path, format=format),
+            "accumulator": lambda: assemble(format),
+        }
+        for method, func in methods.items():
+            results.append({"rows": rows, "format": format, "method": method, **_timings(func, repeat)})
+    return results
+
+
+def bench_scaling(
+    root: Path,
+    chemicals: int,
+    workers: List[int],
+    chunk_sizes: List[int],
+    latency: float
+) -> List[Dict[str, float]]:
+    """Measure batch throughput as workers and chunk size grow."""
+    es_dir = install(root / "scaling", latency=latency)
+    runner = EPySuiteRunner(EPySuiteConfig(es_dir=es_dir, workspace_root=root / "workspaces"))
+    records = [(f"{i}-00-0", "C" * (1 + i % 20)) for i in range(chemicals)]
+
+    results = []
+    for chunk_size in chunk_sizes:
+        for count in workers:
+            start = time.perf_counter()
+            runner.get_data_batch(records, workers=count, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "workers": count,
+                "chunk_size": chunk_size,
+                "chemicals": chemicals,
+                "latency": latency,
+                "seconds": elapsed,
+                "chemicals_per_second": chemicals / elapsed,
+            })
+    return results
+
+
+def bench_queue(root: Path, chemicals: int, processes: List[int], latency: float) -> List[Dict[str, float]]:
+    """Measure job queue throughput as worker processes are attached."""
+    es_dir = install(root / "queue", latency=latency)
+    records = [(f"{i}-00-0", "C" * (1 + i % 20)) for i in range(chemicals)]
+
+    results = []
+    for count in processes:
+        path = root / f"jobs-{count}.db"
+        JobQueue(path).submit(records)
+        start = time.perf_counter()
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "epysuite", "work", str(path), "--es-dir", str(es_dir)],
+                stderr=subprocess.DEVNULL
+            )
+            for _ in range(count)
+        ]
+        for worker in workers:
+            worker.wait()
+        elapsed = time.perf_counter() - start
+        results.append({
+            "processes": count,
+            "chemicals": chemicals,
+            "latency": latency,
+            "seconds": elapsed,
+            "chemicals_per_second": chemicals / elapsed,
+        })
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the benchmarks and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write JSON results here instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a smoke run")
+    args = parser.parse_args(argv)
+
+    if sys.platform == "win32":
+        parser.error("the fake EPI Suite executables require a POSIX platform")
+
+    repeat = 3 if args.quick else 20
+    sizes = [1, 1000] if args.quick else [1, 1000, 100000]
+    workers = [1, 2] if args.quick else sorted({1, 2, 4, os.cpu_count() or 1})
+    chunk_sizes = [1, 10]
+
+    with tempfile.TemporaryDirectory(prefix="epysuite-bench-") as tmp:
+        root = Path(tmp)
+        results = {
+            "meta": {
+                "epysuite": epysuite.__version__,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "call_overhead": bench_call_overhead(root, repeat),
+            "parse": bench_parse(root, sizes, repeat),
+            "assembly": bench_assembly(root, sizes[-1], 3),
+            "scaling": bench_scaling(
+                root,
+                chemicals=20 if args.quick else 200,
+                workers=workers,
+                chunk_sizes=chunk_sizes,
+                latency=0.01 if args.quick else 0.05
+            ),
+            "queue": bench_queue(
+                root,
+                chemicals=20 if args.quick else 200,
+                processes=workers,
+                latency=0.01 if args.quick else 0.05
+            ),
+        }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
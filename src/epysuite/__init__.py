@@ -2,27 +2,75 @@
 
 """EPYSuite: A Python interface for EPI Suite™."""
 
-from .config import EPySuiteConfig, STPConfig
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .batch import BatchRecord
+from .cache import ResultCache
+from .config import EPySuiteConfig, ModelConfig, SchedulerPolicy, STPConfig
 from .exceptions import (
     ConfigurationError,
     EPYSuiteError,
     ExecutionError,
     FileHandlingError,
+    SmilesNotFoundError,
     TimeoutError,
+    ValidationError,
 )
+from .metrics import MetricEvent, Metrics
 from .runner import EPySuiteRunner
 
+if TYPE_CHECKING:
+    from .async_runner import AsyncEPySuiteRunner
+    from .jobs import JobQueue
+    from .server import EPySuiteClient, EPySuiteServer
+    from .sinks import CsvSink, ParquetSink
+
 __version__ = "0.1.0"
 __author__ = "Ben Leonard"
 __license__ = "MIT"
 
 __all__ = [
     "EPySuiteRunner",
+    "AsyncEPySuiteRunner",
+    "EPySuiteServer",
+    "EPySuiteClient",
     "EPySuiteConfig",
     "STPConfig",
+    "ModelConfig",
+    "SchedulerPolicy",
+    "BatchRecord",
+    "ResultCache",
+    "JobQueue",
+    "ParquetSink",
+    "CsvSink",
+    "Metrics",
+    "MetricEvent",
     "EPYSuiteError",
     "ConfigurationError",
     "ExecutionError",
     "TimeoutError",
     "FileHandlingError",
-]
\ No newline at end of file
+    "SmilesNotFoundError",
+    "ValidationError",
+]
+
+# Loaded on first access, so importing epysuite does not pull in asyncio or http.server
+_LAZY = {
+    "AsyncEPySuiteRunner": ".async_runner",
+    "EPySuiteServer": ".server",
+    "EPySuiteClient": ".server",
+    "JobQueue": ".jobs",
+    "ParquetSink": ".sinks",
+    "CsvSink": ".sinks",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the lazily loaded public classes on first access."""
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
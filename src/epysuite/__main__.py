@@ -0,0 +1,9 @@
+# src/epysuite/__main__.py
+
+"""Allow running the command-line interface with ``python -m epysuite``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,101 @@
+# src/epysuite/accumulator.py
+
+"""Columnar assembly of many EPI Suite results into a single DataFrame."""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .backends import Frame, get_backend
+
+
+def _text(value: Any) -> Optional[str]:
+    """Convert a cell to the raw text form EPI Suite writes."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) else repr(value)
+    return str(value)
+
+
+class ResultAccumulator:
+    """Buffer for batch results that builds one frame under a shared schema.
+
+    Added rows are kept as plain Python values, grouped by column layout
+    (normally one group for a whole batch). ``to_frame`` transposes each
+    group into one list of raw text cells per column, backfilling columns
+    missing from some results, then types every column once with the
+    ``parse_tabout`` rules. No per-chemical DataFrames are created and all
+    chemicals share the same column types.
+    """
+
+    def __init__(self, keys: Sequence[str] = ("cas_rn",)):
+        """
+        Create an empty accumulator.
+
+        Args:
+            keys: Names of the key columns placed first in the result, given
+                with every ``add`` call
+        """
+        self.keys = list(keys)
+        self._keys: Dict[str, List[Any]] = {name: [] for name in self.keys}
+        self._groups: List[Tuple[List[str], List[List[Any]]]] = []
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def add(self, columns: List[str], rows: List[List[Any]], **keys: Union[Any, List[Any]]) -> None:
+        """
+        Append result rows.
+
+        Args:
+            columns: Column names of the rows
+            rows: Row values, as raw text or already typed
+            **keys: Value of each key column, constant or one per row
+        """
+        count = len(rows)
+        for name in self.keys:
+            value = keys[name]
+            self._keys[name].extend(value if isinstance(value, list) else [value] * count)
+        if self._groups and self._groups[-1][0] == columns:
+            self._groups[-1][1].extend(rows)
+        else:
+            self._groups.append((list(columns), list(rows)))
+        self._length += count
+
+    def _text_columns(self) -> Dict[str, List[Optional[str]]]:
+        """Transpose the buffered rows into one list of text cells per column."""
+        buffers: Dict[str, List[Optional[str]]] = {}
+        length = 0
+        for columns, rows in self._groups:
+            for name, values in zip(columns, zip(*rows)):
+                buffer = buffers.get(name)
+                if buffer is None:
+                    buffer = buffers[name] = [None] * length
+                elif len(buffer) > length:
+                    continue  # A repeated column name keeps its first occurrence
+                buffer.extend(
+                    value if value is None or value.__class__ is str else _text(value)
+                    for value in values
+                )
+            length += len(rows)
+            for buffer in buffers.values():
+                if len(buffer) < length:
+                    buffer.extend([None] * (length - len(buffer)))
+        return buffers
+
+    def to_frame(self, format: str = "polars", **options: Any) -> Frame:
+        """
+        Type the buffered columns and build one frame with the key columns first.
+
+        Args:
+            format: Output format ("polars", "pandas", "pyarrow" or "records")
+            **options: Backend options, e.g. ``downcast=True`` for pandas
+        """
+        backend = get_backend(format, **options)
+        if not self._length:
+            return backend.concat([])
+        df = backend.from_text_columns(self._text_columns())
+        for name in reversed(self.keys):
+            df = backend.insert_column(df, name, self._keys[name])
+        return df
@@ -0,0 +1,160 @@
+# src/epysuite/async_runner.py
+
+"""asyncio interface for running EPI Suite calculations."""
+
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+from .backends import Frame
+from .config import EPySuiteConfig, STPConfig
+from .exceptions import ConfigurationError, ExecutionError, TimeoutError
+from .metrics import Metrics
+from .process import group_options, kill_tree
+from .runner import EPySuiteRunner
+from .workspace import Workspace
+
+
+class AsyncEPySuiteRunner:
+    """Run EPI Suite calculations from asyncio code without blocking the event loop.
+
+    EPI Suite processes are started with ``asyncio.create_subprocess_exec``.
+    Each request borrows one of ``max_concurrency`` isolated workspaces from
+    a queue that doubles as the concurrency semaphore, so any number of
+    in-flight requests share a bounded number of EPI Suite processes.
+    """
+
+    def __init__(
+        self,
+        config: Optional[EPySuiteConfig] = None,
+        max_concurrency: Optional[int] = None,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Initialize the runner with configuration.
+
+        Args:
+            config: EPI Suite configuration (optional)
+            max_concurrency: Number of workspaces, i.e. concurrent EPI Suite
+                processes (defaults to config.workers)
+            metrics: Collector for per-stage timings, exit codes and output sizes (optional)
+        """
+        self.runner = EPySuiteRunner(config, metrics=metrics)
+        self.config = self.runner.config
+        self.max_concurrency = max_concurrency or self.config.workers
+        if self.max_concurrency < 1:
+            raise ConfigurationError(f"max_concurrency must be at least 1, got {self.max_concurrency}")
+        self._workspaces: List[Workspace] = []
+        self._available: Optional["asyncio.Queue[Workspace]"] = None
+
+    async def start(self) -> None:
+        """Stage the workspaces; called automatically by the first request."""
+        if self._available is not None:
+            return
+        available: "asyncio.Queue[Workspace]" = asyncio.Queue()
+        try:
+            for _ in range(self.max_concurrency):
+                workspace = Workspace.create(self.config)
+                self._workspaces.append(workspace)
+                available.put_nowait(workspace)
+        except Exception:
+            await self.close()
+            raise
+        self._available = available
+
+    async def close(self) -> None:
+        """Remove the workspaces."""
+        for workspace in self._workspaces:
+            workspace.cleanup()
+        self._workspaces = []
+        self._available = None
+
+    async def __aenter__(self) -> "AsyncEPySuiteRunner":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_data(
+        self,
+        cas_rn: str,
+        smiles: Optional[str] = None,
+        stp_config: Optional[STPConfig] = None,
+        columns: Optional[List[str]] = None
+    ) -> Frame:
+        """
+        Get EPI Suite data for a compound.
+
+        Args:
+            cas_rn: CAS Registry Number
+            smiles: SMILES notation (optional)
+            stp_config: STP configuration (optional)
+            columns: Output columns to parse, in order (defaults to config.output_columns)
+
+        Returns:
+            DataFrame containing EPI Suite results
+        """
+        self.runner._validate(cas_rn, smiles)
+        stp_config = stp_config or STPConfig()
+        columns = self.config.output_columns if columns is None else list(columns)
+
+        # Serve repeated runs from the result cache
+        key = self.runner._cache_key(cas_rn, smiles, stp_config, columns)
+        cached = self.runner._cached_result(key)
+        if cached is not None:
+            return cached
+
+        await self.start()
+        workspace = await self._available.get()
+        try:
+            runner = self.runner._for_workspace(workspace)
+            runner._clean_outputs()
+
+            if smiles is None:
+                with runner._stage("lookup_smiles"):
+                    smiles = runner._known_smiles(cas_rn)
+                    if smiles is None:
+                        runner._write_staged(runner.config.input_path, ["CAS", cas_rn], lookup=True)
+                        await self._run(runner, "SMILES lookup", cas_rn)
+                        smiles = runner._read_lookup(cas_rn)
+
+            with runner._stage("write_input"):
+                runner._update_input_config(cas_rn, smiles)
+                runner._update_stp_config(stp_config)
+            with runner._stage("run_episuite"):
+                await self._run(runner, "Execution", cas_rn)
+
+            df = runner._parse_results(columns)
+        finally:
+            self._available.put_nowait(workspace)
+
+        self.runner._store_result(key, cas_rn, df)
+        return df
+
+    async def _run(self, runner: EPySuiteRunner, action: str, cas_rn: str) -> None:
+        """Run EPI Suite in a workspace, killing it on timeout or cancellation."""
+        command = runner._command()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=str(runner.config.es_dir),
+                **group_options()
+            )
+        except OSError as err:
+            raise ExecutionError(f"Could not start {command[0]}: {err}") from err
+        try:
+            returncode = await asyncio.wait_for(process.wait(), timeout=self.config.timeout)
+        except asyncio.TimeoutError as err:
+            if runner.metrics is not None:
+                runner.metrics.increment("process_timeouts_total", program=Path(command[0]).name)
+            raise TimeoutError(f"{action} timed out for CAS RN: {cas_rn}") from err
+        finally:
+            if process.returncode is None:
+                kill_tree(process.pid)
+                process.kill()
+                await process.wait()
+        if runner.metrics is not None:
+            runner.metrics.increment("process_exits_total", program=Path(command[0]).name, code=str(returncode))
+        if returncode != 0:
+            raise ExecutionError(f"{action} failed for CAS RN: {cas_rn} (exit code {returncode})")
@@ -0,0 +1,718 @@
+# src/epysuite/backends.py
+
+"""Lazily loaded DataFrame backends for EPI Suite results.
+
+Each backend wraps one output format: polars or pandas DataFrames, pyarrow
+Tables, or plain lists of row dicts ("records"). A backend imports its
+library when it is first requested, so importing epysuite (or starting a
+worker process) only pays for the format actually in use.
+"""
+
+import csv
+import io
+from itertools import islice
+from numbers import Real
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+Frame = Union["pl.DataFrame", "pd.DataFrame", "pa.Table", List[Dict[str, Any]]]
+Table = Tuple[List[str], List[List[Any]]]
+TextColumns = Dict[str, List[Optional[str]]]
+# Column names mapped to whether the column is numeric (float) rather than text
+ColumnTypes = Dict[str, bool]
+
+# Rows per chunk when streaming a tabout file
+DEFAULT_CHUNK_ROWS = 50000
+
+
+def read_header(path: Path) -> List[str]:
+    """Read the column names of a tab-separated file."""
+    with open(path, "r", newline="") as file:
+        return next(csv.reader(file, delimiter="\t"), [])
+
+
+def project(header: List[str], columns: Optional[List[str]]) -> Optional[List[str]]:
+    """Return the requested columns present in a header, in request order (None keeps all)."""
+    if columns is None:
+        return None
+    present = set(header)
+    return [name for name in dict.fromkeys(columns) if name in present]
+
+
+def read_cells(
+    path: Path,
+    columns: Optional[List[str]] = None
+) -> Tuple[List[str], List[List[Optional[str]]]]:
+    """Read the header and stripped cells of a tab-separated file, with blank cells as None.
+
+    Short rows are padded and long rows truncated to the header width. With
+    ``columns``, only those columns (in that order) are kept.
+    """
+    with open(path, "r", newline="") as file:
+        return _read_cells(file, columns)
+
+
+def _read_cells(file: IO[str], columns: Optional[List[str]]) -> Tuple[List[str], List[List[Optional[str]]]]:
+    """Read the header and stripped cells of an open tab-separated file."""
+    reader = csv.reader(file, delimiter="\t")
+    header = next(reader, [])
+    width = len(header)
+    selected = project(header, columns)
+    if selected is None:
+        rows = [
+            [cell.strip() or None for cell in row[:width]] + [None] * (width - len(row))
+            for row in reader
+            if row
+        ]
+        return header, rows
+    indices = [header.index(name) for name in selected]
+    rows = [
+        [(row[i].strip() or None) if i < len(row) else None for i in indices]
+        for row in reader
+        if row
+    ]
+    return selected, rows
+
+
+def iter_text(path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Split a tab-separated file into chunks of its header line and at most ``chunk_rows`` rows.
+
+    Rows are split on line breaks, so only one chunk of the file is in
+    memory at a time.
+    """
+    with open(path, "rb") as file:
+        header = file.readline()
+        while True:
+            lines = list(islice(file, chunk_rows))
+            if not lines:
+                return
+            yield header + b"".join(lines)
+
+
+class Backend:
+    """Operations the runner needs from an output format.
+
+    Subclasses import their DataFrame library in ``__init__``; instances are
+    created on first use by ``get_backend``.
+    """
+    name = ""
+
+    def parse_tabout(self, path: Path, columns: Optional[List[str]] = None) -> Frame:
+        """Read a tabout file, stripping cells, dropping empty columns and typing numeric ones.
+
+        With ``columns``, only those columns are read, in that order; names
+        missing from the file are skipped.
+        """
+        raise NotImplementedError
+
+    def from_text_columns(self, columns: TextColumns, types: Optional[ColumnTypes] = None) -> Frame:
+        """Build a frame from columns of raw text cells, typed like ``parse_tabout``.
+
+        With ``types``, exactly those columns are kept, in that order, and typed
+        as given instead of inferred: empty ones are kept as all-null columns.
+        """
+        raise NotImplementedError
+
+    def parse_text(
+        self,
+        data: bytes,
+        columns: Optional[List[str]] = None,
+        types: Optional[ColumnTypes] = None
+    ) -> Frame:
+        """Parse tab-separated text, header line first, like ``parse_tabout``.
+
+        ``columns`` must all be in the header. With ``types``, columns are
+        kept and typed as in ``from_text_columns``.
+        """
+        header, rows = _read_cells(io.StringIO(data.decode(), newline=""), columns)
+        return self.from_text_columns({name: [row[i] for row in rows] for i, name in enumerate(header)}, types)
+
+    def column_types(self, df: Frame) -> ColumnTypes:
+        """Return the columns of a parsed frame and whether each is numeric."""
+        columns, rows = self.to_rows(df)
+        return {
+            name: all(isinstance(row[i], Real) and not isinstance(row[i], bool) for row in rows if row[i] is not None)
+            for i, name in enumerate(columns)
+        }
+
+    def iter_tabout(
+        self,
+        path: Path,
+        columns: Optional[List[str]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[Frame]:
+        """Read a tabout file as frames of at most ``chunk_rows`` rows, in bounded memory.
+
+        A first pass parses every chunk to find the non-empty columns and
+        which of them are numeric in all chunks. The second pass yields the
+        chunks typed accordingly, so each has the same columns and types as
+        ``parse_tabout`` gives for the whole file.
+        """
+        header = read_header(path)
+        selected = header if columns is None else project(header, columns)
+        numeric: ColumnTypes = {}
+        for data in iter_text(path, chunk_rows):
+            for name, is_numeric in self.column_types(self.parse_text(data, selected)).items():
+                numeric[name] = numeric.get(name, True) and is_numeric
+        types = {name: numeric[name] for name in selected if name in numeric}
+        if not types:
+            return
+        for data in iter_text(path, chunk_rows):
+            yield self.parse_text(data, list(types), types)
+
+    def from_dicts(self, rows: List[Dict[str, Any]]) -> Frame:
+        """Build a frame from row dicts."""
+        raise NotImplementedError
+
+    def from_rows(self, columns: List[str], rows: List[List[Any]]) -> Frame:
+        """Build a frame from column names and row values."""
+        raise NotImplementedError
+
+    def to_rows(self, df: Frame) -> Table:
+        """Convert a frame into plain column names and row values."""
+        raise NotImplementedError
+
+    def column(self, df: Frame, name: str) -> Optional[List[Any]]:
+        """Return a column as a list of Python values, or None if it is absent."""
+        raise NotImplementedError
+
+    def insert_column(self, df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+        """Insert a key column, constant or one value per row, at the front of a frame."""
+        raise NotImplementedError
+
+    def update_columns(self, df: Frame, update: Frame) -> Frame:
+        """Replace or add the columns of ``update`` in a frame with the same number of rows."""
+        raise NotImplementedError
+
+    def concat(self, frames: List[Frame]) -> Frame:
+        """Concatenate frames, aligning columns by name."""
+        raise NotImplementedError
+
+    def write_parquet(self, df: Frame, path: Path) -> None:
+        """Write a frame to a Parquet file."""
+        raise NotImplementedError
+
+    def read_parquet(self, path: Path) -> Frame:
+        """Read a Parquet file into a frame."""
+        raise NotImplementedError
+
+    def is_frame(self, df: Any) -> bool:
+        """Whether an object is a frame of this backend (used for registered backends)."""
+        return False
+
+
+class PolarsBackend(Backend):
+    """polars DataFrames."""
+    name = "polars"
+
+    def __init__(self):
+        import polars as pl
+        self.pl = pl
+
+    def parse_tabout(self, path: Path, columns: Optional[List[str]] = None) -> Frame:
+        return self._typed(self._read(path, project(read_header(path), columns)))
+
+    def parse_text(
+        self,
+        data: bytes,
+        columns: Optional[List[str]] = None,
+        types: Optional[ColumnTypes] = None
+    ) -> Frame:
+        return self._typed(self._read(io.BytesIO(data), columns), types)
+
+    def _read(self, source: Union[Path, IO[bytes]], selected: Optional[List[str]]) -> "pl.DataFrame":
+        """Read a tab-separated file or buffer with every column as strings."""
+        # Read with Polars as strings initially
+        df = self.pl.read_csv(
+            source,
+            separator='\t',
+            truncate_ragged_lines=True,
+            infer_schema_length=0,
+            columns=selected
+        )
+        if selected is not None:
+            df = df.select(selected)
+        return df
+
+    def column_types(self, df: Frame) -> ColumnTypes:
+        return {name: dtype == self.pl.Float64 for name, dtype in df.schema.items()}
+
+    def from_text_columns(self, columns: TextColumns, types: Optional[ColumnTypes] = None) -> Frame:
+        pl = self.pl
+        return self._typed(pl.DataFrame(columns, schema={name: pl.String for name in columns}), types)
+
+    def _typed(self, df: "pl.DataFrame", types: Optional[ColumnTypes] = None) -> Frame:
+        """Strip string columns, drop empty ones and cast numeric ones to Float64."""
+        pl = self.pl
+        # Strip every column, treating blank cells as missing
+        stripped = pl.all().str.strip_chars()
+        df = df.select(pl.when(stripped != "").then(stripped).name.keep())
+        if types is not None:
+            return df.select(
+                pl.col(col).cast(pl.Float64) if numeric else pl.col(col) for col, numeric in types.items()
+            )
+
+        # Drop columns that are entirely null in a single aggregation
+        present = df.select(pl.all().is_not_null().any()).row(0) if df.width else []
+        df = df.select(col for col, keep in zip(df.columns, present) if keep)
+
+        # A column is numeric when every non-null value casts to float
+        is_numeric = df.select(
+            (pl.all().is_null() == pl.all().cast(pl.Float64, strict=False).is_null()).all()
+        ).row(0) if df.width else []
+        return df.select(
+            pl.col(col).cast(pl.Float64, strict=False) if numeric else pl.col(col)
+            for col, numeric in zip(df.columns, is_numeric)
+        )
+
+    def from_dicts(self, rows: List[Dict[str, Any]]) -> Frame:
+        return self.pl.DataFrame(rows)
+
+    def from_rows(self, columns: List[str], rows: List[List[Any]]) -> Frame:
+        return self.pl.DataFrame(rows, schema=columns, orient="row")
+
+    def to_rows(self, df: Frame) -> Table:
+        return df.columns, [list(row) for row in df.rows()]
+
+    def column(self, df: Frame, name: str) -> Optional[List[Any]]:
+        return df[name].to_list() if name in df.columns else None
+
+    def insert_column(self, df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+        pl = self.pl
+        if isinstance(value, list):
+            column = pl.Series(name, value)
+        else:
+            column = pl.lit(value).alias(name)
+        return df.select(column, pl.exclude(name))
+
+    def update_columns(self, df: Frame, update: Frame) -> Frame:
+        return df.with_columns(update.get_columns())
+
+    def concat(self, frames: List[Frame]) -> Frame:
+        if not frames:
+            return self.pl.DataFrame()
+        return self.pl.concat(frames, how="diagonal_relaxed")
+
+    def write_parquet(self, df: Frame, path: Path) -> None:
+        df.write_parquet(path)
+
+    def read_parquet(self, path: Path) -> Frame:
+        return self.pl.read_parquet(path)
+
+
+class PandasBackend(Backend):
+    """pandas DataFrames.
+
+    Numeric columns are float64, or float32 with ``downcast``. The columns
+    named in ``categories`` (such as repeated flags or units) are always
+    categoricals, and other text columns are Arrow-backed strings where
+    pyarrow is installed, so a column has the same dtype in every result.
+    Options are set with ``get_backend("pandas", downcast=True)`` or
+    ``EPySuiteConfig.downcast`` and ``category_columns``.
+    """
+    name = "pandas"
+
+    def __init__(self, downcast: bool = False, categories: Optional[Iterable[str]] = None):
+        import pandas as pd
+        self.pd = pd
+        self.downcast = downcast
+        self.categories = frozenset(categories or ())
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            self.pa = self.pc = None
+            self.string = object
+        else:
+            self.pa, self.pc = pa, pc
+            self.string = pd.StringDtype("pyarrow")
+
+    def parse_tabout(self, path: Path, columns: Optional[List[str]] = None) -> Frame:
+        return self._typed(self._read(path, project(read_header(path), columns)))
+
+    def parse_text(
+        self,
+        data: bytes,
+        columns: Optional[List[str]] = None,
+        types: Optional[ColumnTypes] = None
+    ) -> Frame:
+        return self._typed(self._read(io.BytesIO(data), columns), types)
+
+    def _read(self, source: Union[Path, IO[bytes]], selected: Optional[List[str]]) -> "pd.DataFrame":
+        """Read a tab-separated file or buffer with every cell as a string ("NA" included)."""
+        df = self.pd.read_csv(
+            source,
+            sep='\t',
+            on_bad_lines='skip',
+            dtype=self.string,  # Read all as strings initially
+            usecols=selected,
+            keep_default_na=False,
+            na_filter=False
+        )
+        if selected is not None:
+            df = df[selected]
+        return df
+
+    def from_text_columns(self, columns: TextColumns, types: Optional[ColumnTypes] = None) -> Frame:
+        return self._typed(self.pd.DataFrame(columns, dtype=self.string), types)
+
+    def _typed(self, df: "pd.DataFrame", types: Optional[ColumnTypes] = None) -> Frame:
+        """Strip cells, drop empty columns and give each column a single compact dtype."""
+        typed = {}
+        for col in df.columns if types is None else types:
+            text = self._text(df[col])
+            if col in self.categories:
+                if types is not None or text.count():
+                    typed[col] = text.astype("category")
+            elif types is not None:
+                typed[col] = self._floats(text) if types[col] else text
+            elif text.count():
+                # A column is numeric when every non-null value converts to float
+                try:
+                    typed[col] = self._floats(text)
+                except ValueError:
+                    typed[col] = text
+        return self.pd.DataFrame(typed, index=df.index)
+
+    def _text(self, column: "pd.Series") -> "pd.Series":
+        """Strip a column of raw text, treating blank cells as missing."""
+        if self.pa is None:
+            stripped = column.str.strip()
+            return stripped.where(stripped != "")
+        pa, pc = self.pa, self.pc
+        stripped = pc.utf8_trim_whitespace(pa.array(column.array, pa.string()))
+        values = pc.if_else(pc.equal(stripped, ""), pa.scalar(None, pa.string()), stripped)
+        return self.pd.Series(self.pd.arrays.ArrowStringArray(values), index=column.index, name=column.name)
+
+    def _floats(self, text: "pd.Series") -> "pd.Series":
+        """Convert stripped text to floats, raising ValueError if any value is not a number."""
+        dtype = "float32" if self.downcast else "float64"
+        if self.pa is None:
+            return self.pd.to_numeric(text).astype(dtype)
+        pa = self.pa
+        try:
+            values = pa.array(text.array).cast(pa.float64())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as err:
+            raise ValueError(str(err)) from err
+        return self.pd.Series(values.to_numpy(zero_copy_only=False), index=text.index, name=text.name).astype(dtype)
+
+    def column_types(self, df: Frame) -> ColumnTypes:
+        is_float = self.pd.api.types.is_float_dtype
+        return {str(name): is_float(dtype) for name, dtype in df.dtypes.items()}
+
+    def from_dicts(self, rows: List[Dict[str, Any]]) -> Frame:
+        return self.pd.DataFrame(rows)
+
+    def from_rows(self, columns: List[str], rows: List[List[Any]]) -> Frame:
+        return self.pd.DataFrame(rows, columns=columns)
+
+    def to_rows(self, df: Frame) -> Table:
+        values = df.astype(object).where(df.notna(), None)
+        return [str(col) for col in df.columns], values.values.tolist()
+
+    def column(self, df: Frame, name: str) -> Optional[List[Any]]:
+        if name not in df.columns:
+            return None
+        series = df[name]
+        return series.astype(object).where(series.notna(), None).tolist()
+
+    def insert_column(self, df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+        df = df.drop(columns=name, errors="ignore")
+        df.insert(0, name, value)
+        return df
+
+    def update_columns(self, df: Frame, update: Frame) -> Frame:
+        df = df.copy()
+        for col in update.columns:
+            df[col] = update[col].values
+        return df
+
+    def concat(self, frames: List[Frame]) -> Frame:
+        pd = self.pd
+        if not frames:
+            return pd.DataFrame()
+        # Categoricals only stay categorical when concatenated with the same categories
+        categorical = {}
+        for df in frames:
+            for col, dtype in df.dtypes.items():
+                if isinstance(dtype, pd.CategoricalDtype):
+                    categorical.setdefault(col, []).append(df[col])
+        if categorical:
+            dtypes = {
+                col: pd.CategoricalDtype(pd.api.types.union_categoricals(columns, ignore_order=True).categories)
+                for col, columns in categorical.items()
+            }
+            frames = [df.astype({col: dtypes[col] for col in df.columns if col in dtypes}) for df in frames]
+        return pd.concat(frames, ignore_index=True)
+
+    def write_parquet(self, df: Frame, path: Path) -> None:
+        df.to_parquet(path, index=False)
+
+    def read_parquet(self, path: Path) -> Frame:
+        return self.pd.read_parquet(path)
+
+
+class ArrowBackend(Backend):
+    """pyarrow Tables."""
+    name = "pyarrow"
+
+    def __init__(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pv
+        import pyarrow.parquet as pq
+        self.pa, self.pc, self.pv, self.pq = pa, pc, pv, pq
+
+    def parse_tabout(self, path: Path, columns: Optional[List[str]] = None) -> Frame:
+        header = read_header(path)
+        return self._typed(self._read(path, header, project(header, columns)))
+
+    def parse_text(
+        self,
+        data: bytes,
+        columns: Optional[List[str]] = None,
+        types: Optional[ColumnTypes] = None
+    ) -> Frame:
+        header = next(csv.reader([data.split(b"\n", 1)[0].rstrip(b"\r").decode()], delimiter="\t"), [])
+        return self._typed(self._read(io.BytesIO(data), header, columns), types)
+
+    def _read(self, source: Union[Path, IO[bytes]], header: List[str], selected: Optional[List[str]]) -> "pa.Table":
+        """Read a tab-separated file or buffer with every column as strings."""
+        pa, pv = self.pa, self.pv
+        if selected == []:
+            # pyarrow reads every column when include_columns is empty
+            return pa.table({})
+        return pv.read_csv(
+            source,
+            parse_options=pv.ParseOptions(delimiter="\t", invalid_row_handler=lambda row: "skip"),
+            convert_options=pv.ConvertOptions(
+                column_types={name: pa.string() for name in (header if selected is None else selected)},
+                strings_can_be_null=False,
+                include_columns=selected
+            )
+        )
+
+    def column_types(self, df: Frame) -> ColumnTypes:
+        return {field.name: self.pa.types.is_floating(field.type) for field in df.schema}
+
+    def from_text_columns(self, columns: TextColumns, types: Optional[ColumnTypes] = None) -> Frame:
+        pa = self.pa
+        table = pa.table({name: pa.array(values, pa.string()) for name, values in columns.items()})
+        return self._typed(table, types)
+
+    def _typed(self, table: "pa.Table", types: Optional[ColumnTypes] = None) -> Frame:
+        """Strip string columns, drop empty ones and cast numeric ones to float64."""
+        pa, pc = self.pa, self.pc
+        columns, names = [], []
+        header = table.column_names
+        indices = range(len(header)) if types is None else [header.index(name) for name in types]
+        for i in indices:
+            name, column = header[i], table.column(i)
+            # Strip every column, treating blank cells as missing
+            stripped = pc.utf8_trim_whitespace(column)
+            column = pc.if_else(pc.equal(stripped, ""), pa.scalar(None, pa.string()), stripped)
+            if types is not None:
+                columns.append(column.cast(pa.float64()) if types[name] else column)
+                names.append(name)
+                continue
+            if column.null_count == len(column):
+                continue
+            # A column is numeric when every non-null value casts to float
+            try:
+                column = column.cast(pa.float64())
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+            columns.append(column)
+            names.append(name)
+        return pa.table(columns, names=names)
+
+    def from_dicts(self, rows: List[Dict[str, Any]]) -> Frame:
+        return self.pa.Table.from_pylist(rows)
+
+    def from_rows(self, columns: List[str], rows: List[List[Any]]) -> Frame:
+        arrays = [self.pa.array(list(values)) for values in zip(*rows)] if rows else []
+        if not rows:
+            arrays = [self.pa.array([], self.pa.null()) for _ in columns]
+        return self.pa.table(arrays, names=columns)
+
+    def to_rows(self, df: Frame) -> Table:
+        columns = [column.to_pylist() for column in df.columns]
+        return list(df.column_names), [list(row) for row in zip(*columns)]
+
+    def column(self, df: Frame, name: str) -> Optional[List[Any]]:
+        return df[name].to_pylist() if name in df.column_names else None
+
+    def insert_column(self, df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+        if name in df.column_names:
+            df = df.drop_columns([name])
+        values = value if isinstance(value, list) else [value] * df.num_rows
+        return df.add_column(0, name, self.pa.array(values))
+
+    def update_columns(self, df: Frame, update: Frame) -> Frame:
+        for name, column in zip(update.column_names, update.columns):
+            if name in df.column_names:
+                df = df.set_column(df.column_names.index(name), name, column)
+            else:
+                df = df.append_column(name, column)
+        return df
+
+    def concat(self, frames: List[Frame]) -> Frame:
+        if not frames:
+            return self.pa.table({})
+        return self.pa.concat_tables(frames, promote_options="permissive")
+
+    def write_parquet(self, df: Frame, path: Path) -> None:
+        self.pq.write_table(df, path)
+
+    def read_parquet(self, path: Path) -> Frame:
+        return self.pq.read_table(path)
+
+
+class RecordsBackend(Backend):
+    """Lists of row dicts, with no third-party dependency."""
+    name = "records"
+
+    def parse_tabout(self, path: Path, columns: Optional[List[str]] = None) -> Frame:
+        header, rows = read_cells(path, columns)
+        return self.from_text_columns({name: [row[i] for row in rows] for i, name in enumerate(header)})
+
+    def from_text_columns(self, columns: TextColumns, types: Optional[ColumnTypes] = None) -> Frame:
+        length = max((len(values) for values in columns.values()), default=0)
+        typed = []
+        for name in columns if types is None else types:
+            # Strip every column, treating blank cells as missing
+            values = [None if value is None else value.strip() or None for value in columns[name]]
+            if types is not None:
+                if types[name]:
+                    values = [None if value is None else float(value) for value in values]
+                typed.append((name, values))
+                continue
+            present = [value for value in values if value is not None]
+            if not present:
+                continue
+            # A column is numeric when every non-null value converts to float
+            try:
+                [float(value) for value in present]
+            except ValueError:
+                pass
+            else:
+                values = [None if value is None else float(value) for value in values]
+            typed.append((name, values))
+        return [{name: values[i] for name, values in typed} for i in range(length)]
+
+    def from_dicts(self, rows: List[Dict[str, Any]]) -> Frame:
+        return [dict(row) for row in rows]
+
+    def from_rows(self, columns: List[str], rows: List[List[Any]]) -> Frame:
+        return [dict(zip(columns, row)) for row in rows]
+
+    def to_rows(self, df: Frame) -> Table:
+        columns = list(dict.fromkeys(name for row in df for name in row))
+        return columns, [[row.get(name) for name in columns] for row in df]
+
+    def column(self, df: Frame, name: str) -> Optional[List[Any]]:
+        if not any(name in row for row in df):
+            return None
+        return [row.get(name) for row in df]
+
+    def insert_column(self, df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+        values = value if isinstance(value, list) else [value] * len(df)
+        return [
+            {name: item, **{key: cell for key, cell in row.items() if key != name}}
+            for row, item in zip(df, values)
+        ]
+
+    def update_columns(self, df: Frame, update: Frame) -> Frame:
+        return [{**row, **changes} for row, changes in zip(df, update)]
+
+    def concat(self, frames: List[Frame]) -> Frame:
+        rows = [row for frame in frames for row in frame]
+        columns = list(dict.fromkeys(name for row in rows for name in row))
+        return [{name: row.get(name) for name in columns} for row in rows]
+
+    def write_parquet(self, df: Frame, path: Path) -> None:
+        # Rows may lack keys, so the schema comes from every row rather than the first
+        arrow = get_backend("pyarrow")
+        arrow.write_parquet(arrow.from_rows(*self.to_rows(df)), path)
+
+    def read_parquet(self, path: Path) -> Frame:
+        return get_backend("pyarrow").read_parquet(path).to_pylist()
+
+
+# Backend factories by format name; instances are created on first use
+_FACTORIES: Dict[str, Callable[[], Backend]] = {
+    "polars": PolarsBackend,
+    "pandas": PandasBackend,
+    "pyarrow": ArrowBackend,
+    "records": RecordsBackend,
+}
+# Backend instances by format name and options
+_BACKENDS: Dict[Tuple[str, FrozenSet[Tuple[str, Any]]], Backend] = {}
+
+# Built-in formats named after the top-level module of their frame type
+_FRAME_MODULES = ("polars", "pandas", "pyarrow")
+
+
+def register_backend(name: str, factory: Callable[..., Backend]) -> None:
+    """Register (or replace) the backend used for a ``data_format`` name."""
+    _FACTORIES[name] = factory
+    for key in [key for key in _BACKENDS if key[0] == name]:
+        del _BACKENDS[key]
+
+
+def get_backend(name: str, **options: Any) -> Backend:
+    """Return the backend for a ``data_format`` name, importing its library on first use.
+
+    ``options`` are passed to the backend's factory, e.g. ``downcast=True``
+    for pandas; they must be hashable, as one backend is kept per set of
+    options.
+    """
+    key = (name, frozenset(options.items()))
+    backend = _BACKENDS.get(key)
+    if backend is None:
+        factory = _FACTORIES.get(name)
+        if factory is None:
+            raise ConfigurationError(
+                f"Unknown data format {name!r}; expected one of {', '.join(sorted(_FACTORIES))}"
+            )
+        try:
+            backend = factory(**options)
+        except ImportError as err:
+            raise ConfigurationError(f"Data format {name!r} requires a missing package: {err.name}") from err
+        except TypeError as err:
+            raise ConfigurationError(f"Invalid options for data format {name!r}: {err}") from err
+        _BACKENDS[key] = backend
+    return backend
+
+
+def backend_for(df: Frame) -> Backend:
+    """Return the backend that produced a frame."""
+    if isinstance(df, list):
+        return get_backend("records")
+    module = type(df).__module__.split(".")[0]
+    if module in _FRAME_MODULES:
+        return get_backend(module)
+    for backend in _BACKENDS.values():
+        if backend.is_frame(df):
+            return backend
+    raise ConfigurationError(f"Unsupported frame type: {type(df).__name__}")
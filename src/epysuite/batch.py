@@ -0,0 +1,146 @@
+# src/epysuite/batch.py
+
+"""Record handling for batch EPI Suite runs."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from .config import STPConfig
+from .exceptions import ConfigurationError
+
+
+@dataclass
+class BatchRecord:
+    """A single chemical submitted to a batch run."""
+    cas_rn: str
+    smiles: Optional[str] = None
+    stp_config: Optional[STPConfig] = None
+
+
+@dataclass
+class BatchReport:
+    """Summary of the most recent batch run."""
+    total: int = 0
+    unique: int = 0
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    quarantined: List[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of records that produced results."""
+        return self.total - len(self.errors) - len(self.quarantined)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of records served by another record's run."""
+        return 1 - self.unique / self.total if self.total else 0.0
+
+
+def to_record(record: Any) -> BatchRecord:
+    """Convert a CAS string, tuple or mapping into a BatchRecord."""
+    if isinstance(record, BatchRecord):
+        return record
+    if isinstance(record, str):
+        return BatchRecord(record)
+    if isinstance(record, Mapping):
+        return BatchRecord(
+            record["cas_rn"],
+            smiles=record.get("smiles"),
+            stp_config=record.get("stp_config")
+        )
+    if isinstance(record, (tuple, list)) and 1 <= len(record) <= 3:
+        return BatchRecord(*record)
+    raise ConfigurationError(f"Cannot interpret batch record: {record!r}")
+
+
+def to_records(records: Iterable[Any]) -> List[BatchRecord]:
+    """Convert an iterable of batch inputs into BatchRecords."""
+    return [to_record(record) for record in records]
+
+
+# Two-letter element symbols, for fixing their case inside bracket atoms
+_ELEMENTS = frozenset("""
+    He Li Be Ne Na Mg Al Si Cl Ar Ca Sc Ti Cr Mn Fe Co Ni Cu Zn Ga Ge As Se Br Kr
+    Rb Sr Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd
+    Tb Dy Ho Er Tm Yb Lu Hf Ta Re Os Ir Pt Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa
+    Np Pu Am Cm Bk Cf Es Fm Md No Lr
+""".split())
+_BRACKET_ATOM = re.compile(r"\[(\d*)([A-Za-z]{2})")
+_HALOGEN = re.compile(r"CL|BR")
+
+
+def _bracket_symbol(match: "re.Match") -> str:
+    """Capitalize a miscased two-letter element symbol opening a bracket atom."""
+    isotope, symbol = match.groups()
+    # Aromatic symbols (se, as, te) and hydrogen counts (NH, CH) are left alone
+    if symbol.islower() and symbol in ("se", "as", "te") or symbol[1] in "Hh":
+        return match.group(0)
+    if symbol.capitalize() in _ELEMENTS:
+        symbol = symbol.capitalize()
+    return f"[{isotope}{symbol}"
+
+
+def normalize_smiles(smiles: str) -> str:
+    """
+    Lightly normalize a SMILES string for duplicate detection.
+
+    Drops surrounding whitespace and anything after the first internal
+    whitespace (a SMILES title), writes two-letter element symbols in their
+    canonical case (``[NA+]`` → ``[Na+]``, ``CL`` → ``Cl``) and sorts
+    dot-separated components, so ``[Na+].CC(=O)[O-]`` and ``CC(=O)[O-].[Na+]``
+    match. Aromaticity, atom order and stereochemistry are kept as given;
+    this is no substitute for a cheminformatics canonicalizer.
+    """
+    parts = smiles.split()
+    if not parts:
+        return ""
+    smiles = _BRACKET_ATOM.sub(_bracket_symbol, parts[0])
+    smiles = _HALOGEN.sub(lambda match: match.group(0).capitalize(), smiles)
+    return ".".join(sorted(smiles.split(".")))
+
+
+def dedup_key(record: BatchRecord, smiles: Optional[str] = None) -> Tuple[Hashable, ...]:
+    """
+    Return the key under which batch records produce identical results.
+
+    Records are keyed by normalized SMILES and STP configuration; a record
+    without a known SMILES is keyed by its CAS RN instead.
+
+    Args:
+        record: Batch record
+        smiles: SMILES to use when the record has none, e.g. from the
+            CAS→SMILES table (optional)
+    """
+    smiles = record.smiles or smiles
+    structure = ("smiles", normalize_smiles(smiles)) if smiles else ("cas_rn", record.cas_rn)
+    return structure + tuple((record.stp_config or STPConfig()).get_config_lines())
+
+
+def group_records(
+    records: List[BatchRecord],
+    known: Optional[Mapping[str, Optional[str]]] = None
+) -> Tuple[List[BatchRecord], List[int]]:
+    """
+    Group batch records that produce identical results.
+
+    Args:
+        records: Batch records
+        known: SMILES of CAS RNs submitted without one (optional)
+
+    Returns:
+        The first record of every group in input order, and the index of each
+        record's group in that list
+    """
+    known = known or {}
+    groups: Dict[Tuple[Hashable, ...], int] = {}
+    unique: List[BatchRecord] = []
+    index: List[int] = []
+    for record in records:
+        key = dedup_key(record, known.get(record.cas_rn))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = len(unique)
+            unique.append(record)
+        index.append(group)
+    return unique, index
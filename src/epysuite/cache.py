@@ -0,0 +1,248 @@
+# src/epysuite/cache.py
+
+"""Persistent on-disk caching of EPI Suite results."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import FileHandlingError
+
+Table = Tuple[List[str], List[List[Any]]]
+
+
+def make_key(*parts: Any) -> str:
+    """Hash JSON-serializable key parts into a cache key."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed store of parsed EPI Suite results.
+
+    Entries are keyed by a hash of everything that determines a result (see
+    ``EPySuiteRunner._cache_key``) and hold the parsed table as JSON, so a hit
+    can be rebuilt in any DataFrame format without running EPI Suite.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        """
+        Open (or create) a result cache.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Evict least recently used entries beyond this payload size (optional)
+            max_age: Expire entries older than this many seconds (optional)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results ("
+                    "key TEXT PRIMARY KEY, cas_rn TEXT, payload TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS results_cas_rn ON results (cas_rn)")
+                conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error opening result cache: {self.path}") from err
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database."""
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def get(self, key: str) -> Optional[Table]:
+        """Return the cached (columns, rows) for a key, or None on a miss."""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT payload, created FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self.max_age is not None and now - row[1] > self.max_age:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading result cache: {self.path}") from err
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        payload = json.loads(row[0])
+        return payload["columns"], payload["rows"]
+
+    def put(self, key: str, cas_rn: str, columns: List[str], rows: List[List[Any]]) -> None:
+        """Store a parsed result table and apply the eviction limits."""
+        payload = json.dumps({"columns": columns, "rows": rows})
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, cas_rn, payload, len(payload), now, now)
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error writing result cache: {self.path}") from err
+
+    def evict(self) -> int:
+        """Apply the age and size limits, returning the number of entries removed."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                return self._evict(conn, time.time())
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error evicting result cache: {self.path}") from err
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Remove expired entries, then least recently used ones over the size limit."""
+        removed = 0
+        if self.max_age is not None:
+            removed += conn.execute(
+                "DELETE FROM results WHERE created < ?", (now - self.max_age,)
+            ).rowcount
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                stale = []
+                for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM results WHERE key = ?", stale)
+                removed += len(stale)
+        return removed
+
+    def invalidate(self, cas_rn: Optional[str] = None, key: Optional[str] = None) -> int:
+        """
+        Remove cached results.
+
+        Args:
+            cas_rn: Remove every entry for this CAS RN (optional)
+            key: Remove the entry with this key (optional)
+
+        Returns:
+            Number of entries removed; with no arguments the whole cache is cleared
+        """
+        query, params = "DELETE FROM results", ()
+        if key is not None:
+            query, params = "DELETE FROM results WHERE key = ?", (key,)
+        elif cas_rn is not None:
+            query, params = "DELETE FROM results WHERE cas_rn = ?", (cas_rn,)
+        try:
+            with closing(self._connect()) as conn, conn:
+                return conn.execute(query, params).rowcount
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error invalidating result cache: {self.path}") from err
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current size of the cache."""
+        try:
+            with closing(self._connect()) as conn:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading result cache: {self.path}") from err
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+class SmilesTable:
+    """SQLite-backed CAS RN to SMILES lookup table.
+
+    CAS RNs that EPI Suite could not resolve are stored with a NULL SMILES,
+    so repeated misses are answered without another lookup launch.
+    """
+
+    def __init__(self, path: Path):
+        """Open (or create) the lookup table in the SQLite database at ``path``."""
+        self.path = Path(path)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS smiles ("
+                    "cas_rn TEXT PRIMARY KEY, smiles TEXT, updated REAL NOT NULL)"
+                )
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error opening SMILES table: {self.path}") from err
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the table database."""
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def get_many(self, cas_rns: List[str]) -> Dict[str, Optional[str]]:
+        """Return the known CAS RNs among ``cas_rns``, mapped to their SMILES or None."""
+        known: Dict[str, Optional[str]] = {}
+        try:
+            with closing(self._connect()) as conn:
+                # Stay well below SQLite's bound parameter limit
+                for start in range(0, len(cas_rns), 500):
+                    batch = cas_rns[start:start + 500]
+                    placeholders = ", ".join("?" * len(batch))
+                    known.update(conn.execute(
+                        f"SELECT cas_rn, smiles FROM smiles WHERE cas_rn IN ({placeholders})", batch
+                    ).fetchall())
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading SMILES table: {self.path}") from err
+        return known
+
+    def put(self, cas_rn: str, smiles: Optional[str]) -> None:
+        """Record the SMILES for a CAS RN, or None if it could not be resolved."""
+        self.put_many({cas_rn: smiles})
+
+    def put_many(self, entries: Dict[str, Optional[str]]) -> None:
+        """Record several CAS RN to SMILES results at once."""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO smiles VALUES (?, ?, ?)",
+                    [(cas_rn, smiles, now) for cas_rn, smiles in entries.items()]
+                )
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error writing SMILES table: {self.path}") from err
+
+    def invalidate(self, cas_rn: Optional[str] = None, negative_only: bool = False) -> int:
+        """
+        Remove lookup results.
+
+        Args:
+            cas_rn: Remove only this CAS RN (optional)
+            negative_only: Remove only cached "not found" results
+
+        Returns:
+            Number of entries removed
+        """
+        clauses, params = [], []
+        if cas_rn is not None:
+            clauses.append("cas_rn = ?")
+            params.append(cas_rn)
+        if negative_only:
+            clauses.append("smiles IS NULL")
+        query = "DELETE FROM smiles" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        try:
+            with closing(self._connect()) as conn, conn:
+                return conn.execute(query, params).rowcount
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error invalidating SMILES table: {self.path}") from err
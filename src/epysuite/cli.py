@@ -0,0 +1,360 @@
+# src/epysuite/cli.py
+
+"""Command-line interface for batch EPI Suite runs, shared job queues and the local server."""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, TextIO
+
+from .batch import BatchRecord
+from .config import MODEL_PRESETS, EPySuiteConfig, ModelConfig, STPConfig
+from .exceptions import ConfigurationError, EPYSuiteError, FileHandlingError
+from .jobs import JobQueue
+from .runner import EPySuiteRunner
+from .server import DEFAULT_PORT, EPySuiteServer
+from .sinks import CsvSink, ParquetSink, Sink
+
+
+def read_inventory(
+    path: Path,
+    cas_column: str = "cas_rn",
+    smiles_column: str = "smiles",
+    stp_config: Optional[STPConfig] = None
+) -> List[BatchRecord]:
+    """
+    Read batch records from a CSV or Parquet inventory.
+
+    Args:
+        path: CSV file, or Parquet file (``.parquet``, requires pyarrow)
+        cas_column: Column holding the CAS RNs
+        smiles_column: Column holding SMILES; blank cells, or no such column,
+            mean the SMILES is looked up by CAS RN
+        stp_config: STP configuration applied to every record (optional)
+
+    Returns:
+        One record per row with a CAS RN, in file order
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ConfigurationError("Reading Parquet inventories requires pyarrow") from err
+        try:
+            rows = pq.read_table(path).to_pylist()
+        except Exception as err:
+            raise FileHandlingError(f"Error reading inventory: {path}") from err
+    else:
+        try:
+            with open(path, "r", newline="", encoding="utf-8-sig") as file:
+                rows = list(csv.DictReader(file))
+        except OSError as err:
+            raise FileHandlingError(f"Error reading inventory: {path}") from err
+
+    if rows and cas_column not in rows[0]:
+        raise ConfigurationError(f"Inventory {path} has no {cas_column!r} column")
+    records = []
+    for row in rows:
+        cas_rn = str(row[cas_column] or "").strip()
+        if not cas_rn:
+            continue
+        smiles = str(row.get(smiles_column) or "").strip() or None
+        records.append(BatchRecord(cas_rn, smiles, stp_config))
+    return records
+
+
+def open_sink(path: Path, resume: bool = False, rows_per_part: int = 10000) -> Sink:
+    """
+    Open the destination of a batch job: a ``.csv`` file or a Parquet directory.
+
+    Args:
+        path: Output path
+        resume: Continue an existing output instead of refusing to touch it
+        rows_per_part: Rows per Parquet part file
+    """
+    path = Path(path)
+    if not resume and path.exists() and (path.is_file() or any(path.iterdir())):
+        raise ConfigurationError(f"Output {path} already exists; pass --resume to continue it")
+    if path.suffix.lower() == ".csv":
+        return CsvSink(path)
+    return ParquetSink(path, rows_per_part=rows_per_part)
+
+
+def _format_duration(seconds: float) -> str:
+    """Format seconds as H:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """Throughput and ETA line for a running batch job."""
+
+    def __init__(self, total: int, stream: Optional[TextIO] = None, enabled: bool = True):
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.enabled = enabled
+        # Redraw one line on a terminal; log a line now and then otherwise
+        self.interactive = self.stream.isatty()
+        self.interval = 0.5 if self.interactive else 10.0
+        self.start = time.monotonic()
+        self._shown = 0.0
+
+    def line(self, done: int) -> str:
+        """Render the progress line for ``done`` finished records."""
+        elapsed = time.monotonic() - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = _format_duration((self.total - done) / rate) if rate > 0 else "--:--:--"
+        return (
+            f"{done}/{self.total} chemicals | {rate:.1f}/s | "
+            f"elapsed {_format_duration(elapsed)} | ETA {eta}"
+        )
+
+    def update(self, done: int, force: bool = False) -> None:
+        """Show progress, at most once per interval unless forced."""
+        now = time.monotonic()
+        if not self.enabled or (not force and now - self._shown < self.interval):
+            return
+        self._shown = now
+        end = "" if self.interactive else "\n"
+        prefix = "\r" if self.interactive else ""
+        self.stream.write(f"{prefix}{self.line(done)}{end}")
+        self.stream.flush()
+
+    def finish(self, done: int) -> None:
+        """Show the final progress line."""
+        self.update(done, force=True)
+        if self.enabled and self.interactive:
+            self.stream.write("\n")
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Run the ``batch`` command."""
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+    stp_config = STPConfig(biowin=args.biowin, halflife_hr=args.halflife_hr)
+    config = EPySuiteConfig(
+        es_dir=args.es_dir,
+        timeout=args.timeout,
+        data_format="records",
+        columns=columns,
+        model=ModelConfig.preset(args.model),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        validate=args.validate,
+        cache_path=args.cache,
+    )
+    records = read_inventory(args.input, args.cas_column, args.smiles_column, stp_config)
+    runner = EPySuiteRunner(config)
+
+    with open_sink(args.output, resume=args.resume, rows_per_part=args.rows_per_part) as sink:
+        pending = [record for record in records if record.cas_rn not in sink.completed]
+        if len(pending) < len(records):
+            done = len(records) - len(pending)
+            print(f"Resuming: {done} of {len(records)} chemicals already done", file=sys.stderr)
+        progress = Progress(len(pending), enabled=not args.quiet)
+        for df in runner.iter_data(pending, on_error=args.on_error):
+            sink.write(df)
+            progress.update(runner.last_batch.total)
+        progress.finish(runner.last_batch.total)
+
+    report = runner.last_batch
+    print(f"{report.succeeded} succeeded, {len(report.errors)} failed", file=sys.stderr)
+    for cas_rn, error in list(report.errors.items())[:10]:
+        print(f"  {cas_rn}: {error}", file=sys.stderr)
+    if len(report.errors) > 10:
+        print(f"  ... and {len(report.errors) - 10} more", file=sys.stderr)
+    return 0
+
+
+def _print_counts(queue: JobQueue) -> None:
+    """Print the number of jobs in each state."""
+    counts = queue.counts()
+    print(", ".join(f"{count} {state}" for state, count in counts.items()), file=sys.stderr)
+
+
+def run_submit(args: argparse.Namespace) -> int:
+    """Run the ``submit`` command."""
+    stp_config = STPConfig(biowin=args.biowin, halflife_hr=args.halflife_hr)
+    records = read_inventory(args.input, args.cas_column, args.smiles_column, stp_config)
+    queue = JobQueue(args.queue)
+    added = queue.submit(records)
+    print(f"Submitted {added} of {len(records)} chemicals to {args.queue}", file=sys.stderr)
+    _print_counts(queue)
+    return 0
+
+
+def run_work(args: argparse.Namespace) -> int:
+    """Run the ``work`` command."""
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+    config = EPySuiteConfig(
+        es_dir=args.es_dir,
+        timeout=args.timeout,
+        data_format="records",
+        columns=columns,
+        model=ModelConfig.preset(args.model),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        validate=args.validate,
+        cache_path=args.cache,
+    )
+    queue = JobQueue(args.queue, lease_seconds=args.lease)
+    completed = EPySuiteRunner(config).work(queue, worker_id=args.worker_id)
+    print(f"Completed {completed} jobs", file=sys.stderr)
+    _print_counts(queue)
+    return 0
+
+
+def run_collect(args: argparse.Namespace) -> int:
+    """Run the ``collect`` command."""
+    queue = JobQueue(args.queue)
+    with open_sink(args.output, rows_per_part=args.rows_per_part) as sink:
+        sink.write(queue.results("records"))
+    _print_counts(queue)
+    for cas_rn, error in queue.failures().items():
+        print(f"  {cas_rn}: {error}", file=sys.stderr)
+    return 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """Run the ``serve`` command."""
+    config = EPySuiteConfig(
+        es_dir=args.es_dir,
+        timeout=args.timeout,
+        workers=args.workers,
+        cache_path=args.cache,
+    )
+    server = EPySuiteServer(config, host=args.host, port=args.port)
+    print(f"Serving EPI Suite with {config.workers} workers on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``epysuite`` argument parser."""
+    defaults = EPySuiteConfig()
+    parser = argparse.ArgumentParser(prog="epysuite", description="Run EPI Suite calculations.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    batch = commands.add_parser(
+        "batch",
+        help="run an inventory of chemicals",
+        description="Run a CSV or Parquet inventory of chemicals through EPI Suite in parallel, "
+                    "streaming results to a CSV file or a Parquet directory.",
+    )
+    batch.add_argument("input", type=Path, help="CSV or .parquet inventory of CAS RNs and SMILES")
+    batch.add_argument("-o", "--output", type=Path, required=True,
+                       help="result .csv file, or directory of Parquet parts")
+    batch.add_argument("--resume", action="store_true",
+                       help="continue an existing output, skipping chemicals it already holds")
+    batch.add_argument("--es-dir", type=Path, default=defaults.es_dir, help="EPI Suite installation directory")
+    batch.add_argument("-w", "--workers", type=int, default=defaults.workers,
+                       help="number of concurrent EPI Suite processes")
+    batch.add_argument("--chunk-size", type=int, default=defaults.chunk_size,
+                       help="chemicals per EPI Suite launch")
+    batch.add_argument("--timeout", type=int, default=defaults.timeout, help="timeout per chemical in seconds")
+    batch.add_argument("--columns", help="comma-separated output columns to keep (all if omitted)")
+    batch.add_argument("--model", choices=sorted(MODEL_PRESETS), default="full",
+                       help="model preset; stp_only keeps just the STP outputs")
+    batch.add_argument("--cas-column", default="cas_rn", help="inventory column holding CAS RNs")
+    batch.add_argument("--smiles-column", default="smiles", help="inventory column holding SMILES")
+    batch.add_argument("--no-biowin", dest="biowin", action="store_false",
+                       help="use --halflife-hr for STP biodegradation instead of BIOWIN")
+    batch.add_argument("--halflife-hr", type=float, default=STPConfig().halflife_hr,
+                       help="STP biodegradation half-life in hours")
+    batch.add_argument("--validate", action="store_true",
+                       help="fail invalid CAS RNs and malformed SMILES without launching EPI Suite")
+    batch.add_argument("--cache", type=Path, help="SQLite result cache")
+    batch.add_argument("--on-error", choices=["skip", "raise"], default="skip",
+                       help="skip failed chemicals (default) or stop at the first failure")
+    batch.add_argument("--rows-per-part", type=int, default=10000, help="rows per Parquet part file")
+    batch.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+    batch.set_defaults(func=run_batch)
+
+    submit = commands.add_parser(
+        "submit",
+        help="add an inventory to a shared job queue",
+        description="Add a CSV or Parquet inventory of chemicals to a SQLite job queue "
+                    "that any number of 'epysuite work' processes can drain.",
+    )
+    submit.add_argument("input", type=Path, help="CSV or .parquet inventory of CAS RNs and SMILES")
+    submit.add_argument("--queue", type=Path, required=True, help="SQLite job queue, created if missing")
+    submit.add_argument("--cas-column", default="cas_rn", help="inventory column holding CAS RNs")
+    submit.add_argument("--smiles-column", default="smiles", help="inventory column holding SMILES")
+    submit.add_argument("--no-biowin", dest="biowin", action="store_false",
+                        help="use --halflife-hr for STP biodegradation instead of BIOWIN")
+    submit.add_argument("--halflife-hr", type=float, default=STPConfig().halflife_hr,
+                        help="STP biodegradation half-life in hours")
+    submit.set_defaults(func=run_submit)
+
+    work = commands.add_parser(
+        "work",
+        help="run jobs from a shared job queue",
+        description="Claim and run jobs from a SQLite job queue until it is drained. "
+                    "Start one per host or process; crashed workers' jobs are reclaimed "
+                    "when their lease expires.",
+    )
+    work.add_argument("queue", type=Path, help="SQLite job queue")
+    work.add_argument("--es-dir", type=Path, default=defaults.es_dir, help="EPI Suite installation directory")
+    work.add_argument("-w", "--workers", type=int, default=defaults.workers,
+                      help="number of concurrent EPI Suite processes")
+    work.add_argument("--chunk-size", type=int, default=defaults.chunk_size,
+                      help="chemicals per claim and EPI Suite launch")
+    work.add_argument("--timeout", type=int, default=defaults.timeout, help="timeout per chemical in seconds")
+    work.add_argument("--columns", help="comma-separated output columns to keep (all if omitted)")
+    work.add_argument("--model", choices=sorted(MODEL_PRESETS), default="full",
+                      help="model preset; stp_only keeps just the STP outputs")
+    work.add_argument("--lease", type=float, default=600.0,
+                      help="seconds a claim lasts before other workers may take it over")
+    work.add_argument("--worker-id", help="name recorded on claimed jobs (host name and process id by default)")
+    work.add_argument("--validate", action="store_true",
+                      help="fail invalid CAS RNs and malformed SMILES without launching EPI Suite")
+    work.add_argument("--cache", type=Path, help="SQLite result cache")
+    work.set_defaults(func=run_work)
+
+    collect = commands.add_parser(
+        "collect",
+        help="write the results of a shared job queue",
+        description="Write the finished results of a SQLite job queue to a CSV file or a Parquet directory.",
+    )
+    collect.add_argument("queue", type=Path, help="SQLite job queue")
+    collect.add_argument("-o", "--output", type=Path, required=True,
+                         help="result .csv file, or directory of Parquet parts")
+    collect.add_argument("--rows-per-part", type=int, default=10000, help="rows per Parquet part file")
+    collect.set_defaults(func=run_collect)
+
+    serve = commands.add_parser(
+        "serve",
+        help="serve get_data to other processes",
+        description="Serve EPI Suite over localhost HTTP from a warm pool of workspaces, "
+                    "for use with EPySuiteClient.",
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    serve.add_argument("--es-dir", type=Path, default=defaults.es_dir, help="EPI Suite installation directory")
+    serve.add_argument("-w", "--workers", type=int, default=defaults.workers,
+                       help="number of concurrent EPI Suite processes")
+    serve.add_argument("--timeout", type=int, default=defaults.timeout, help="timeout per chemical in seconds")
+    serve.add_argument("--cache", type=Path, help="SQLite result cache")
+    serve.set_defaults(func=run_serve)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of the ``epysuite`` command."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except EPYSuiteError as err:
+        print(f"epysuite: error: {err}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun with --resume to continue", file=sys.stderr)
+        return 130
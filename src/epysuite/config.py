@@ -4,7 +4,25 @@
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Literal
+from typing import Any, Dict, List, Literal, Optional
+
+from .exceptions import ConfigurationError
+
+# STPWIN output columns of tabout.txt, plus the columns identifying each chemical
+STP_COLUMNS = [
+    "Chemical name",
+    "SMILES",
+    "STP Total Removal (%)",
+    "STP Biodegradation (%)",
+    "STP Sludge Adsorption (%)",
+    "STP Volatilization (%)",
+]
+
+# Keyword arguments of ModelConfig for each preset
+MODEL_PRESETS: Dict[str, Dict[str, Any]] = {
+    "full": {},
+    "stp_only": {"outputs": STP_COLUMNS},
+}
 
 
 @dataclass
@@ -29,19 +47,133 @@ class STPConfig:
         return [header] + config_lines
 
 
+def _format_value(value: Optional[float]) -> str:
+    """Format an input value the way the EPI Suite input template does."""
+    return "(null)" if value is None else f"{value:g}"
+
+
+@dataclass
+class ModelConfig:
+    """Options of an EPI Suite CALCULATE block, the lines after the SMILES and name.
+
+    The defaults reproduce the bundled ``epi_inp.txt`` template. Experimental
+    values left as None are written as "(null)", so EPI Suite estimates them.
+    ``outputs`` limits the parsed output columns when ``EPySuiteConfig.columns``
+    is not set; see ``ModelConfig.preset``.
+    """
+    melting_point: Optional[float] = None  # Experimental melting point (deg C)
+    boiling_point: Optional[float] = None  # Experimental boiling point (deg C)
+    vapor_pressure: Optional[float] = None  # Experimental vapor pressure (mm Hg)
+    water_solubility: Optional[float] = None  # Experimental water solubility (mg/L)
+    log_kow: Optional[float] = None  # Experimental log Kow
+    river_depth_m: float = 1.0  # Volatilization model river
+    lake_depth_m: float = 1.0  # Volatilization model lake
+    river_wind_m_s: float = 5.0
+    lake_wind_m_s: float = 0.5
+    river_current_m_s: float = 1.0
+    lake_current_m_s: float = 0.05
+    outputs: Optional[List[str]] = None  # Output columns to parse (all if None)
+    
+    @classmethod
+    def preset(cls, name: str, **overrides: Any) -> "ModelConfig":
+        """
+        Build a named preset, e.g. ``ModelConfig.preset("stp_only")``.
+        
+        Args:
+            name: One of ``MODEL_PRESETS`` ("full" or "stp_only")
+            **overrides: Fields to change from the preset
+        """
+        if name not in MODEL_PRESETS:
+            raise ConfigurationError(f"Unknown model preset {name!r}, expected one of {sorted(MODEL_PRESETS)}")
+        return cls(**{**MODEL_PRESETS[name], **overrides})
+    
+    def get_config_lines(self) -> List[str]:
+        """Generate the option lines of a CALCULATE block."""
+        experimental = [
+            self.melting_point,
+            self.boiling_point,
+            self.vapor_pressure,
+            self.water_solubility,
+            self.log_kow,
+        ]
+        volatilization = [
+            self.river_depth_m,
+            self.lake_depth_m,
+            self.river_wind_m_s,
+            self.lake_wind_m_s,
+            self.river_current_m_s,
+            self.lake_current_m_s,
+        ]
+        # The remaining lines are passed through from the template unchanged
+        values = [_format_value(value) for value in experimental] + ["0 "]
+        values += [_format_value(value) for value in volatilization] + ["(null)", "0"]
+        return [f"{value}\n" for value in values]
+
+
+@dataclass
+class SchedulerPolicy:
+    """Adaptive timeout, retry and quarantine policy for batch runs."""
+    timeout_multiple: float = 3.0  # Adaptive timeouts are this multiple of the runtime quantile
+    timeout_quantile: float = 0.99  # Quantile of observed runtimes per chemical
+    min_samples: int = 20  # Successful runs observed before timeouts adapt
+    min_timeout: float = 2.0  # Floor of adaptive timeouts in seconds
+    retries: int = 2  # Extra attempts for records that time out or crash
+    backoff: float = 0.5  # Delay before the first retry in seconds, doubled for each further one
+    max_backoff: float = 30.0  # Longest delay between retries in seconds
+    quarantine_after: int = 2  # Batch runs a record may fail (after retries) before it is quarantined
+    quarantine_path: Optional[Path] = None  # SQLite quarantine list (cache_path, or in memory, if None)
+    
+    def __post_init__(self):
+        """Convert paths to absolute Path objects."""
+        if isinstance(self.quarantine_path, (str, Path)):
+            self.quarantine_path = Path(self.quarantine_path).resolve()
+
+
 @dataclass
 class EPySuiteConfig:
     """Main configuration for EPY Suite."""
     es_dir: Path = field(default_factory=lambda: Path("C:/EPISUITE41"))
     timeout: int = 20
-    data_format: Literal["polars", "pandas"] = "polars"
+    data_format: Literal["polars", "pandas", "pyarrow", "records"] = "polars"
+    downcast: bool = False  # Store numeric results as float32 instead of float64 (pandas only)
+    category_columns: Optional[List[str]] = None  # Columns always stored as categoricals (pandas only)
     use_tabout: bool = True  # Whether to use tabout.txt instead of sumbrief.epi
+    columns: Optional[List[str]] = None  # Output columns to parse, in order (model.outputs if None)
+    model: ModelConfig = field(default_factory=ModelConfig)  # Options written to each CALCULATE block
+    stp_fast_path: bool = False  # Rerun only STPWIN32 when just the STP configuration changes
+    workers: int = 1  # Number of parallel workspaces used by batch runs
+    chunk_size: int = 1  # Number of chemicals packed into one EPI Suite launch by batch runs
+    dedup: bool = True  # Run records sharing a normalized SMILES and STP configuration once in batch runs
+    validate: bool = False  # Reject invalid CAS RNs (check digit) and malformed SMILES before launching EPI Suite
+    workspace_root: Optional[Path] = None  # Where worker workspaces are staged (system temp if None)
+    workspace_tmpfs: bool = False  # Stage workspaces in RAM under /dev/shm when no workspace_root is set (Linux)
+    link_mode: Literal["copy", "hardlink", "symlink"] = "hardlink"  # How workspaces mirror es_dir
+    cache_path: Optional[Path] = None  # SQLite result cache and CAS→SMILES table (disabled if None)
+    cache_max_bytes: Optional[int] = None  # Evict least recently used results beyond this size
+    cache_max_age: Optional[float] = None  # Expire cached results after this many seconds
+    scheduler: Optional[SchedulerPolicy] = None  # Adaptive timeouts, retries and quarantine (fixed timeout if None)
     
     def __post_init__(self):
-        """Convert string path to Path object if necessary."""
-        if isinstance(self.es_dir, str):
+        """Convert paths to absolute Path objects, so they stay valid inside es_dir (EPI Suite's working directory)."""
+        if isinstance(self.es_dir, (str, Path)):
             self.es_dir = Path(self.es_dir).resolve()
+        if isinstance(self.workspace_root, (str, Path)):
+            self.workspace_root = Path(self.workspace_root).resolve()
+        if isinstance(self.cache_path, (str, Path)):
+            self.cache_path = Path(self.cache_path).resolve()
             
+    @property
+    def output_columns(self) -> Optional[List[str]]:
+        """Get the output columns to parse, from ``columns`` or the model preset."""
+        return self.columns if self.columns is not None else self.model.outputs
+    
+    @property
+    def format_options(self) -> Dict[str, Any]:
+        """Get the backend options of ``data_format``, as passed to ``get_backend``."""
+        if self.data_format != "pandas":
+            return {}
+        return {"downcast": self.downcast, "categories": frozenset(self.category_columns or ())}
+    
     @property
     def app_path(self) -> Path:
         """Get the path to the EPI Suite executable."""
@@ -2,6 +2,9 @@
 
 """Custom exceptions for the EPYSuite package."""
 
+from typing import Optional
+
+
 class EPYSuiteError(Exception):
     """Base exception for EPY Suite errors."""
     pass
@@ -14,10 +17,29 @@ class ExecutionError(EPYSuiteError):
     """Raised when EPI Suite execution fails."""
     pass
 
+class SmilesNotFoundError(ExecutionError):
+    """Raised when EPI Suite has no SMILES for a CAS RN."""
+    pass
+
 class TimeoutError(EPYSuiteError):
     """Raised when EPI Suite execution times out."""
     pass
 
 class FileHandlingError(EPYSuiteError):
     """Raised when there's an error handling input/output files."""
-    pass
\ No newline at end of file
+    pass
+
+class ValidationError(EPYSuiteError):
+    """Raised when a CAS RN or SMILES fails pre-flight validation."""
+
+    def __init__(
+        self,
+        message: str,
+        field: Optional[str] = None,
+        value: Optional[str] = None,
+        reason: Optional[str] = None
+    ):
+        super().__init__(message)
+        self.field = field  # "cas_rn" or "smiles"
+        self.value = value
+        self.reason = reason
@@ -0,0 +1,231 @@
+# src/epysuite/jobs.py
+
+"""Durable SQLite job queue shared by worker processes on one or more hosts."""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .accumulator import ResultAccumulator
+from .backends import Frame
+from .batch import BatchRecord, to_record
+from .cache import make_key
+from .config import STPConfig
+from .exceptions import FileHandlingError
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A batch record claimed from a JobQueue."""
+    id: int
+    record: BatchRecord
+    attempts: int
+
+
+class JobQueue:
+    """Table of (CAS RN, SMILES, STPConfig) jobs drained by any number of workers.
+
+    Workers ``claim`` pending jobs under a lease, then ``complete`` or
+    ``fail`` them. A job whose lease runs out, because its worker crashed or
+    lost its host, becomes claimable again; after ``max_attempts`` claims it
+    is marked failed instead, so a job that keeps killing workers cannot
+    stall the queue. Submitting the same record twice adds one job.
+
+    The database can live on a path shared between hosts, provided the file
+    system supports SQLite's file locking.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 600.0, max_attempts: int = 3):
+        """
+        Open (or create) a job queue.
+
+        Args:
+            path: Path to the SQLite database file
+            lease_seconds: How long a claim lasts before the job can be reclaimed
+            max_attempts: Claims after which a job that never finished is marked failed
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL, cas_rn TEXT NOT NULL, "
+                    "smiles TEXT, stp_config TEXT, state TEXT NOT NULL, worker TEXT, "
+                    "lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT, "
+                    "result TEXT, updated REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires)")
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error opening job queue: {self.path}") from err
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the queue database."""
+        conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 60000")
+        return conn
+
+    def submit(self, records: Iterable[Any]) -> int:
+        """
+        Add batch records as pending jobs.
+
+        Args:
+            records: CAS RNs, tuples, mappings or BatchRecords, as accepted by ``get_data_batch``
+
+        Returns:
+            Number of jobs added; records already in the queue are skipped
+        """
+        now = time.time()
+        rows = []
+        for record in map(to_record, records):
+            stp_config = json.dumps(asdict(record.stp_config)) if record.stp_config is not None else None
+            key = make_key(record.cas_rn, record.smiles, stp_config)
+            rows.append((key, record.cas_rn, record.smiles, stp_config, PENDING, now))
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (key, cas_rn, smiles, stp_config, state, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                added = conn.total_changes - before
+                conn.execute("COMMIT")
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error submitting to job queue: {self.path}") from err
+        return added
+
+    def claim(self, worker: str, limit: int = 1) -> List[Job]:
+        """
+        Lease up to ``limit`` jobs to a worker.
+
+        Pending jobs are handed out in submission order, followed by jobs
+        whose lease has expired. Expired jobs that have used up their
+        attempts are marked failed on the way.
+        """
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn:
+                # An immediate transaction stops two workers claiming the same rows
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "UPDATE jobs SET state = ?, error = ?, updated = ? "
+                    "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, "Lease expired too many times", now, LEASED, now, self.max_attempts)
+                )
+                rows = conn.execute(
+                    "SELECT id, cas_rn, smiles, stp_config, attempts FROM jobs "
+                    "WHERE state = ? OR (state = ? AND lease_expires < ?) ORDER BY id LIMIT ?",
+                    (PENDING, LEASED, now, limit)
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(LEASED, worker, now + self.lease_seconds, now, row[0]) for row in rows]
+                )
+                conn.execute("COMMIT")
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error claiming from job queue: {self.path}") from err
+        return [
+            Job(
+                id=job_id,
+                record=BatchRecord(cas_rn, smiles, STPConfig(**json.loads(stp)) if stp is not None else None),
+                attempts=attempts + 1,
+            )
+            for job_id, cas_rn, smiles, stp, attempts in rows
+        ]
+
+    def complete(self, job: Job, worker: str, columns: List[str], rows: List[List[Any]]) -> bool:
+        """
+        Store the result of a job.
+
+        Returns:
+            False if the job was finished by another worker after its lease was reclaimed
+        """
+        payload = json.dumps({"columns": columns, "rows": rows})
+        return self._finish(job, worker, DONE, None, payload)
+
+    def fail(self, job: Job, worker: str, error: Exception) -> bool:
+        """Mark a job failed with the error it raised."""
+        return self._finish(job, worker, FAILED, f"{type(error).__name__}: {error}", None)
+
+    def _finish(self, job: Job, worker: str, state: str, error: Optional[str], result: Optional[str]) -> bool:
+        """Move a leased job to a final state unless another worker got there first."""
+        try:
+            with closing(self._connect()) as conn:
+                cursor = conn.execute(
+                    "UPDATE jobs SET state = ?, worker = ?, error = ?, result = ?, "
+                    "lease_expires = NULL, updated = ? WHERE id = ? AND state = ?",
+                    (state, worker, error, result, time.time(), job.id, LEASED)
+                )
+                return cursor.rowcount == 1
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error updating job queue: {self.path}") from err
+
+    def extend(self, jobs: Iterable[Job], worker: str) -> None:
+        """Renew the leases a worker holds on long-running jobs."""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn:
+                conn.executemany(
+                    "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                    [(now + self.lease_seconds, now, job.id, worker, LEASED) for job in jobs]
+                )
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error updating job queue: {self.path}") from err
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs in each state."""
+        try:
+            with closing(self._connect()) as conn:
+                counts = dict(conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading job queue: {self.path}") from err
+        return {state: counts.get(state, 0) for state in (PENDING, LEASED, DONE, FAILED)}
+
+    def failures(self) -> Dict[str, str]:
+        """Return the CAS RNs of failed jobs mapped to their errors."""
+        try:
+            with closing(self._connect()) as conn:
+                return dict(conn.execute(
+                    "SELECT cas_rn, error FROM jobs WHERE state = ? ORDER BY id", (FAILED,)
+                ).fetchall())
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading job queue: {self.path}") from err
+
+    def retry_failed(self) -> int:
+        """Make failed jobs pending again, returning how many were reset."""
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = 0, error = NULL, updated = ? WHERE state = ?",
+                    (PENDING, time.time(), FAILED)
+                ).rowcount
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error updating job queue: {self.path}") from err
+
+    def results(self, format: str = "polars") -> Frame:
+        """Build one frame keyed by ``cas_rn`` from all finished jobs, in submission order."""
+        accumulator = ResultAccumulator()
+        try:
+            with closing(self._connect()) as conn:
+                for cas_rn, result in conn.execute(
+                    "SELECT cas_rn, result FROM jobs WHERE state = ? ORDER BY id", (DONE,)
+                ):
+                    payload = json.loads(result)
+                    accumulator.add(payload["columns"], payload["rows"], cas_rn=cas_rn)
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error reading job queue: {self.path}") from err
+        return accumulator.to_frame(format)
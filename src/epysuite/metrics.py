@@ -0,0 +1,182 @@
+# src/epysuite/metrics.py
+
+"""Timing and metrics instrumentation for EPI Suite runs."""
+
+import bisect
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Upper bounds for stage wall times in seconds and output file sizes in bytes
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class MetricEvent:
+    """A single observation passed to metrics hooks."""
+    name: str
+    value: float
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value to the bucket of the smallest bound it does not exceed."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, cumulative count) pairs ending with +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Metrics:
+    """Per-stage wall times, process exit statuses and output sizes of EPI Suite runs.
+
+    Pass an instance to ``EPySuiteRunner(metrics=...)``. Stage wall times are
+    aggregated into the ``stage_seconds`` histogram labelled by stage, output
+    file sizes into ``output_bytes``, and process exit codes and timeouts into
+    the ``process_exits_total`` and ``process_timeouts_total`` counters. Every
+    observation is also passed to the registered hooks as a ``MetricEvent``.
+    A runner without metrics skips all of this.
+    """
+
+    def __init__(self, hooks: Sequence[Callable[[MetricEvent], None]] = ()):
+        """
+        Create an empty metrics registry.
+
+        Args:
+            hooks: Callables invoked with every MetricEvent (optional)
+        """
+        self.hooks: List[Callable[[MetricEvent], None]] = list(hooks)
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[MetricEvent], None]) -> None:
+        """Register a callable to receive every MetricEvent."""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Record the wall time of a block as a stage, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - start, stage=stage)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Add a value to a histogram."""
+        buckets = SIZE_BUCKETS if name.endswith("_bytes") else TIME_BUCKETS
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+        self._notify(name, value, labels)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+        self._notify(name, amount, labels)
+
+    def _notify(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        """Pass an observation to the hooks."""
+        if self.hooks:
+            event = MetricEvent(name, value, labels)
+            for hook in self.hooks:
+                hook(event)
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+    def to_dict(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Return a JSON-serializable snapshot of all histograms and counters."""
+        with self._lock:
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": {_format_bound(bound): count for bound, count in histogram.cumulative()},
+                    }
+                    for key, histogram in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+        return {"histograms": histograms, "counters": counters}
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize ``to_dict`` as JSON; keyword arguments go to ``json.dumps``."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "epysuite") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.to_dict()
+        lines = []
+        for name, series in snapshot["histograms"].items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for entry in series:
+                for bound, count in entry["buckets"].items():
+                    lines.append(f"{metric}_bucket{_format_labels(entry['labels'], le=bound)} {count}")
+                lines.append(f"{metric}_sum{_format_labels(entry['labels'])} {entry['sum']}")
+                lines.append(f"{metric}_count{_format_labels(entry['labels'])} {entry['count']}")
+        for name, series in snapshot["counters"].items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for entry in series:
+                lines.append(f"{metric}{_format_labels(entry['labels'])} {entry['value']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_bound(bound: float) -> str:
+    """Format a bucket bound the way Prometheus expects."""
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    """Render a Prometheus label set."""
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
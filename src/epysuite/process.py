@@ -0,0 +1,55 @@
+# src/epysuite/process.py
+
+"""Launching EPI Suite programs and cleaning up after them."""
+
+import os
+import signal
+import subprocess
+from typing import Any, Dict, List, Optional
+
+
+def group_options() -> Dict[str, Any]:
+    """Return Popen options that start a program in its own process group."""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_tree(pid: int) -> None:
+    """Kill a process started with ``group_options`` and everything it spawned."""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False
+        )
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run(args: List[str], cwd: str, timeout: Optional[float] = None) -> None:
+    """
+    Run a program to completion.
+
+    Unlike ``subprocess.run``, a program that times out (or is interrupted)
+    is killed together with its child processes, so nothing keeps running
+    in, or holding files of, the working directory.
+
+    Raises:
+        subprocess.TimeoutExpired: If the program runs longer than ``timeout`` seconds
+        subprocess.CalledProcessError: If the program exits with a non-zero code
+    """
+    process = subprocess.Popen(args, cwd=cwd, **group_options())
+    try:
+        returncode = process.wait(timeout=timeout)
+    except BaseException:
+        kill_tree(process.pid)
+        process.kill()
+        process.wait()
+        raise
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args)
@@ -2,27 +2,113 @@
 
 """Main module for running EPI Suite calculations."""
 
+import copy
+import hashlib
 import importlib.resources
+import itertools
+import os
+import socket
 import subprocess
-from typing import Optional, Union
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Container,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-import pandas as pd
-import polars as pl
-
-from . import templates
+from . import process, templates
+from .accumulator import ResultAccumulator
+from .backends import Frame, get_backend
+from .batch import BatchRecord, BatchReport, group_records, to_record, to_records
+from .cache import ResultCache, SmilesTable, make_key
 from .config import EPySuiteConfig, STPConfig
-from .exceptions import ConfigurationError, ExecutionError, TimeoutError
-from .utils import clean_outputs, parse_summary, parse_tabout, read_file, write_file
+from .exceptions import (
+    ConfigurationError,
+    EPYSuiteError,
+    ExecutionError,
+    SmilesNotFoundError,
+    TimeoutError,
+)
+from .metrics import Metrics
+from .scheduler import Scheduler
+from .utils import (
+    StagedFiles,
+    clean_outputs,
+    concat_frames,
+    frame_to_rows,
+    insert_column,
+    parse_summary,
+    parse_tabout,
+    read_file,
+    read_tabout,
+    update_columns,
+)
+from .validation import check_cas, validate_record, validate_records
+from .workspace import Workspace, WorkspacePool
+
+if TYPE_CHECKING:
+    from .jobs import Job, JobQueue
+    from .sinks import Sink
+
+# Marks a failed lookup that must not be recorded as "CAS RN not found"
+_MISSING = object()
+
+# Shared no-op stage timer for runners without metrics
+_NO_STAGE = nullcontext()
+
+# Batch records validated together, so a stream is never read far ahead
+_ADMIT_SLICE = 1024
+
+# Result rows of a batch chunk: (cas_rns, columns, rows, positions), with the CAS RN
+# of each row and the position of its record in the chunk passed to ``_run_chunk``
+Part = Tuple[List[str], List[str], List[List[Any]], List[int]]
+
+T = TypeVar("T")
 
 
 class EPySuiteRunner:
     """Main class for running EPI Suite calculations."""
     
-    def __init__(self, config: Optional[EPySuiteConfig] = None):
-        """Initialize the runner with configuration."""
+    def __init__(self, config: Optional[EPySuiteConfig] = None, metrics: Optional[Metrics] = None):
+        """
+        Initialize the runner with configuration.
+        
+        Args:
+            config: EPI Suite configuration (optional)
+            metrics: Collector for per-stage timings, exit codes and output sizes (optional)
+        """
         self.config = config or EPySuiteConfig()
+        self.metrics = metrics
+        self.last_batch = BatchReport()
+        self._stp_base: Optional[Tuple[Tuple[str, str, Optional[List[str]]], Frame]] = None
+        self._attempt = 0
+        self._staged = StagedFiles()
+        # Output files removed before each run; found by listing es_dir once
+        self._output_names: Optional[List[str]] = None
+        self._workspace_runners: "weakref.WeakKeyDictionary[Workspace, EPySuiteRunner]" = (
+            weakref.WeakKeyDictionary()
+        )
         self._validate_installation()
         self._load_templates()
+        self._init_cache()
+        self.scheduler: Optional[Scheduler] = None
+        if self.config.scheduler is not None:
+            self.scheduler = Scheduler(self.config.scheduler, self.config.timeout, self.config.cache_path)
     
     def _validate_installation(self) -> None:
         """Validate EPI Suite installation."""
@@ -30,6 +116,8 @@ class EPySuiteRunner:
             raise ConfigurationError(
                 f"EPI Suite executable not found at {self.config.app_path}"
             )
+        # Loads the output library, failing early on unknown formats or missing packages
+        get_backend(self.config.data_format, **self.config.format_options)
     
     def _load_templates(self) -> None:
         """Load the EPI Suite template files."""
@@ -41,12 +129,52 @@ class EPySuiteRunner:
         except Exception as err:
             raise ConfigurationError("Failed to load EPI Suite templates") from err
     
+    def _init_cache(self) -> None:
+        """Open the result cache and CAS→SMILES table if a cache path is configured."""
+        self.cache: Optional[ResultCache] = None
+        self.smiles_table: Optional[SmilesTable] = None
+        if self.config.cache_path is None:
+            return
+        self.smiles_table = SmilesTable(self.config.cache_path)
+        self.cache = ResultCache(
+            self.config.cache_path,
+            max_bytes=self.config.cache_max_bytes,
+            max_age=self.config.cache_max_age
+        )
+        # Results depend on the rendered templates and on the EPI Suite build that produced them
+        app_stat = self.config.app_path.stat()
+        input_lines = self.input_template[:3] + self.config.model.get_config_lines()
+        template_hash = hashlib.sha256(
+            "".join(input_lines + self.stp_template).encode("utf-8")
+        ).hexdigest()
+        self._cache_salt = [template_hash, app_stat.st_size, app_stat.st_mtime_ns]
+    
+    def _cache_key(
+        self,
+        cas_rn: str,
+        smiles: Optional[str],
+        stp_config: STPConfig,
+        columns: Optional[List[str]]
+    ) -> Optional[str]:
+        """Build the result cache key for a run, or None if caching is disabled."""
+        if self.cache is None:
+            return None
+        return make_key(
+            cas_rn,
+            smiles,
+            stp_config.get_config_lines(),
+            self.config.use_tabout,
+            columns,
+            self._cache_salt
+        )
+    
     def get_data(
         self,
         cas_rn: str,
         smiles: Optional[str] = None,
-        stp_config: Optional[STPConfig] = None
-    ) -> Union[pl.DataFrame, pd.DataFrame]:
+        stp_config: Optional[STPConfig] = None,
+        columns: Optional[List[str]] = None
+    ) -> Frame:
         """
         Get EPI Suite data for a compound.
         
@@ -54,82 +182,1000 @@ class EPySuiteRunner:
             cas_rn: CAS Registry Number
             smiles: SMILES notation (optional)
             stp_config: STP configuration (optional)
+            columns: Output columns to parse, in order (defaults to config.output_columns)
             
         Returns:
             DataFrame containing EPI Suite results
         """
+        self._validate(cas_rn, smiles)
         stp_config = stp_config or STPConfig()
+        columns = self.config.output_columns if columns is None else list(columns)
+        
+        # Serve repeated runs from the result cache
+        key = self._cache_key(cas_rn, smiles, stp_config, columns)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+        
+        df = self._compute(cas_rn, smiles, stp_config, columns)
+        self._store_result(key, cas_rn, df)
+        return df
+    
+    def _validate(self, cas_rn: str, smiles: Optional[str]) -> None:
+        """Raise ValidationError for an invalid CAS RN or SMILES when ``config.validate`` is on."""
+        if self.config.validate:
+            error = validate_record(BatchRecord(cas_rn, smiles))
+            if error is not None:
+                raise error
+    
+    def _stage(self, stage: str) -> ContextManager[None]:
+        """Time a block as a named stage when metrics are enabled."""
+        if self.metrics is None:
+            return _NO_STAGE
+        return self.metrics.time(stage)
+    
+    def _compute(
+        self,
+        cas_rn: str,
+        smiles: Optional[str],
+        stp_config: STPConfig,
+        columns: Optional[List[str]]
+    ) -> Frame:
+        """Run EPI Suite for a compound, bypassing the result cache."""
+        # Rerun only STPWIN32 when this directory already holds a full run of the chemical
+        if self._stp_base is not None:
+            (base_cas_rn, base_smiles, base_columns), base_df = self._stp_base
+            if base_cas_rn == cas_rn and smiles in (None, base_smiles) and columns == base_columns:
+                return self._get_stp_data(cas_rn, stp_config, base_df, columns)
+        self._stp_base = None
         
         # Clean previous output files
-        clean_outputs(self.config.es_dir)
+        self._clean_outputs()
         
         # Handle SMILES lookup if needed
         if smiles is None:
             smiles = self._lookup_smiles(cas_rn)
         
         # Update input configuration
-        self._update_input_config(cas_rn, smiles)
-        self._update_stp_config(stp_config)
+        with self._stage("write_input"):
+            self._update_input_config(cas_rn, smiles)
+            self._update_stp_config(stp_config)
         
         # Run EPI Suite
         try:
-            self._run_episuite()
+            with self._stage("run_episuite"):
+                self._run_episuite()
         except subprocess.TimeoutExpired as err:
             raise TimeoutError(f"Execution timed out for CAS RN: {cas_rn}") from err
         except subprocess.CalledProcessError as err:
             raise ExecutionError(f"Execution failed for CAS RN: {cas_rn}") from err
         
-        # Parse and return results based on configuration
-        if self.config.use_tabout:
-            return parse_tabout(
+        df = self._parse_results(columns)
+        if self.config.stp_fast_path and self.config.use_tabout:
+            self._stp_base = ((cas_rn, smiles, columns), df)
+        return df
+    
+    def _get_stp_data(
+        self,
+        cas_rn: str,
+        stp_config: STPConfig,
+        base_df: Frame,
+        columns: Optional[List[str]]
+    ) -> Frame:
+        """
+        Rerun STPWIN32 for the chemical staged by the last full run.
+        
+        Only ``stpvalsx`` is rewritten. STPWIN32 reuses the properties the full
+        suite left in the working directory, and the columns of its tabout
+        output replace those of the full-run result.
+        """
+        try:
+            self.config.tabout_path.unlink()
+        except FileNotFoundError:
+            pass
+        with self._stage("write_input"):
+            self._update_stp_config(stp_config)
+        
+        try:
+            with self._stage("run_stpwin"):
+                self._run_process([str(self.config.stpwin_path)])
+        except subprocess.TimeoutExpired as err:
+            raise TimeoutError(f"STPWIN execution timed out for CAS RN: {cas_rn}") from err
+        except subprocess.CalledProcessError as err:
+            raise ExecutionError(f"STPWIN execution failed for CAS RN: {cas_rn}") from err
+        
+        self._record_output(self.config.tabout_path)
+        with self._stage("parse"):
+            stp_df = parse_tabout(
                 self.config.tabout_path,
-                format=self.config.data_format
+                format=self.config.data_format,
+                columns=columns,
+                **self.config.format_options
             )
+        return update_columns(base_df, stp_df)
+    
+    def _cached_result(self, key: Optional[str]) -> Optional[Frame]:
+        """Return the cached result for a key, or None on a miss."""
+        cached = self._cached_table(key)
+        if cached is None:
+            return None
+        # Type cached cells like a fresh parse, whichever run stored them
+        table = ResultAccumulator(keys=())
+        table.add(*cached)
+        return table.to_frame(self.config.data_format, **self.config.format_options)
+    
+    def _cached_table(self, key: Optional[str]) -> Optional[Tuple[List[str], List[List[Any]]]]:
+        """Return the cached (columns, rows) for a key, or None on a miss."""
+        if key is None:
+            return None
+        with self._stage("cache_read"):
+            return self.cache.get(key)
+    
+    def _store_result(self, key: Optional[str], cas_rn: str, df: Frame) -> None:
+        """Store a parsed result in the cache if caching is enabled."""
+        if key is not None:
+            with self._stage("cache_write"):
+                self.cache.put(key, cas_rn, *frame_to_rows(df))
+    
+    def _parse_results(self, columns: Optional[List[str]]) -> Frame:
+        """Parse the output of the last run based on configuration."""
+        if self.config.use_tabout:
+            self._record_output(self.config.tabout_path)
+            with self._stage("parse"):
+                return parse_tabout(
+                    self.config.tabout_path,
+                    format=self.config.data_format,
+                    columns=columns,
+                    **self.config.format_options
+                )
         else:
-            return parse_summary(
-                self.config.summary_path,
-                format=self.config.data_format
+            self._record_output(self.config.summary_path)
+            with self._stage("parse"):
+                return parse_summary(
+                    self.config.summary_path,
+                    format=self.config.data_format,
+                    columns=columns
+                )
+    
+    def _record_output(self, path: Path) -> None:
+        """Record the size of an output file when metrics are enabled."""
+        if self.metrics is not None and path.exists():
+            self.metrics.observe("output_bytes", path.stat().st_size, file=path.name)
+    
+    def get_data_batch(
+        self,
+        records: Iterable[Any],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        on_error: Literal["raise", "skip"] = "raise"
+    ) -> Frame:
+        """
+        Get EPI Suite data for many compounds in parallel.
+        
+        Each worker runs in its own staged copy of the installation (see
+        ``Workspace``), so EPI Suite processes never share input or output files.
+        With ``chunk_size`` above 1, consecutive records sharing an STP
+        configuration are packed into one input file and run by a single EPI
+        Suite launch. A chunk that fails is bisected until the offending
+        records are isolated, so one bad structure only costs its own row.
+        
+        With ``config.dedup`` on, records sharing a normalized SMILES and STP
+        configuration (salts, synonyms, repeated CAS RNs) are run once and the
+        result is copied to each of them; ``last_batch.dedup_ratio`` reports
+        the share of records that did not need a run of their own.
+        
+        Args:
+            records: CAS RNs, (cas_rn, smiles[, stp_config]) tuples, mappings
+                with those keys, or BatchRecord instances
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            chunk_size: Number of chemicals per EPI Suite launch (defaults to config.chunk_size)
+            on_error: "raise" to stop on the first failure, "skip" to leave failed
+                records out of the result and list them in ``last_batch.errors``
+            
+        Returns:
+            DataFrame with one block of rows per compound, keyed by a leading
+            ``cas_rn`` column, in the order the records were given
+        """
+        records = to_records(records)
+        self.last_batch = BatchReport(total=len(records))
+        records = list(self._admitted(records, on_error=on_error))
+        unique, groups = records, list(range(len(records)))
+        if self.config.dedup:
+            unique, groups = group_records(records, self._known_smiles_many(records))
+        chunks = list(self._iter_chunks(unique, chunk_size or self.config.chunk_size))
+        self.last_batch.unique = len(unique)
+        
+        chunk_parts = self._map_workspaces(
+            lambda runner, chunk: self._run_chunk(runner, chunk, on_error),
+            chunks,
+            workers or self.config.workers
+        )
+        # Turn positions within each chunk into positions within the unique records
+        parts: List[Part] = []
+        offset = 0
+        for chunk, chunk_part in zip(chunks, chunk_parts):
+            for cas_rns, columns, rows, positions in chunk_part:
+                parts.append((cas_rns, columns, rows, [offset + position for position in positions]))
+            offset += len(chunk)
+        if len(unique) < len(records):
+            parts = self._fan_out(records, unique, groups, parts)
+        return self._assemble(parts)
+    
+    def _known_smiles_many(self, records: List[BatchRecord]) -> Dict[str, Optional[str]]:
+        """Return the SMILES already recorded for records submitted without one."""
+        missing = [record.cas_rn for record in records if record.smiles is None]
+        if self.smiles_table is None or not missing:
+            return {}
+        return self.smiles_table.get_many(missing)
+    
+    def _fan_out(
+        self,
+        records: List[BatchRecord],
+        unique: List[BatchRecord],
+        groups: List[int],
+        parts: List[Part]
+    ) -> List[Part]:
+        """Copy each unique record's result rows to every record of its group, in record order."""
+        # Rows are matched by position, as records sharing a CAS RN may differ in SMILES
+        results: Dict[int, Tuple[List[str], List[List[Any]]]] = {}
+        for _, columns, rows, positions in parts:
+            for position, row in zip(positions, rows):
+                results.setdefault(position, (columns, []))[1].append(row)
+        
+        fanned: List[Part] = []
+        for record, group in zip(records, groups):
+            if group not in results:
+                error = self.last_batch.errors.get(unique[group].cas_rn)
+                if error is not None:
+                    self.last_batch.errors.setdefault(record.cas_rn, error)
+                continue
+            columns, rows = results[group]
+            if record is not unique[group]:
+                # EPI Suite echoes the CAS RN a chemical was run under ("Chemical name",
+                # "CAS Number"), so every cell holding it is rewritten for the copy
+                run_as = unique[group].cas_rn
+                rows = [
+                    [record.cas_rn if isinstance(value, str) and value.strip() == run_as else value for value in row]
+                    for row in rows
+                ]
+            fanned.append(([record.cas_rn] * len(rows), columns, rows, [group] * len(rows)))
+        return fanned
+    
+    def _assemble(self, parts: Iterable[Part]) -> Frame:
+        """Build one frame keyed by ``cas_rn`` from result parts, typing each column once."""
+        results = ResultAccumulator()
+        for cas_rns, columns, rows, _ in parts:
+            results.add(columns, rows, cas_rn=cas_rns)
+        return results.to_frame(self.config.data_format, **self.config.format_options)
+    
+    def _iter_chunks(self, records: Iterable[BatchRecord], chunk_size: int) -> Iterator[List[BatchRecord]]:
+        """Split records into launch-sized chunks of identical STP configuration."""
+        if chunk_size < 1:
+            raise ConfigurationError(f"Chunk size must be at least 1, got {chunk_size}")
+        if chunk_size > 1 and not self.config.use_tabout:
+            raise ConfigurationError("Multi-chemical chunks require use_tabout=True")
+        
+        chunk: List[BatchRecord] = []
+        previous = None
+        for record in records:
+            stp_lines = (record.stp_config or STPConfig()).get_config_lines()
+            if chunk and (len(chunk) >= chunk_size or stp_lines != previous):
+                yield chunk
+                chunk = []
+            chunk.append(record)
+            previous = stp_lines
+        if chunk:
+            yield chunk
+    
+    def iter_data(
+        self,
+        records: Iterable[Any],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        on_error: Literal["raise", "skip"] = "raise",
+        skip: Optional[Container[str]] = None
+    ) -> Iterator[Frame]:
+        """
+        Stream EPI Suite data for many compounds as each chunk finishes.
+        
+        Works like ``get_data_batch`` but consumes ``records`` lazily and keeps
+        only a few chunks in flight per worker, so memory stays flat however
+        large the inventory is. Frames are yielded in completion order.
+        Unlike ``get_data_batch``, records are not deduplicated, since that
+        would mean holding every result until the stream ends.
+        
+        Args:
+            records: CAS RNs, (cas_rn, smiles[, stp_config]) tuples, mappings
+                with those keys, or BatchRecord instances
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            chunk_size: Number of chemicals per EPI Suite launch (defaults to config.chunk_size)
+            on_error: "raise" to stop on the first failure, "skip" to leave failed
+                records out and list them in ``last_batch.errors``
+            skip: CAS RNs to leave out, e.g. ``sink.completed`` when resuming
+            
+        Yields:
+            DataFrames with a leading ``cas_rn`` column, one per finished chunk
+        """
+        records = (to_record(record) for record in records)
+        if skip is not None:
+            records = (record for record in records if record.cas_rn not in skip)
+        records = self._admitted(records, count=True, on_error=on_error)
+        chunks = self._iter_chunks(records, chunk_size or self.config.chunk_size)
+        self.last_batch = BatchReport()
+        
+        for chunk, parts in self._imap_workspaces(
+            lambda runner, chunk: self._run_chunk(runner, chunk, on_error),
+            chunks,
+            workers or self.config.workers
+        ):
+            self.last_batch.total += len(chunk)
+            self.last_batch.unique += len(chunk)
+            if parts:
+                yield self._assemble(parts)
+    
+    def write_data(
+        self,
+        records: Iterable[Any],
+        sink: "Sink",
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        on_error: Literal["raise", "skip"] = "raise"
+    ) -> None:
+        """
+        Stream EPI Suite data for many compounds into a checkpointed sink.
+        
+        Chemicals the sink already holds (its ``completed`` set) are skipped, so an
+        interrupted job picks up where it stopped when run again.
+        
+        Args:
+            records: Batch records, as accepted by ``iter_data``
+            sink: Destination for the results
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            chunk_size: Number of chemicals per EPI Suite launch (defaults to config.chunk_size)
+            on_error: "raise" to stop on the first failure, "skip" to continue past failures
+        """
+        for df in self.iter_data(records, workers, chunk_size, on_error, skip=sink.completed):
+            sink.write(df)
+        sink.flush()
+    
+    def work(
+        self,
+        queue: "JobQueue",
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        poll: float = 1.0
+    ) -> int:
+        """
+        Run jobs from a shared job queue until it is drained.
+    
+        Each of ``workers`` threads claims ``chunk_size`` jobs at a time, runs
+        them in its own staged workspace and writes the results (or errors)
+        back to the queue, so any number of processes on any hosts that can
+        open the queue file can work through one inventory together. While
+        other workers still hold leases the call waits, polling every
+        ``poll`` seconds, and picks up their jobs if the leases expire.
+    
+        Args:
+            queue: Job queue to drain
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            chunk_size: Number of chemicals per claim and EPI Suite launch (defaults to config.chunk_size)
+            worker_id: Name recorded on claimed jobs (defaults to host name and process id)
+            poll: Seconds between checks for reclaimable jobs
+    
+        Returns:
+            Number of jobs this call completed
+        """
+        workers = workers or self.config.workers
+        chunk_size = chunk_size or self.config.chunk_size
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.last_batch = BatchReport()
+    
+        def drain(index: int, workspace: Workspace) -> int:
+            runner = self._for_workspace(workspace)
+            name = f"{worker_id}:{index}"
+            completed = 0
+            while True:
+                jobs = queue.claim(name, chunk_size)
+                if not jobs:
+                    if not queue.counts()["leased"]:
+                        return completed
+                    time.sleep(poll)
+                    continue
+                completed += self._run_jobs(runner, queue, name, jobs, chunk_size)
+    
+        with WorkspacePool(self.config, workers) as pool:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return sum(executor.map(drain, range(workers), pool.workspaces))
+    
+    def _run_jobs(
+        self,
+        runner: "EPySuiteRunner",
+        queue: "JobQueue",
+        worker: str,
+        jobs: List["Job"],
+        chunk_size: int
+    ) -> int:
+        """Run claimed jobs and write their results back, returning the number completed."""
+        self.last_batch.total += len(jobs)
+        self.last_batch.unique += len(jobs)
+        kept = {id(record) for record in self._admitted([job.record for job in jobs])}
+        admitted = []
+        for job in jobs:
+            if id(job.record) in kept:
+                admitted.append(job)
+            else:
+                cas_rn = job.record.cas_rn
+                queue.fail(job, worker, self.last_batch.errors.get(cas_rn) or ExecutionError(
+                    f"CAS RN {cas_rn} is quarantined"
+                ))
+    
+        completed = 0
+        finished = set()
+        offset = 0
+        for index, chunk in enumerate(self._iter_chunks([job.record for job in admitted], chunk_size)):
+            if index:
+                queue.extend(jobs, worker)
+            for _, columns, rows, positions in self._run_chunk(runner, chunk, "skip"):
+                # Rows of one record are consecutive; jobs sharing a CAS RN are told apart by position
+                for position, group in itertools.groupby(range(len(rows)), key=positions.__getitem__):
+                    finished.add(offset + position)
+                    job = admitted[offset + position]
+                    completed += queue.complete(job, worker, columns, [rows[i] for i in group])
+            offset += len(chunk)
+    
+        for position, job in enumerate(admitted):
+            if position not in finished:
+                cas_rn = job.record.cas_rn
+                error = self.last_batch.errors.get(cas_rn) or ExecutionError(f"No result for CAS RN: {cas_rn}")
+                queue.fail(job, worker, error)
+        return completed
+    
+    def sweep_halflife(
+        self,
+        cas_rn: str,
+        smiles: Optional[str] = None,
+        halflives: Iterable[float] = (),
+        workers: Optional[int] = None
+    ) -> Frame:
+        """
+        Get EPI Suite data for one compound under many STP half-lives.
+        
+        The points are spread over parallel workspaces. Each workspace stages
+        the chemical input once and then only rewrites ``stpvalsx`` for its
+        remaining points (running STPWIN32 alone when ``config.stp_fast_path``
+        is set). SMILES are looked up at most once for the whole sweep.
+        
+        Args:
+            cas_rn: CAS Registry Number
+            smiles: SMILES notation (optional)
+            halflives: STP biodegradation half-lives in hours
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            
+        Returns:
+            Long-format DataFrame with one block of rows per half-life, keyed by
+            a leading ``halflife_hr`` column, in the order the half-lives were given
+        """
+        self._validate(cas_rn, smiles)
+        halflives = [float(halflife) for halflife in halflives]
+        if smiles is None:
+            smiles = self._lookup_smiles(cas_rn)
+        
+        workers = min(workers or self.config.workers, len(halflives)) or 1
+        groups = [halflives[start::workers] for start in range(workers)]
+        results = self._map_workspaces(
+            lambda runner, group: runner._sweep_points(cas_rn, smiles, group),
+            groups,
+            workers
+        )
+        
+        # Groups are strided, so point i lives at results[i % workers][i // workers]
+        frames = [
+            insert_column(results[i % workers][i // workers], "halflife_hr", halflife)
+            for i, halflife in enumerate(halflives)
+        ]
+        return concat_frames(frames, self.config.data_format)
+    
+    def _sweep_points(
+        self,
+        cas_rn: str,
+        smiles: str,
+        halflives: List[float]
+    ) -> List[Frame]:
+        """Run a list of half-lives for a compound, staging its input only once."""
+        frames = []
+        staged = False
+        for halflife in halflives:
+            stp_config = STPConfig(biowin=False, halflife_hr=halflife)
+            key = self._cache_key(cas_rn, smiles, stp_config, self.config.output_columns)
+            df = self._cached_result(key)
+            if df is None:
+                if staged and not self.config.stp_fast_path:
+                    df = self._rerun_stp(cas_rn, stp_config)
+                else:
+                    df = self._compute(cas_rn, smiles, stp_config, self.config.output_columns)
+                    staged = True
+                self._store_result(key, cas_rn, df)
+            frames.append(df)
+        return frames
+    
+    def _rerun_stp(self, cas_rn: str, stp_config: STPConfig) -> Frame:
+        """Rerun EPI Suite for the staged chemical after rewriting only stpvalsx."""
+        self._clean_outputs()
+        with self._stage("write_input"):
+            self._update_stp_config(stp_config)
+        try:
+            with self._stage("run_episuite"):
+                self._run_episuite()
+        except subprocess.TimeoutExpired as err:
+            raise TimeoutError(f"Execution timed out for CAS RN: {cas_rn}") from err
+        except subprocess.CalledProcessError as err:
+            raise ExecutionError(f"Execution failed for CAS RN: {cas_rn}") from err
+        return self._parse_results(self.config.output_columns)
+    
+    def resolve_smiles(
+        self,
+        cas_rns: Iterable[str],
+        workers: Optional[int] = None,
+        on_error: Literal["raise", "skip"] = "raise"
+    ) -> Dict[str, Optional[str]]:
+        """
+        Look up SMILES for many CAS RNs.
+        
+        Known CAS RNs are answered from the CAS→SMILES table (when
+        ``config.cache_path`` is set) and the rest are looked up concurrently
+        in isolated workspaces. Both hits and misses are stored in the table,
+        so later calls and ``get_data`` never repeat a lookup.
+        
+        Args:
+            cas_rns: CAS Registry Numbers to resolve
+            workers: Number of concurrent EPI Suite processes (defaults to config.workers)
+            on_error: "raise" to stop on the first failed lookup, "skip" to leave
+                failed CAS RNs out of the result
+            
+        Returns:
+            Mapping of each CAS RN to its SMILES, or None if EPI Suite does not know it
+        """
+        cas_rns = list(dict.fromkeys(cas_rns))
+        resolved = self.smiles_table.get_many(cas_rns) if self.smiles_table is not None else {}
+        pending = [cas_rn for cas_rn in cas_rns if cas_rn not in resolved]
+        if self.config.validate:
+            # Invalid CAS RNs are never worth a lookup launch
+            invalid = [cas_rn for cas_rn in pending if check_cas(cas_rn) is not None]
+            if invalid and on_error == "raise":
+                self._validate(invalid[0], None)
+            pending = [cas_rn for cas_rn in pending if cas_rn not in invalid]
+        
+        def lookup(runner: "EPySuiteRunner", cas_rn: str) -> Tuple[str, Optional[str]]:
+            try:
+                return cas_rn, runner._lookup_smiles(cas_rn)
+            except SmilesNotFoundError:
+                return cas_rn, None
+            except EPYSuiteError:
+                if on_error == "raise":
+                    raise
+                return cas_rn, _MISSING
+        
+        for cas_rn, smiles in self._map_workspaces(lookup, pending, workers or self.config.workers):
+            if smiles is not _MISSING:
+                resolved[cas_rn] = smiles
+        return {cas_rn: resolved[cas_rn] for cas_rn in cas_rns if cas_rn in resolved}
+    
+    def _map_workspaces(
+        self,
+        func: Callable[["EPySuiteRunner", Any], Any],
+        items: List[Any],
+        workers: int
+    ) -> List[Any]:
+        """
+        Apply ``func(runner, item)`` to every item, one isolated workspace per worker.
+        
+        With a single worker the items run in place in ``config.es_dir``.
+        """
+        workers = min(workers, len(items)) or 1
+        if workers == 1:
+            return [func(self, item) for item in items]
+        
+        with WorkspacePool(self.config, workers) as pool:
+            def run(item: Any) -> Any:
+                with pool.workspace() as workspace:
+                    return func(self._for_workspace(workspace), item)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run, item) for item in items]
+                try:
+                    return [future.result() for future in futures]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+    
+    def _imap_workspaces(
+        self,
+        func: Callable[["EPySuiteRunner", Any], Any],
+        items: Iterable[Any],
+        workers: int
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Lazily apply ``func(runner, item)`` to items, yielding (item, result) as each finishes.
+        
+        At most two items per worker are in flight at any time.
+        """
+        if workers <= 1:
+            for item in items:
+                yield item, func(self, item)
+            return
+        
+        items = iter(items)
+        with WorkspacePool(self.config, workers) as pool:
+            def run(item: Any) -> Any:
+                with pool.workspace() as workspace:
+                    return func(self._for_workspace(workspace), item)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                in_flight: Dict[Future, Any] = {}
+                try:
+                    while True:
+                        for item in itertools.islice(items, 2 * workers - len(in_flight)):
+                            in_flight[executor.submit(run, item)] = item
+                        if not in_flight:
+                            return
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield in_flight.pop(future), future.result()
+                finally:
+                    for future in in_flight:
+                        future.cancel()
+    
+    def _for_workspace(self, workspace: Workspace) -> "EPySuiteRunner":
+        """Get the runner bound to a workspace, sharing the loaded templates."""
+        runner = self._workspace_runners.get(workspace)
+        if runner is None:
+            runner = copy.copy(self)
+            runner.config = workspace.config
+            runner._stp_base = None
+            runner._staged = StagedFiles()
+            # A freshly staged workspace holds no outputs, so it never needs listing
+            runner._output_names = [workspace.config.tabout_path.name, workspace.config.summary_path.name]
+            self._workspace_runners[workspace] = runner
+        return runner
+    
+    def _run_chunk(
+        self,
+        runner: "EPySuiteRunner",
+        chunk: List[BatchRecord],
+        on_error: str
+    ) -> List[Part]:
+        """Run a chunk of batch records, recording failures when skipping them."""
+        # Summary output and the STPWIN fast path need the single-chemical run
+        if not self.config.use_tabout or self.config.stp_fast_path:
+            parts = []
+            for position, record in enumerate(chunk):
+                try:
+                    df = self._retrying(
+                        runner,
+                        record.cas_rn,
+                        lambda: runner.get_data(record.cas_rn, record.smiles, record.stp_config)
+                    )
+                except EPYSuiteError as err:
+                    if on_error == "raise":
+                        raise
+                    self.last_batch.errors[record.cas_rn] = err
+                    continue
+                columns, rows = frame_to_rows(df)
+                parts.append(([record.cas_rn] * len(rows), columns, rows, [position] * len(rows)))
+            return parts
+        
+        # Serve cached records in place and run the rest in consecutive launches
+        parts = []
+        pending: List[Tuple[int, BatchRecord, Optional[str]]] = []
+        for position, record in enumerate(chunk):
+            key = self._cache_key(
+                record.cas_rn, record.smiles, record.stp_config or STPConfig(), self.config.output_columns
+            )
+            cached = self._cached_table(key)
+            if cached is None:
+                pending.append((position, record, key))
+                continue
+            parts.extend(self._run_pending(runner, pending, on_error))
+            pending = []
+            columns, rows = cached
+            parts.append(([record.cas_rn] * len(rows), columns, rows, [position] * len(rows)))
+        parts.extend(self._run_pending(runner, pending, on_error))
+        return parts
+    
+    def _run_pending(
+        self,
+        runner: "EPySuiteRunner",
+        pending: List[Tuple[int, BatchRecord, Optional[str]]],
+        on_error: str
+    ) -> List[Part]:
+        """Resolve missing SMILES, then run the pending records in one launch."""
+        # Lookups happen before the launch so bisection never repeats them
+        resolved = []
+        for position, record, key in pending:
+            if record.smiles is None:
+                try:
+                    record = replace(record, smiles=runner._lookup_smiles(record.cas_rn))
+                except EPYSuiteError as err:
+                    if on_error == "raise":
+                        raise
+                    self.last_batch.errors[record.cas_rn] = err
+                    continue
+            resolved.append((position, record, key))
+        return self._run_resolved_chunk(runner, resolved, on_error)
+    
+    def _run_resolved_chunk(
+        self,
+        runner: "EPySuiteRunner",
+        chunk: List[Tuple[int, BatchRecord, Optional[str]]],
+        on_error: str
+    ) -> List[Part]:
+        """Run a chunk in one launch, bisecting it when the launch fails."""
+        if not chunk:
+            return []
+        try:
+            if len(chunk) == 1:
+                return [self._retrying(runner, chunk[0][1].cas_rn, lambda: runner._get_chunk_data(chunk))]
+            part = runner._get_chunk_data(chunk)
+            if self.scheduler is not None:
+                self.scheduler.quarantine.record_success(part[0])
+            return [part]
+        except EPYSuiteError as err:
+            if len(chunk) == 1:
+                if on_error == "raise":
+                    raise
+                self.last_batch.errors[chunk[0][1].cas_rn] = err
+                return []
+            middle = len(chunk) // 2
+            return (
+                self._run_resolved_chunk(runner, chunk[:middle], on_error)
+                + self._run_resolved_chunk(runner, chunk[middle:], on_error)
             )
     
+    def _retrying(self, runner: "EPySuiteRunner", cas_rn: str, run: Callable[[], T]) -> T:
+        """
+        Run one batch record under the scheduler policy.
+        
+        Timeouts and crashes are retried with backoff and a doubled timeout;
+        a record still failing after the last retry counts towards its
+        quarantine. Without a scheduler the record is run once.
+        """
+        if self.scheduler is None:
+            return run()
+        policy = self.scheduler.policy
+        attempt = 0
+        while True:
+            runner._attempt = attempt
+            try:
+                result = run()
+            except (TimeoutError, ExecutionError) as err:
+                if isinstance(err, SmilesNotFoundError):
+                    raise
+                if attempt >= policy.retries:
+                    if self.scheduler.quarantine.record_failure(cas_rn, err) and self.metrics is not None:
+                        self.metrics.increment("quarantined_total")
+                    raise
+                if self.metrics is not None:
+                    self.metrics.increment("retries_total")
+                time.sleep(self.scheduler.delay(attempt))
+                attempt += 1
+                continue
+            finally:
+                runner._attempt = 0
+            self.scheduler.quarantine.record_success([cas_rn])
+            return result
+    
+    def _admitted(
+        self,
+        records: Iterable[BatchRecord],
+        count: bool = False,
+        on_error: str = "skip"
+    ) -> Iterator[BatchRecord]:
+        """
+        Yield the batch records that pass validation and the quarantine, noting skipped ones in ``last_batch``.
+        
+        Records are validated in slices through ``validate_records``, which
+        checks each distinct SMILES of a slice once. Invalid records (with
+        ``config.validate`` on) are listed in ``last_batch.errors``, or raise
+        the first ValidationError when ``on_error`` is "raise". With ``count``
+        skipped records are also added to ``last_batch.total``, for streaming
+        runs that count records as their chunks finish.
+        """
+        records = iter(records)
+        while True:
+            batch = list(itertools.islice(records, _ADMIT_SLICE))
+            if not batch:
+                return
+            if self.config.validate:
+                valid, invalid = validate_records(batch)
+                if invalid:
+                    if on_error == "raise":
+                        raise next(iter(invalid.values()))
+                    self.last_batch.errors.update(invalid)
+                    self.last_batch.total += count * (len(batch) - len(valid))
+                batch = valid
+            for record in batch:
+                if self.scheduler is None or record.cas_rn not in self.scheduler.quarantine:
+                    yield record
+                else:
+                    self.last_batch.quarantined.append(record.cas_rn)
+                    self.last_batch.total += count
+    
+    def _get_chunk_data(
+        self,
+        chunk: List[Tuple[int, BatchRecord, Optional[str]]]
+    ) -> Part:
+        """Run several chemicals with one EPI Suite launch, returning their raw result rows."""
+        records = [record for _, record, _ in chunk]
+        cas_rns = [record.cas_rn for record in records]
+        label = f"CAS RN: {cas_rns[0]}" if len(chunk) == 1 else f"chunk starting at CAS RN: {cas_rns[0]}"
+        
+        self._stp_base = None
+        self._clean_outputs()
+        with self._stage("write_input"):
+            self._update_batch_input_config([(record.cas_rn, record.smiles) for record in records])
+            self._update_stp_config(records[0].stp_config or STPConfig())
+        
+        try:
+            with self._stage("run_episuite"):
+                self._run_episuite(chemicals=len(chunk))
+        except subprocess.TimeoutExpired as err:
+            raise TimeoutError(f"Execution timed out for {label}") from err
+        except subprocess.CalledProcessError as err:
+            raise ExecutionError(f"Execution failed for {label}") from err
+        
+        self._record_output(self.config.tabout_path)
+        # Rows are matched to records by "Chemical name", even when it is not requested
+        wanted = self.config.output_columns
+        checked = wanted is not None and "Chemical name" not in wanted
+        with self._stage("parse"):
+            columns, rows = read_tabout(
+                self.config.tabout_path,
+                columns=wanted + ["Chemical name"] if checked else wanted
+            )
+        if len(rows) != len(cas_rns):
+            raise ExecutionError(f"Expected {len(cas_rns)} result rows for {label}, got {len(rows)}")
+        if "Chemical name" in columns:
+            index = columns.index("Chemical name")
+            if [row[index] for row in rows] != cas_rns:
+                raise ExecutionError(f"Result rows do not match {label}")
+            if checked:
+                columns = columns[:index] + columns[index + 1:]
+                rows = [row[:index] + row[index + 1:] for row in rows]
+        
+        if self.cache is not None:
+            with self._stage("cache_write"):
+                for (_, record, key), row in zip(chunk, rows):
+                    self.cache.put(key, record.cas_rn, columns, [row])
+        return cas_rns, columns, rows, [position for position, _, _ in chunk]
+    
+    def _clean_outputs(self) -> None:
+        """Remove the outputs of the previous run, listing the directory only the first time."""
+        with self._stage("clean_outputs"):
+            if self._output_names is None:
+                found = clean_outputs(self.config.es_dir)
+                names = [self.config.tabout_path.name, self.config.summary_path.name]
+                self._output_names = list(dict.fromkeys(names + found))
+            else:
+                clean_outputs(self.config.es_dir, self._output_names)
+    
+    def _write_staged(self, path: Path, content: List[str], lookup: bool = False) -> None:
+        """Write an input file unless it already holds the same content."""
+        if not self._staged.write(path, content, lookup) and self.metrics is not None:
+            self.metrics.increment("staged_writes_skipped_total")
+    
     def _update_stp_config(self, stp_config: STPConfig) -> None:
         """Update STP configuration."""
         config_lines = stp_config.get_config_lines()
-        write_file(self.config.stp_path, config_lines)
+        self._write_staged(self.config.stp_path, config_lines)
     
     def _lookup_smiles(self, cas_rn: str) -> str:
         """Look up SMILES notation for a CAS RN."""
+        with self._stage("lookup_smiles"):
+            return self._run_lookup(cas_rn)
+    
+    def _run_lookup(self, cas_rn: str) -> str:
+        """Resolve a CAS RN from the SMILES table or with an EPI Suite lookup launch."""
+        # Answer from the CAS→SMILES table before paying for a launch
+        smiles = self._known_smiles(cas_rn)
+        if smiles is not None:
+            return smiles
+        
+        self._stp_base = None
         input_lines = ["CAS", cas_rn]
-        write_file(self.config.input_path, input_lines, lookup=True)
+        self._write_staged(self.config.input_path, input_lines, lookup=True)
         
         try:
-            subprocess.run(
-                [str(self.config.app_path), str(self.config.input_path.name)],
-                cwd=str(self.config.es_dir),
-                timeout=self.config.timeout,
-                check=True
-            )
-            
-            cas_results = read_file(self.config.es_dir / "cas_res.txt")
-            return cas_results[0].strip()
-            
+            self._run_process(self._command())
         except subprocess.TimeoutExpired as err:
             raise TimeoutError(f"SMILES lookup timed out for CAS RN: {cas_rn}") from err
         except subprocess.CalledProcessError as err:
             raise ExecutionError(f"SMILES lookup failed for CAS RN: {cas_rn}") from err
+        
+        return self._read_lookup(cas_rn)
     
-    def _update_input_config(self, cas_rn: str, smiles: str) -> None:
-        """Update input configuration."""
+    def _known_smiles(self, cas_rn: str) -> Optional[str]:
+        """Return the SMILES recorded for a CAS RN, or None if it has not been looked up."""
+        if self.smiles_table is None:
+            return None
+        known = self.smiles_table.get_many([cas_rn])
+        if cas_rn in known and known[cas_rn] is None:
+            raise SmilesNotFoundError(f"No SMILES found for CAS RN: {cas_rn}")
+        return known.get(cas_rn)
+    
+    def _read_lookup(self, cas_rn: str) -> str:
+        """Read and record the result of a SMILES lookup run."""
+        cas_results = read_file(self.config.es_dir / "cas_res.txt")
+        smiles = cas_results[0].strip() if cas_results else ""
+        
+        if self.smiles_table is not None:
+            self.smiles_table.put(cas_rn, smiles or None)
+        if not smiles:
+            raise SmilesNotFoundError(f"No SMILES found for CAS RN: {cas_rn}")
+        return smiles
+    
+    def _render_input(self, cas_rn: str, smiles: str) -> List[str]:
+        """Render the CALCULATE block for one chemical."""
         # Start with the template content
         config = self.input_template.copy()
         config[1] = f"{smiles}\n"
         config[2] = f"{cas_rn}\n"
-        write_file(self.config.input_path, config)
+        config[3:] = self.config.model.get_config_lines()
+        return config
     
-    def _run_episuite(self) -> None:
+    def _update_input_config(self, cas_rn: str, smiles: str) -> None:
+        """Update input configuration."""
+        self._write_staged(self.config.input_path, self._render_input(cas_rn, smiles))
+    
+    def _update_batch_input_config(self, chemicals: List[Tuple[str, str]]) -> None:
+        """Update input configuration with one CALCULATE block per chemical."""
+        config = []
+        for cas_rn, smiles in chemicals:
+            block = self._render_input(cas_rn, smiles)
+            if block and not block[-1].endswith("\n"):
+                block[-1] += "\n"
+            config.extend(block)
+        self._write_staged(self.config.input_path, config)
+    
+    def _command(self) -> List[str]:
+        """Build the EPI Suite command line for the staged input file."""
+        return [str(self.config.app_path), str(self.config.input_path.name)]
+    
+    def _run_episuite(self, chemicals: int = 1) -> None:
         """Run EPI Suite with current configuration."""
-        subprocess.run(
-            [str(self.config.app_path), str(self.config.input_path.name)],
-            cwd=str(self.config.es_dir),
-            timeout=self.config.timeout,
-            check=True
-        )
\ No newline at end of file
+        self._run_process(self._command(), chemicals)
+    
+    def _launch(self, args: List[str], timeout: float) -> None:
+        """Run a program in the working directory, reporting one that cannot be started as an ExecutionError."""
+        try:
+            process.run(args, cwd=str(self.config.es_dir), timeout=timeout)
+        except OSError as err:
+            raise ExecutionError(f"Could not start {args[0]}: {err}") from err
+    
+    def _run_process(self, args: List[str], chemicals: int = 1) -> None:
+        """Run an EPI Suite program in the working directory, recording how it exited."""
+        program = Path(args[0]).name
+        if self.scheduler is None:
+            timeout = self.config.timeout * chemicals
+        else:
+            timeout = self.scheduler.timeout(program, chemicals, self._attempt)
+        if self.metrics is None and self.scheduler is None:
+            self._launch(args, timeout)
+            return
+        
+        start = time.perf_counter()
+        try:
+            self._launch(args, timeout)
+        except subprocess.TimeoutExpired:
+            if self.metrics is not None:
+                self.metrics.increment("process_timeouts_total", program=program)
+            raise
+        except subprocess.CalledProcessError as err:
+            if self.metrics is not None:
+                self.metrics.increment("process_exits_total", program=program, code=str(err.returncode))
+            raise
+        if self.scheduler is not None:
+            self.scheduler.observe(program, time.perf_counter() - start, chemicals)
+        if self.metrics is not None:
+            self.metrics.increment("process_exits_total", program=program, code="0")
\ No newline at end of file
@@ -0,0 +1,203 @@
+# src/epysuite/scheduler.py
+
+"""Adaptive timeouts, retries and quarantine for batch EPI Suite runs."""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .config import SchedulerPolicy
+from .exceptions import FileHandlingError
+
+
+class RuntimeStats:
+    """Sliding window of observed runtimes per chemical."""
+
+    def __init__(self, window: int = 1000):
+        self._values: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def observe(self, seconds: float) -> None:
+        """Add a runtime."""
+        with self._lock:
+            self._values.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile of the window (nearest rank), or None if it is empty."""
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return None
+        return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+class Quarantine:
+    """Failure counts of CAS RNs, and the list of those that keep failing.
+
+    With a path the list is kept in a SQLite table, so quarantined records
+    stay quarantined across runs and processes; without one it lives in
+    memory for the lifetime of the runner.
+    """
+
+    def __init__(self, path: Optional[Path] = None, threshold: int = 2):
+        """
+        Open (or create) a quarantine list.
+
+        Args:
+            path: Path to the SQLite database file (optional)
+            threshold: Failures after which a CAS RN is quarantined
+        """
+        self.path = Path(path) if path is not None else None
+        self.threshold = threshold
+        self._failures: Dict[str, int] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS quarantine ("
+                    "cas_rn TEXT PRIMARY KEY, failures INTEGER NOT NULL, "
+                    "error TEXT, updated REAL NOT NULL)"
+                )
+                for cas_rn, failures, error in conn.execute(
+                    "SELECT cas_rn, failures, error FROM quarantine"
+                ):
+                    self._failures[cas_rn] = failures
+                    self._errors[cas_rn] = error
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error opening quarantine list: {self.path}") from err
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the quarantine database."""
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def __contains__(self, cas_rn: object) -> bool:
+        return self._failures.get(cas_rn, 0) >= self.threshold
+
+    @property
+    def quarantined(self) -> Dict[str, str]:
+        """Quarantined CAS RNs mapped to the last error they failed with."""
+        with self._lock:
+            return {
+                cas_rn: self._errors.get(cas_rn, "")
+                for cas_rn, failures in self._failures.items()
+                if failures >= self.threshold
+            }
+
+    def record_failure(self, cas_rn: str, error: Exception) -> bool:
+        """Count a failed run of a CAS RN, returning True if it is now quarantined."""
+        with self._lock:
+            failures = self._failures[cas_rn] = self._failures.get(cas_rn, 0) + 1
+            self._errors[cas_rn] = str(error)
+        self._write(
+            "INSERT OR REPLACE INTO quarantine VALUES (?, ?, ?, ?)",
+            (cas_rn, failures, str(error), time.time())
+        )
+        return failures >= self.threshold
+
+    def record_success(self, cas_rns: Iterable[str]) -> None:
+        """Reset the failure counts of CAS RNs that ran successfully."""
+        with self._lock:
+            cleared = [cas_rn for cas_rn in cas_rns if self._failures.pop(cas_rn, None) is not None]
+            for cas_rn in cleared:
+                self._errors.pop(cas_rn, None)
+        if cleared:
+            self._write_many("DELETE FROM quarantine WHERE cas_rn = ?", [(cas_rn,) for cas_rn in cleared])
+
+    def release(self, cas_rn: Optional[str] = None) -> int:
+        """
+        Forget failures so records are run again.
+
+        Args:
+            cas_rn: Release only this CAS RN (optional)
+
+        Returns:
+            Number of CAS RNs released; with no argument the whole list is cleared
+        """
+        with self._lock:
+            if cas_rn is None:
+                released = list(self._failures)
+            else:
+                released = [cas_rn] if cas_rn in self._failures else []
+            for name in released:
+                del self._failures[name]
+                self._errors.pop(name, None)
+        self._write_many("DELETE FROM quarantine WHERE cas_rn = ?", [(name,) for name in released])
+        return len(released)
+
+    def _write(self, query: str, params: tuple) -> None:
+        """Apply a change to the quarantine database, if there is one."""
+        self._write_many(query, [params])
+
+    def _write_many(self, query: str, params: List[tuple]) -> None:
+        """Apply changes to the quarantine database, if there is one."""
+        if self.path is None or not params:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(query, params)
+        except sqlite3.Error as err:
+            raise FileHandlingError(f"Error writing quarantine list: {self.path}") from err
+
+
+class Scheduler:
+    """Applies a SchedulerPolicy to the EPI Suite launches of a runner.
+
+    Successful launches feed per-program runtime statistics (seconds per
+    chemical). Once ``min_samples`` runs have been seen, a launch of n
+    chemicals gets ``timeout_multiple`` × the runtime quantile × n seconds,
+    at least ``min_timeout`` and at most the fixed ``config.timeout`` × n.
+    Each retry doubles the timeout and waits with exponential backoff.
+    """
+
+    def __init__(self, policy: SchedulerPolicy, timeout: float, quarantine_path: Optional[Path] = None):
+        """
+        Create a scheduler.
+
+        Args:
+            policy: Scheduling policy
+            timeout: Fixed timeout per chemical, used until enough runs are
+                observed and as the upper bound of adaptive timeouts
+            quarantine_path: SQLite database holding the quarantine list (optional)
+        """
+        self.policy = policy
+        self.max_timeout = timeout
+        self.quarantine = Quarantine(policy.quarantine_path or quarantine_path, policy.quarantine_after)
+        self._stats: Dict[str, RuntimeStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, program: str) -> RuntimeStats:
+        """Return the runtime statistics of a program."""
+        with self._lock:
+            stats = self._stats.get(program)
+            if stats is None:
+                stats = self._stats[program] = RuntimeStats()
+            return stats
+
+    def observe(self, program: str, seconds: float, chemicals: int = 1) -> None:
+        """Record the runtime of a successful launch."""
+        self.stats(program).observe(seconds / max(chemicals, 1))
+
+    def timeout(self, program: str, chemicals: int = 1, attempt: int = 0) -> float:
+        """Return the timeout for a launch of ``chemicals`` chemicals."""
+        ceiling = self.max_timeout * chemicals
+        stats = self.stats(program)
+        if len(stats) < self.policy.min_samples:
+            return ceiling
+        timeout = self.policy.timeout_multiple * stats.quantile(self.policy.timeout_quantile) * chemicals
+        return min(max(timeout, self.policy.min_timeout) * 2 ** attempt, ceiling)
+
+    def delay(self, attempt: int) -> float:
+        """Return the backoff before retry number ``attempt + 1``."""
+        return min(self.policy.backoff * 2 ** attempt, self.policy.max_backoff)
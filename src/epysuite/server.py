@@ -0,0 +1,300 @@
+# src/epysuite/server.py
+
+"""Local EPI Suite server shared by many client processes, and its client."""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from dataclasses import asdict, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from . import exceptions
+from .backends import Frame, get_backend
+from .config import EPySuiteConfig, STPConfig
+from .exceptions import ConfigurationError, EPYSuiteError, SmilesNotFoundError, TimeoutError, ValidationError
+from .metrics import Metrics
+from .runner import EPySuiteRunner
+from .utils import frame_to_rows
+from .workspace import WorkspacePool
+
+DEFAULT_PORT = 8765
+
+Table = Tuple[List[str], List[List[Any]]]
+
+
+class EPySuiteServer:
+    """Serve ``get_data`` over localhost HTTP from one warm runner.
+
+    The server owns a pool of ``config.workers`` staged workspaces and the
+    result cache, so client processes never touch ``es_dir`` themselves and
+    together never run more than ``config.workers`` EPI Suite processes.
+    Requests wait for a free workspace, and identical requests arriving
+    while one is running are coalesced onto that run.
+
+    Endpoints: ``POST /get_data`` with a JSON body of ``get_data`` arguments
+    returns ``{"columns": [...], "rows": [...]}``; ``GET /health`` reports
+    the pool size and request counters; ``GET /metrics`` renders the
+    metrics (if any) in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        config: Optional[EPySuiteConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Create the server; workspaces are staged by ``start`` or ``serve_forever``.
+
+        Args:
+            config: EPI Suite configuration (optional); ``workers`` sets the pool size
+            host: Interface to listen on (only localhost by default)
+            port: Port to listen on; 0 picks a free one
+            metrics: Collector for per-stage timings, exit codes and output sizes (optional)
+        """
+        config = config or EPySuiteConfig()
+        # Results travel as JSON rows, so no DataFrame library is needed here
+        self.runner = EPySuiteRunner(replace(config, data_format="records"), metrics=metrics)
+        self.config = self.runner.config
+        self.metrics = metrics
+        self.requests = 0
+        self.coalesced = 0
+        self._pool: Optional[WorkspacePool] = None
+        self._in_flight: Dict[Hashable, "Future[Table]"] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.epysuite = self
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _open_pool(self) -> None:
+        """Stage the workspaces if that has not happened yet."""
+        if self._pool is None:
+            self._pool = WorkspacePool(self.config, self.config.workers)
+
+    def serve_forever(self) -> None:
+        """Stage the workspaces and handle requests until ``close`` is called."""
+        self._open_pool()
+        self._httpd.serve_forever()
+
+    def start(self) -> "EPySuiteServer":
+        """Serve requests from a background thread."""
+        self._open_pool()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving and remove the workspaces."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self) -> "EPySuiteServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_data(
+        self,
+        cas_rn: str,
+        smiles: Optional[str] = None,
+        stp_config: Optional[STPConfig] = None,
+        columns: Optional[List[str]] = None
+    ) -> Table:
+        """
+        Get EPI Suite results as (columns, rows), sharing the run of an identical request in flight.
+
+        Args:
+            cas_rn: CAS Registry Number
+            smiles: SMILES notation (optional)
+            stp_config: STP configuration (optional)
+            columns: Output columns to parse, in order (defaults to config.output_columns)
+        """
+        stp_config = stp_config or STPConfig()
+        columns = self.config.output_columns if columns is None else list(columns)
+        key = (cas_rn, smiles, tuple(stp_config.get_config_lines()), None if columns is None else tuple(columns))
+        with self._lock:
+            self.requests += 1
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            if self.metrics is not None:
+                self.metrics.increment("coalesced_requests_total")
+            return future.result()
+
+        try:
+            self._open_pool()
+            with self._pool.workspace() as workspace:
+                df = self.runner._for_workspace(workspace).get_data(cas_rn, smiles, stp_config, columns)
+            result = frame_to_rows(df)
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def health(self) -> Dict[str, Any]:
+        """Return the pool size and request counters."""
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.config.workers,
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+            }
+
+
+# HTTP status of each error type; other EPI Suite errors are 500
+_STATUS = {ConfigurationError: 400, ValidationError: 422, SmilesNotFoundError: 404, TimeoutError: 504}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler translating HTTP calls into EPySuiteServer methods."""
+
+    server_version = "epysuite"
+
+    def do_GET(self) -> None:
+        server: EPySuiteServer = self.server.epysuite
+        if self.path == "/health":
+            self._send_json(200, server.health())
+        elif self.path == "/metrics" and server.metrics is not None:
+            self._send(200, server.metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "NotFound", "message": f"No such endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        server: EPySuiteServer = self.server.epysuite
+        if self.path != "/get_data":
+            self._send_json(404, {"error": "NotFound", "message": f"No such endpoint: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            stp_config = request.get("stp_config")
+            columns, rows = server.get_data(
+                request["cas_rn"],
+                smiles=request.get("smiles"),
+                stp_config=STPConfig(**stp_config) if stp_config is not None else None,
+                columns=request.get("columns"),
+            )
+        except (ValueError, KeyError, TypeError) as err:
+            self._send_json(400, {"error": "ConfigurationError", "message": f"Bad request: {err}"})
+        except EPYSuiteError as err:
+            status = next((code for kind, code in _STATUS.items() if isinstance(err, kind)), 500)
+            self._send_json(status, {"error": type(err).__name__, "message": str(err)})
+        else:
+            self._send_json(200, {"columns": columns, "rows": rows})
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep request logging off stderr."""
+
+
+class EPySuiteClient:
+    """Thin client of an ``EPySuiteServer`` with the runner's ``get_data`` signature."""
+
+    def __init__(
+        self,
+        url: str = f"http://127.0.0.1:{DEFAULT_PORT}",
+        data_format: str = "polars",
+        timeout: Optional[float] = None
+    ):
+        """
+        Create a client.
+
+        Args:
+            url: Base URL of the server
+            data_format: Output format of results ("polars", "pandas", "pyarrow" or "records")
+            timeout: Seconds to wait for a response, including time queued on the server (optional)
+        """
+        self.url = url.rstrip("/")
+        self.data_format = data_format
+        self.timeout = timeout
+        get_backend(data_format)
+
+    def _request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Call an endpoint, raising the server's exception type on errors."""
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(
+            self.url + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as err:
+            try:
+                error = json.loads(err.read())
+            except ValueError:
+                raise EPYSuiteError(f"Server error {err.code} from {self.url}") from err
+            kind = getattr(exceptions, error.get("error", ""), None)
+            if not (isinstance(kind, type) and issubclass(kind, EPYSuiteError)):
+                kind = EPYSuiteError
+            raise kind(error.get("message", "")) from None
+        except urllib.error.URLError as err:
+            raise ConfigurationError(f"Cannot reach EPY Suite server at {self.url}: {err.reason}") from err
+
+    def get_data(
+        self,
+        cas_rn: str,
+        smiles: Optional[str] = None,
+        stp_config: Optional[STPConfig] = None,
+        columns: Optional[List[str]] = None
+    ) -> Frame:
+        """
+        Get EPI Suite data for a compound from the server.
+
+        Args:
+            cas_rn: CAS Registry Number
+            smiles: SMILES notation (optional)
+            stp_config: STP configuration (optional)
+            columns: Output columns to parse, in order (defaults to the server's config.output_columns)
+
+        Returns:
+            DataFrame containing EPI Suite results
+        """
+        result = self._request("/get_data", {
+            "cas_rn": cas_rn,
+            "smiles": smiles,
+            "stp_config": None if stp_config is None else asdict(stp_config),
+            "columns": None if columns is None else list(columns),
+        })
+        return get_backend(self.data_format).from_rows(result["columns"], result["rows"])
+
+    def health(self) -> Dict[str, Any]:
+        """Return the server's pool size and request counters."""
+        return self._request("/health")
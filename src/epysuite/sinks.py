@@ -0,0 +1,235 @@
+# src/epysuite/sinks.py
+
+"""Checkpointed on-disk destinations for streamed batch results."""
+
+import csv
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Set, Union
+
+from .backends import Frame, backend_for, get_backend
+from .exceptions import FileHandlingError
+
+MANIFEST_NAME = "_manifest.jsonl"
+
+
+class ParquetSink:
+    """Append batch results to a directory of Parquet parts with a checkpoint manifest.
+
+    Buffered rows are sealed into a new part file every ``rows_per_part`` rows.
+    Each part is written under a temporary name and renamed into place before
+    its CAS RNs are appended to the manifest, so after a crash the manifest
+    only ever lists chemicals whose rows are safely on disk. Parts that never
+    made it into the manifest are removed when the sink is reopened.
+    """
+
+    def __init__(self, path: Path, rows_per_part: int = 10000):
+        """
+        Open (or resume) a result directory.
+
+        Args:
+            path: Directory holding the Parquet parts and the manifest
+            rows_per_part: Number of buffered rows that triggers a new part file
+        """
+        self.path = Path(path)
+        self.rows_per_part = rows_per_part
+        self.completed: Set[str] = set()
+        self._buffer: List[Frame] = []
+        self._buffered_rows = 0
+
+        parts = set()
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            manifest = self.path / MANIFEST_NAME
+            if manifest.exists():
+                with open(manifest, "r") as file:
+                    lines = file.readlines()
+                committed = []
+                for line in lines:
+                    # A torn final line means its part was never committed
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    committed.append(line)
+                    parts.add(entry["part"])
+                    self.completed.update(entry["cas_rns"])
+                if len(committed) != len(lines):
+                    with open(manifest, "w") as file:
+                        file.writelines(committed)
+            for orphan in self.path.glob("part-*"):
+                if orphan.name not in parts:
+                    orphan.unlink()
+        except Exception as err:
+            raise FileHandlingError(f"Error opening result directory: {self.path}") from err
+        self._next_part = len(parts)
+
+    def write(self, df: Frame) -> None:
+        """Buffer a frame of results keyed by a ``cas_rn`` column."""
+        if len(df) == 0:
+            return
+        self._buffer.append(df)
+        self._buffered_rows += len(df)
+        if self._buffered_rows >= self.rows_per_part:
+            self.flush()
+
+    def flush(self) -> None:
+        """Seal the buffered rows into a part file and checkpoint their CAS RNs."""
+        if not self._buffer:
+            return
+        backend = backend_for(self._buffer[0])
+        df = backend.concat(self._buffer)
+        cas_rns = list(dict.fromkeys(backend.column(df, "cas_rn")))
+
+        name = f"part-{self._next_part:05d}.parquet"
+        target = self.path / name
+        staging = self.path / f"{name}.tmp"
+        try:
+            backend.write_parquet(df, staging)
+            os.replace(staging, target)
+            with open(self.path / MANIFEST_NAME, "a") as file:
+                file.write(json.dumps({"part": name, "cas_rns": cas_rns}) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+        except Exception as err:
+            raise FileHandlingError(f"Error writing result part: {target}") from err
+
+        self.completed.update(cas_rns)
+        self._next_part += 1
+        self._buffer = []
+        self._buffered_rows = 0
+
+    def read(self, format: str = "polars") -> Frame:
+        """Read all committed results back into a single DataFrame."""
+        backend = get_backend(format)
+        parts = sorted(self.path.glob("part-*.parquet"))
+        return backend.concat([backend.read_parquet(part) for part in parts])
+
+    def close(self) -> None:
+        """Flush any buffered rows."""
+        self.flush()
+
+    def __enter__(self) -> "ParquetSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class CsvSink:
+    """Append batch results to a single CSV file that doubles as its own checkpoint.
+
+    The header is taken from the first frame written (or from the existing
+    file when resuming) and later frames are written under it. A frame with
+    columns the header lacks (streamed chunks drop their all-empty columns)
+    widens it: the file is rewritten with the new columns blank in the rows
+    already written, then swapped into place. Every
+    ``write`` is flushed and synced before its CAS RNs count as completed,
+    and a torn final line left by a crash is cut off when the file is
+    reopened.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or resume) a result file.
+
+        Args:
+            path: Path to the CSV file
+        """
+        self.path = Path(path)
+        self.completed: Set[str] = set()
+        self.columns: Optional[List[str]] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                with open(self.path, "rb+") as file:
+                    content = file.read()
+                    if content and not content.endswith(b"\n"):
+                        file.truncate(content.rfind(b"\n") + 1)
+                with open(self.path, "r", newline="") as file:
+                    reader = csv.reader(file)
+                    self.columns = next(reader, None)
+                    if self.columns is not None:
+                        key = self.columns.index("cas_rn")
+                        self.completed.update(row[key] for row in reader if row)
+        except Exception as err:
+            raise FileHandlingError(f"Error opening result file: {self.path}") from err
+        self._file = None
+
+    def write(self, df: Frame) -> None:
+        """Append a frame of results keyed by a ``cas_rn`` column."""
+        if len(df) == 0:
+            return
+        columns, rows = backend_for(df).to_rows(df)
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", newline="")
+            writer = csv.writer(self._file)
+            if self.columns is None:
+                self.columns = list(columns)
+                writer.writerow(self.columns)
+            added = [name for name in columns if name not in self.columns]
+            if added:
+                self._widen(added)
+                writer = csv.writer(self._file)
+            positions = [columns.index(name) if name in columns else None for name in self.columns]
+            writer.writerows(
+                ["" if index is None or row[index] is None else row[index] for index in positions]
+                for row in rows
+            )
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception as err:
+            raise FileHandlingError(f"Error writing result file: {self.path}") from err
+        key = columns.index("cas_rn")
+        self.completed.update(row[key] for row in rows)
+
+    def _widen(self, added: List[str]) -> None:
+        """Rewrite the file with columns appended to its header, blank in the rows already written."""
+        self._file.close()
+        temp = self.path.with_name(self.path.name + ".tmp")
+        with open(self.path, "r", newline="") as source, open(temp, "w", newline="") as target:
+            reader = csv.reader(source)
+            writer = csv.writer(target)
+            next(reader, None)
+            writer.writerow(self.columns + added)
+            blanks = [""] * len(added)
+            writer.writerows(row + blanks for row in reader if row)
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp, self.path)
+        self.columns = self.columns + added
+        self._file = open(self.path, "a", newline="")
+
+    def flush(self) -> None:
+        """Rows are written through on every ``write``; kept for sink compatibility."""
+
+    def read(self, format: str = "polars") -> Frame:
+        """Read all written results back into a single DataFrame, typing columns like ``parse_tabout``."""
+        backend = get_backend(format)
+        try:
+            with open(self.path, "r", newline="") as file:
+                reader = csv.reader(file)
+                header = next(reader, [])
+                rows = [[cell or None for cell in row] for row in reader if row]
+        except OSError as err:
+            raise FileHandlingError(f"Error reading result file: {self.path}") from err
+        if not rows:
+            return backend.concat([])
+        return backend.from_text_columns(dict(zip(header, map(list, zip(*rows)))))
+
+    def close(self) -> None:
+        """Close the result file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "CsvSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+Sink = Union[ParquetSink, CsvSink]
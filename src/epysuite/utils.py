@@ -2,14 +2,16 @@
 
 """Utility functions for EPYSuite."""
 
+import os
 from pathlib import Path
-from typing import List, Union
-
-import pandas as pd
-import polars as pl
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from .backends import DEFAULT_CHUNK_ROWS, Frame, backend_for, get_backend, read_cells
 from .exceptions import FileHandlingError
 
+if TYPE_CHECKING:
+    from .sinks import Sink
+
 
 def read_file(path: Path) -> List[str]:
     """Read a file and return its contents as a list of lines."""
@@ -32,12 +34,54 @@ def write_file(path: Path, content: List[str], lookup: bool = False) -> None:
     except Exception as err:
         raise FileHandlingError(f"Error writing file: {path}") from err
 
-def parse_tabout(path: Path, format: str = "polars") -> Union[pl.DataFrame, pd.DataFrame]:
+class StagedFiles:
+    """Input file writer that skips files already holding the requested content.
+
+    The text last written to each path is remembered together with the
+    file's size and modification time, so restaging an unchanged file (for
+    example the same ``stpvalsx`` for a whole batch) costs one ``stat``
+    instead of an open, write and close. A file changed or removed by
+    anything else is written again.
+    """
+
+    def __init__(self):
+        self._written: Dict[Path, Tuple[str, int, int]] = {}
+
+    def write(self, path: Path, content: List[str], lookup: bool = False) -> bool:
+        """
+        Write content to a file unless it already holds it.
+
+        Returns:
+            True if the file was written, False if it was left as it was
+        """
+        text = "\n".join(content) if lookup else "".join(content)
+        previous = self._written.get(path)
+        if previous is not None and previous[0] == text:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                pass
+            else:
+                if (stat.st_size, stat.st_mtime_ns) == previous[1:]:
+                    return False
+        write_file(path, [text])
+        stat = os.stat(path)
+        self._written[path] = (text, stat.st_size, stat.st_mtime_ns)
+        return True
+
+def parse_tabout(
+    path: Path,
+    format: str = "polars",
+    columns: Optional[List[str]] = None,
+    **options: Any
+) -> Frame:
     """Parse EPI Suite tabout file into a DataFrame, removing columns with all missing values.
     
     Args:
         path: Path to the tabout file
-        format: Output format ("polars" or "pandas")
+        format: Output format ("polars", "pandas", "pyarrow" or "records")
+        columns: Read only these columns, in this order (optional)
+        **options: Backend options, e.g. ``downcast=True`` for pandas float32 columns
         
     Returns:
         DataFrame containing EPI Suite results with empty columns removed and proper types
@@ -45,101 +89,105 @@ def parse_tabout(path: Path, format: str = "polars") -> Union[pl.DataFrame, pd.D
     Raises:
         FileHandlingError: If the file cannot be read or parsed
     """
+    backend = get_backend(format, **options)
     try:
         if not path.exists():
             raise FileNotFoundError(f"Tabout file not found: {path}")
+        return backend.parse_tabout(path, columns)
         
-        if format == "polars":
-            # Read with Polars as strings initially
-            df = pl.read_csv(
-                path,
-                separator='\t',
-                truncate_ragged_lines=True,
-                infer_schema_length=0
-            )
-            
-            # Get columns that are not entirely null
-            valid_cols = [
-                col for col in df.columns 
-                if df.select(pl.col(col)).null_count().item() < len(df)
-            ]
-            
-            # Function to convert to float if possible
-            def try_float(s: str) -> Union[float, str]:
-                s = s.strip() if isinstance(s, str) else s
-                try:
-                    return float(s) if s is not None else None
-                except (ValueError, TypeError):
-                    return s
-            
-            # Process each valid column
-            exprs = []
-            for col in valid_cols:
-                # First get a sample of non-null values from the column
-                sample = (
-                    df.select(pl.col(col))
-                    .filter(pl.col(col).is_not_null())
-                    .limit(5)
-                    .to_series()
-                )
-                
-                # Try converting sample values to determine the return type
-                sample_converted = [try_float(val) for val in sample if val is not None]
-                is_numeric = all(isinstance(x, (int, float)) for x in sample_converted)
-                
-                expr = (
-                    pl.col(col)
-                    .cast(pl.String)
-                    .str.strip()
-                    .map_elements(
-                        try_float,
-                        return_dtype=pl.Float64 if is_numeric else pl.String
-                    )
-                )
-                exprs.append(expr.alias(col))
-            
-            # Apply transformations
-            df = df.select(exprs)
-            
-        else:
-            # Read with Pandas (pandas code remains the same)
-            df = pd.read_csv(
-                path,
-                sep='\t',
-                on_bad_lines='skip',
-                dtype=str  # Read all as strings initially
-            )
-            
-            # Drop columns where all values are NA
-            df = df.dropna(axis=1, how='all')
-            
-            # Function to convert series to appropriate type
-            def convert_series(series: pd.Series) -> pd.Series:
-                # Strip whitespace if string
-                series = series.str.strip() if series.dtype == 'O' else series
-                
-                # Try converting to float
-                try:
-                    return pd.to_numeric(series, errors='coerce').fillna(series)
-                except (ValueError, TypeError):
-                    return series
-            
-            # Apply conversion to each column
-            df = df.apply(convert_series)
-            
-        return df
+    except FileNotFoundError as err:
+        raise FileHandlingError(f"Tabout file not found: {path}") from err
+    except Exception as err:
+        raise FileHandlingError(f"Error parsing tabout file: {path}") from err
+
+def iter_tabout(
+    path: Path,
+    format: str = "polars",
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    **options: Any
+) -> Iterator[Frame]:
+    """Parse a large EPI Suite tabout file chunk by chunk, in bounded memory.
+    
+    The file is read twice: once to find its non-empty and numeric columns,
+    then in chunks of at most ``chunk_rows`` rows typed accordingly. Every
+    chunk therefore has the same columns and types, and together they hold
+    what ``parse_tabout`` returns for the whole file.
+    
+    Args:
+        path: Path to the tabout file
+        format: Output format ("polars", "pandas", "pyarrow" or "records")
+        columns: Read only these columns, in this order (optional)
+        chunk_rows: Maximum number of rows per chunk
+        **options: Backend options, as for ``parse_tabout``
+        
+    Yields:
+        DataFrames of consecutive rows
         
+    Raises:
+        FileHandlingError: If the file cannot be read or parsed
+    """
+    backend = get_backend(format, **options)
+    try:
+        yield from backend.iter_tabout(path, columns, chunk_rows)
+    except FileNotFoundError as err:
+        raise FileHandlingError(f"Tabout file not found: {path}") from err
+    except Exception as err:
+        raise FileHandlingError(f"Error parsing tabout file: {path}") from err
+
+def sink_tabout(
+    path: Path,
+    sink: "Sink",
+    format: str = "polars",
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    **options: Any
+) -> int:
+    """Stream a large tabout file into a result sink without holding it in memory.
+    
+    Rows are keyed by their "Chemical name" (the CAS RN EPI Suite was run
+    under), which is always read and copied into a leading ``cas_rn`` column.
+    ``options`` are backend options, as for ``parse_tabout``.
+    
+    Returns:
+        Number of rows written
+    """
+    if columns is not None and "Chemical name" not in columns:
+        columns = ["Chemical name"] + list(columns)
+    written = 0
+    for chunk in iter_tabout(path, format, columns, chunk_rows, **options):
+        backend = backend_for(chunk)
+        names = backend.column(chunk, "Chemical name")
+        if names is None:
+            raise FileHandlingError(f"Tabout file has no chemical names: {path}")
+        sink.write(backend.insert_column(chunk, "cas_rn", names))
+        written += len(chunk)
+    sink.flush()
+    return written
+
+def read_tabout(path: Path, columns: Optional[List[str]] = None) -> Tuple[List[str], List[List[Optional[str]]]]:
+    """Read the header and raw cells of a tabout file without building a DataFrame.
+    
+    Cells are stripped and blank cells are None; typing is left to the caller
+    (see ``ResultAccumulator``). With ``columns``, only those columns are kept.
+    
+    Raises:
+        FileHandlingError: If the file cannot be read
+    """
+    try:
+        return read_cells(path, columns)
     except FileNotFoundError as err:
         raise FileHandlingError(f"Tabout file not found: {path}") from err
     except Exception as err:
         raise FileHandlingError(f"Error parsing tabout file: {path}") from err
 
-def parse_summary(path: Path, format: str = "polars") -> Union[pl.DataFrame, pd.DataFrame]:
+def parse_summary(path: Path, format: str = "polars", columns: Optional[List[str]] = None) -> Frame:
     """Parse EPI Suite summary file into a wide-format DataFrame.
     
     Args:
         path: Path to the summary file
-        format: Output format ("polars" or "pandas")
+        format: Output format ("polars", "pandas", "pyarrow" or "records")
+        columns: Keep only these parameters, in this order (optional)
         
     Returns:
         DataFrame containing EPI Suite results with one column per parameter
@@ -147,6 +195,7 @@ def parse_summary(path: Path, format: str = "polars") -> Union[pl.DataFrame, pd.
     Raises:
         FileHandlingError: If the file cannot be read or parsed
     """
+    backend = get_backend(format)
     try:
         with open(path, 'r') as file:
             lines = [line.strip() for line in file if line.strip()]
@@ -163,20 +212,63 @@ def parse_summary(path: Path, format: str = "polars") -> Union[pl.DataFrame, pd.
                     value = value.strip()
                 data[key] = value
         
-        if format == "polars":
-            return pl.DataFrame([data])
-        return pd.DataFrame([data])
+        if columns is not None:
+            data = {key: data[key] for key in dict.fromkeys(columns) if key in data}
+        return backend.from_dicts([data])
     
     except FileNotFoundError as err:
         raise FileHandlingError(f"Summary file not found: {path}") from err
     except Exception as err:
         raise FileHandlingError(f"Error parsing summary file: {path}") from err
 
-def clean_outputs(output_dir: Path) -> None:
-    """Clean up output files from previous runs."""
+def clean_outputs(output_dir: Path, names: Optional[Iterable[str]] = None) -> List[str]:
+    """Clean up output files from previous runs.
+    
+    Args:
+        output_dir: Directory holding the outputs
+        names: Remove exactly these files instead of listing the directory
+            for ``*.epi`` files and ``tabout.txt`` (optional)
+            
+    Returns:
+        Names of the files removed
+    """
     try:
-        for pattern in ["*.epi", "tabout.txt"]:
-            for file in output_dir.glob(pattern):
+        if names is None:
+            files = [file for pattern in ["*.epi", "tabout.txt"] for file in output_dir.glob(pattern)]
+            for file in files:
                 file.unlink()
+            return [file.name for file in files]
+        removed = []
+        for name in names:
+            try:
+                os.unlink(output_dir / name)
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+        return removed
     except Exception as err:
-        raise FileHandlingError(f"Error cleaning output files in {output_dir}") from err
\ No newline at end of file
+        raise FileHandlingError(f"Error cleaning output files in {output_dir}") from err
+
+def insert_column(df: Frame, name: str, value: Union[Any, List[Any]]) -> Frame:
+    """Insert a key column, constant or one value per row, at the front of a DataFrame."""
+    return backend_for(df).insert_column(df, name, value)
+
+def update_columns(df: Frame, update: Frame) -> Frame:
+    """Replace or add the columns of ``update`` in a DataFrame with the same number of rows."""
+    return backend_for(df).update_columns(df, update)
+
+def concat_frames(frames: List[Frame], format: str = "polars") -> Frame:
+    """Concatenate result DataFrames, aligning columns by name."""
+    return get_backend(format).concat(frames)
+
+def frame_column(df: Frame, name: str) -> Optional[List[Any]]:
+    """Return a DataFrame column as a list of Python values, or None if it is absent."""
+    return backend_for(df).column(df, name)
+
+def frame_to_rows(df: Frame) -> Tuple[List[str], List[List[Any]]]:
+    """Convert a DataFrame into plain column names and row values."""
+    return backend_for(df).to_rows(df)
+
+def frame_from_rows(columns: List[str], rows: List[List[Any]], format: str = "polars") -> Frame:
+    """Build a DataFrame from column names and row values."""
+    return get_backend(format).from_rows(columns, rows)
@@ -0,0 +1,148 @@
+# src/epysuite/validation.py
+
+"""Pre-flight checks of CAS RNs and SMILES, run before EPI Suite is launched."""
+
+import re
+from operator import mul
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .batch import BatchRecord, to_record
+from .exceptions import ValidationError
+
+_CAS = re.compile(r"(\d{2,7})-(\d{2})-(\d)")
+# Check-digit weights of each CAS RN length, and the weighted sum of ASCII "0"s to subtract
+_WEIGHTS = {n: (tuple(range(n, 0, -1)), ord("0") * n * (n + 1) // 2) for n in range(4, 10)}
+
+# Bracket atoms: optional isotope, an element or aromatic symbol, then chirality,
+# hydrogens, charge and atom class, which are not checked further
+_BRACKET = re.compile(r"\[\d*[A-Za-z*][^\[\]]*\]")
+# Outside brackets: organic-subset atoms (EPI Suite accepts upper-case CL and BR),
+# bonds, ring closures, branches and dots; bracket atoms are replaced by "*"
+_TOKENS = re.compile(r"(?:[BCNOPSFIbcnops*\-=#$:/\\.()\d]|l(?<=Cl)|L(?<=CL)|r(?<=Br)|R(?<=BR)|%\d\d)+")
+# Cheaper character check; only characters of multi-character tokens need _TOKENS
+_CHARS = re.compile(r"[BCNOPSFIbcnops*\-=#$:/\\.()\d%lLrR]+")
+_DIGRAPH = re.compile(r"[%lLrR]")
+_NOT_PAREN = re.compile(r"[^()]+")
+_RING = re.compile(r"%\d\d|\d")
+_BAD_START = frozenset("-=#$:/\\().%0123456789")
+_BAD_END = frozenset("-=#$:/\\(.")
+
+
+def check_cas(cas_rn: str) -> Optional[str]:
+    """
+    Check the format and check digit of a CAS Registry Number.
+
+    Returns:
+        Why the CAS RN is invalid, or None if it is valid
+    """
+    match = _CAS.fullmatch(cas_rn.strip())
+    if match is None:
+        return "expected digits in the form NNNNNNN-NN-N"
+    head, middle, check = match.groups()
+    digits = (head + middle).encode("ascii")
+    weights, offset = _WEIGHTS[len(digits)]
+    expected = (sum(map(mul, weights, digits)) - offset) % 10
+    if expected != ord(check) - ord("0"):
+        return f"check digit is {check}, expected {expected}"
+    return None
+
+
+def check_smiles(smiles: str) -> Optional[str]:
+    """
+    Check the syntax of a SMILES string: atoms, bonds, branches, brackets and ring closures.
+
+    Only the first whitespace-separated token is checked, as EPI Suite
+    ignores anything after it. Valences and aromaticity are not checked.
+
+    Returns:
+        Why the SMILES is invalid, or None if it is valid
+    """
+    tokens = smiles.split(None, 1)
+    if not tokens:
+        return "SMILES is empty"
+    text = tokens[0]
+    if "[" in text or "]" in text:
+        text = _BRACKET.sub("*", text)
+        if "[" in text or "]" in text:
+            return "unclosed or malformed bracket atom"
+    if _CHARS.fullmatch(text) is None or (_DIGRAPH.search(text) and _TOKENS.fullmatch(text) is None):
+        prefix = _TOKENS.match(text)
+        position = prefix.end() if prefix else 0
+        return f"unexpected character {text[position]!r}"
+
+    if text[0] in _BAD_START:
+        return f"SMILES cannot start with {text[0]!r}"
+    if text[-1] in _BAD_END:
+        return f"SMILES cannot end with {text[-1]!r}"
+    if ".." in text:
+        return "empty component between dots"
+    if "(" in text or ")" in text:
+        if "()" in text:
+            return "empty branch"
+        # Strip matched pairs; whatever is left starts with the first unmatched parenthesis
+        parens = _NOT_PAREN.sub("", text)
+        while "()" in parens:
+            parens = parens.replace("()", "")
+        if parens:
+            return "unmatched ')'" if parens[0] == ")" else "unclosed '('"
+    labels = _RING.findall(text)
+    if labels:
+        unclosed = [label for label in set(labels) if labels.count(label) % 2]
+        if unclosed:
+            return f"unclosed ring bond {min(unclosed)}"
+    return None
+
+
+def _error(field: str, value: str, reason: str) -> ValidationError:
+    """Build the error of an invalid field."""
+    label = "CAS RN" if field == "cas_rn" else "SMILES"
+    return ValidationError(f"Invalid {label} {value!r}: {reason}", field, value, reason)
+
+
+def validate_record(record: Any) -> Optional[ValidationError]:
+    """
+    Check the CAS RN and SMILES (if any) of a batch record.
+
+    Returns:
+        The validation error of the first invalid field, or None if the record is valid
+    """
+    record = to_record(record)
+    reason = check_cas(record.cas_rn)
+    if reason is not None:
+        return _error("cas_rn", record.cas_rn, reason)
+    if record.smiles is not None:
+        reason = check_smiles(record.smiles)
+        if reason is not None:
+            return _error("smiles", record.smiles, reason)
+    return None
+
+
+def validate_records(records: Iterable[Any]) -> Tuple[List[BatchRecord], Dict[str, ValidationError]]:
+    """
+    Split batch records into valid ones and the errors of invalid ones.
+
+    Args:
+        records: CAS RNs, tuples, mappings or BatchRecords, as accepted by ``get_data_batch``
+
+    Returns:
+        Valid records in their original order, and invalid CAS RNs mapped to their errors
+    """
+    valid = []
+    invalid = {}
+    # Inventories repeat SMILES (salts, synonyms), so each distinct one is checked once
+    smiles_reasons: Dict[str, Optional[str]] = {}
+    for record in map(to_record, records):
+        reason = check_cas(record.cas_rn)
+        if reason is not None:
+            invalid[record.cas_rn] = _error("cas_rn", record.cas_rn, reason)
+            continue
+        if record.smiles is not None:
+            try:
+                reason = smiles_reasons[record.smiles]
+            except KeyError:
+                reason = smiles_reasons[record.smiles] = check_smiles(record.smiles)
+            if reason is not None:
+                invalid[record.cas_rn] = _error("smiles", record.smiles, reason)
+                continue
+        valid.append(record)
+    return valid, invalid
@@ -0,0 +1,173 @@
+# src/epysuite/workspace.py
+
+"""Isolated EPI Suite working directories for concurrent runs."""
+
+import os
+import queue
+import shutil
+import tempfile
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .config import EPySuiteConfig
+from .exceptions import ConfigurationError, FileHandlingError
+
+# Files the runner rewrites or EPI Suite produces on every run. They are never
+# linked into a workspace, so writing them cannot leak into the installation.
+MUTABLE_FILES = {"epi_inp.txt", "stpvalsx", "tabout.txt", "cas_res.txt"}
+MUTABLE_SUFFIXES = (".epi",)
+
+LINK_MODES = ("copy", "hardlink", "symlink")
+
+TMPFS_ROOT = Path("/dev/shm")
+
+
+def _is_mutable(name: str) -> bool:
+    """Check whether a top-level installation file is rewritten per run."""
+    return name.lower() in MUTABLE_FILES or name.lower().endswith(MUTABLE_SUFFIXES)
+
+
+def tmpfs_root() -> Optional[Path]:
+    """Return the RAM-backed directory for workspaces, or None if there is none."""
+    if TMPFS_ROOT.is_dir() and os.access(TMPFS_ROOT, os.W_OK | os.X_OK):
+        return TMPFS_ROOT
+    return None
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink a file, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class Workspace:
+    """A private staged copy of an EPI Suite installation.
+
+    Read-only installation files are copied, hardlinked or symlinked from
+    ``config.es_dir`` while the input and output files are left out, so each
+    workspace can be driven by its own runner without touching the others.
+    With ``config.workspace_tmpfs`` workspaces live on tmpfs, where the
+    per-run input and output files never touch a disk or network mount.
+    """
+
+    def __init__(self, config: EPySuiteConfig, path: Path):
+        """Wrap an already staged workspace directory."""
+        self.path = path
+        self.config = replace(config, es_dir=path)
+
+    @classmethod
+    def create(
+        cls,
+        config: EPySuiteConfig,
+        root: Optional[Path] = None,
+        link_mode: Optional[str] = None
+    ) -> "Workspace":
+        """
+        Stage a new workspace from the installation in ``config.es_dir``.
+
+        Args:
+            config: Configuration of the installation to mirror
+            root: Directory in which to create the workspace (defaults to
+                config.workspace_root, then tmpfs if config.workspace_tmpfs)
+            link_mode: "copy", "hardlink" or "symlink" (defaults to config.link_mode)
+
+        Returns:
+            The staged workspace
+        """
+        link_mode = link_mode or config.link_mode
+        if link_mode not in LINK_MODES:
+            raise ConfigurationError(f"Unknown workspace link mode: {link_mode}")
+
+        root = root or config.workspace_root or (tmpfs_root() if config.workspace_tmpfs else None)
+        source = config.es_dir
+        try:
+            if root is not None:
+                root.mkdir(parents=True, exist_ok=True)
+            path = Path(tempfile.mkdtemp(prefix="epysuite-", dir=root))
+            if config.workspace_tmpfs and link_mode == "hardlink" and path.stat().st_dev != source.stat().st_dev:
+                # Hardlinks cannot cross into tmpfs; link the read-only assets instead of copying them to RAM
+                link_mode = "symlink"
+            for entry in source.iterdir():
+                if _is_mutable(entry.name):
+                    continue
+                target = path / entry.name
+                if link_mode == "symlink":
+                    target.symlink_to(entry, target_is_directory=entry.is_dir())
+                elif entry.is_dir():
+                    copy_function = _link_or_copy if link_mode == "hardlink" else shutil.copy2
+                    shutil.copytree(entry, target, copy_function=copy_function)
+                elif link_mode == "hardlink":
+                    _link_or_copy(str(entry), str(target))
+                else:
+                    shutil.copy2(entry, target)
+        except Exception as err:
+            raise FileHandlingError(f"Error staging workspace from {source}") from err
+
+        return cls(config, path)
+
+    def cleanup(self) -> None:
+        """Remove the workspace directory."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+
+class WorkspacePool:
+    """A fixed set of workspaces handed out to one caller at a time."""
+
+    def __init__(self, config: EPySuiteConfig, size: int, root: Optional[Path] = None):
+        """Stage ``size`` workspaces from the installation in ``config.es_dir``."""
+        if size < 1:
+            raise ConfigurationError(f"Workspace pool size must be at least 1, got {size}")
+        self.workspaces: List[Workspace] = []
+        self._available: "queue.Queue[Workspace]" = queue.Queue()
+        try:
+            for _ in range(size):
+                workspace = Workspace.create(config, root=root)
+                self.workspaces.append(workspace)
+                self._available.put(workspace)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        """Number of workspaces in the pool."""
+        return len(self.workspaces)
+
+    def acquire(self, timeout: Optional[float] = None) -> Workspace:
+        """Take a workspace from the pool, blocking until one is free."""
+        return self._available.get(timeout=timeout)
+
+    def release(self, workspace: Workspace) -> None:
+        """Return a workspace to the pool."""
+        self._available.put(workspace)
+
+    @contextmanager
+    def workspace(self) -> Iterator[Workspace]:
+        """Borrow a workspace for the duration of a ``with`` block."""
+        workspace = self.acquire()
+        try:
+            yield workspace
+        finally:
+            self.release(workspace)
+
+    def close(self) -> None:
+        """Remove all workspaces in the pool."""
+        for workspace in self.workspaces:
+            workspace.cleanup()
+        self.workspaces = []
+
+    def __enter__(self) -> "WorkspacePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,6 +1,9 @@
 # tests/conftest.py
 
+import subprocess
+import sys
 import pytest
+from unittest.mock import Mock
 from pathlib import Path
 from epysuite.config import EPySuiteConfig
 
@@ -27,4 +30,28 @@ def mock_config(mock_episuite_dir):
         es_dir=mock_episuite_dir,
         timeout=1,
         data_format="pandas"
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture
+def write_tabout():
+    """A process.run side effect that writes one tabout row per CALCULATE block into cwd."""
+    def side_effect(args, cwd, **kwargs):
+        lines = (Path(cwd) / "epi_inp.txt").read_text().splitlines()
+        rows = ["Chemical name\tSMILES\tSTP Total Removal (%)\tEmpty\n"]
+        for i, line in enumerate(lines):
+            if line == "CALCULATE":
+                smiles, name = lines[i + 1], lines[i + 2]
+                if "!" in smiles:
+                    raise subprocess.CalledProcessError(1, args)
+                rows.append(f"{name}\t{smiles}\t{len(smiles)}.5\t\n")
+        (Path(cwd) / "tabout.txt").write_text("".join(rows))
+        return Mock(returncode=0)
+    return side_effect
+
+@pytest.fixture
+def fake_episuite_dir(tmp_path):
+    """Install the fake EPI Suite executables from the benchmark suite."""
+    if sys.platform == "win32":
+        pytest.skip("fake EPI Suite executables require a POSIX platform")
+    from benchmarks.fake_episuite import install
+    return install(tmp_path / "EPISUITE41", hang="HANG", fail="FAIL")
@@ -0,0 +1,39 @@
+# tests/test_accumulator.py
+
+"""Test columnar batch result assembly."""
+
+import polars as pl
+import pytest
+
+from epysuite.accumulator import ResultAccumulator
+
+
+def test_accumulator_shared_schema():
+    """Test that results with differing columns share one typed schema."""
+    results = ResultAccumulator()
+    results.add(["SMILES", "Log Kow"], [["CCO", "-0.31"]], cas_rn="64-17-5")
+    results.add(["SMILES", "Log Kow", "Note"], [["C=O", None, "x"], ["CC", 1.5, None]], cas_rn=["50-00-0", "74-84-0"])
+    results.add(["SMILES"], [["C"]], cas_rn="74-82-8")
+
+    df = results.to_frame("polars")
+    assert df.columns == ["cas_rn", "SMILES", "Log Kow", "Note"]
+    assert df.schema["Log Kow"] == pl.Float64
+    assert df["cas_rn"].to_list() == ["64-17-5", "50-00-0", "74-84-0", "74-82-8"]
+    assert df["Log Kow"].to_list() == [-0.31, None, 1.5, None]
+    assert df["Note"].to_list() == [None, "x", None, None]
+    assert len(results) == 4
+
+@pytest.mark.parametrize("format", ["polars", "pandas", "pyarrow", "records"])
+def test_accumulator_formats(format):
+    """Test building the result in every format, dropping empty columns."""
+    results = ResultAccumulator(keys=("cas_rn", "halflife_hr"))
+    for i in range(3):
+        results.add(["SMILES", "Empty"], [["C" * (i + 1), None]], cas_rn=f"{i}-00-0", halflife_hr=float(i))
+    df = results.to_frame(format)
+    assert len(df) == 3
+    if format == "records":
+        assert df[0] == {"cas_rn": "0-00-0", "halflife_hr": 0.0, "SMILES": "C"}
+
+def test_accumulator_empty():
+    """Test that an empty accumulator builds an empty frame."""
+    assert ResultAccumulator().to_frame("polars").shape == (0, 0)
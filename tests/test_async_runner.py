@@ -0,0 +1,77 @@
+# tests/test_async_runner.py
+
+"""Test the asyncio runner."""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from epysuite.async_runner import AsyncEPySuiteRunner
+from epysuite.exceptions import TimeoutError
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX script as epiwin1.exe")
+
+FAKE_EPIWIN = f"""#!{sys.executable}
+import pathlib, sys, time
+lines = pathlib.Path(sys.argv[1]).read_text().splitlines()
+if lines[0] == "CAS":
+    pathlib.Path("cas_res.txt").write_text("CCO\\n")
+    sys.exit(0)
+time.sleep(float(lines[1].count("S")))
+pathlib.Path("started").touch()
+pathlib.Path("tabout.txt").write_text(f"Chemical name\\tSMILES\\tValue\\n{{lines[2]}}\\t{{lines[1]}}\\t1.5\\n")
+"""
+
+
+@pytest.fixture
+def async_config(mock_config):
+    """Configuration whose epiwin1.exe is a small executable script."""
+    mock_config.app_path.write_text(FAKE_EPIWIN)
+    mock_config.app_path.chmod(0o755)
+    mock_config.link_mode = "copy"
+    return mock_config
+
+def test_async_get_data(async_config):
+    """Test concurrent requests sharing a bounded set of workspaces."""
+    async def main():
+        async with AsyncEPySuiteRunner(async_config, max_concurrency=2) as runner:
+            return await asyncio.gather(
+                runner.get_data("64-17-5"),
+                runner.get_data("50-00-0", smiles="C=O"),
+                runner.get_data("74-82-8", smiles="C"),
+            )
+    
+    frames = asyncio.run(main())
+    assert [list(df["SMILES"]) for df in frames] == [["CCO"], ["C=O"], ["C"]]
+
+def test_async_timeout(async_config):
+    """Test that a hung EPI Suite process times out and is killed."""
+    async_config.timeout = 0.5
+    
+    async def main():
+        async with AsyncEPySuiteRunner(async_config, max_concurrency=1) as runner:
+            with pytest.raises(TimeoutError):
+                await runner.get_data("1-00-0", smiles="SSSSSS")
+            # The workspace is released for the next request
+            return await runner.get_data("64-17-5", smiles="CCO")
+    
+    start = time.monotonic()
+    assert list(asyncio.run(main())["SMILES"]) == ["CCO"]
+    assert time.monotonic() - start < 3
+
+def test_async_cancellation(async_config):
+    """Test that cancelling a request kills its EPI Suite process."""
+    async def main():
+        async with AsyncEPySuiteRunner(async_config, max_concurrency=1) as runner:
+            task = asyncio.ensure_future(runner.get_data("1-00-0", smiles="SSS"))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            workspace = runner._workspaces[0]
+            await asyncio.sleep(3)
+            return (workspace.path / "started").exists()
+    
+    assert not asyncio.run(main())
@@ -0,0 +1,196 @@
+# tests/test_backends.py
+
+"""Test the DataFrame backends."""
+
+import importlib.util
+import subprocess
+import sys
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from epysuite.backends import Backend, PandasBackend, backend_for, get_backend, register_backend
+from epysuite.config import EPySuiteConfig
+from epysuite.exceptions import ConfigurationError
+from epysuite.runner import EPySuiteRunner
+from epysuite.sinks import CsvSink, ParquetSink
+from epysuite.utils import frame_column, frame_to_rows, iter_tabout, parse_tabout, sink_tabout
+
+FORMATS = ["polars", "pandas", "pyarrow", "records"]
+
+
+@pytest.fixture
+def tabout(tmp_path):
+    path = tmp_path / "tabout.txt"
+    path.write_text(
+        "Chemical name\tSMILES\tLog Kow\tEmpty\tFlag\n"
+        "71-43-2\t c1ccccc1 \t 1.99\t\tNA\n"
+        "67-64-1\tCC(=O)C\t\t\tx\n"
+    )
+    return path
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_parse_tabout_backends(tabout, format):
+    """Test that every backend parses tabout files to the same values."""
+    df = parse_tabout(tabout, format=format)
+    assert frame_to_rows(df) == (
+        ["Chemical name", "SMILES", "Log Kow", "Flag"],
+        [["71-43-2", "c1ccccc1", 1.99, "NA"], ["67-64-1", "CC(=O)C", None, "x"]],
+    )
+    assert backend_for(df) is get_backend(format)
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_backend_operations(format):
+    """Test column insertion, update and concatenation."""
+    backend = get_backend(format)
+    df = backend.from_rows(["a", "b"], [[1.0, "x"], [2.0, "y"]])
+    df = backend.insert_column(df, "key", ["k1", "k2"])
+    df = backend.update_columns(df, backend.from_rows(["b"], [["z"], ["w"]]))
+    combined = backend.concat([df, backend.insert_column(backend.from_rows(["a"], [[3.0]]), "key", "k3")])
+    assert backend.column(combined, "key") == ["k1", "k2", "k3"]
+    assert backend.column(combined, "b") == ["z", "w", None]
+    assert backend.column(combined, "missing") is None
+
+def test_records_align_columns(tmp_path):
+    """Test that records frames keep keys missing from their first row."""
+    pytest.importorskip("pyarrow")
+    backend = get_backend("records")
+    combined = backend.concat([[{"cas_rn": "1-00-0", "a": 1.0}], [{"cas_rn": "2-00-0", "a": 2.0, "b": "x"}]])
+    assert combined == [{"cas_rn": "1-00-0", "a": 1.0, "b": None}, {"cas_rn": "2-00-0", "a": 2.0, "b": "x"}]
+    backend.write_parquet([{"a": 1.0}, {"a": 2.0, "b": "x"}], tmp_path / "part.parquet")
+    assert backend.read_parquet(tmp_path / "part.parquet") == [{"a": 1.0, "b": None}, {"a": 2.0, "b": "x"}]
+
+def test_unknown_format(mock_episuite_dir):
+    """Test that unknown formats are rejected when the runner is created."""
+    with pytest.raises(ConfigurationError):
+        EPySuiteRunner(EPySuiteConfig(es_dir=mock_episuite_dir, data_format="excel"))
+
+def test_register_backend():
+    """Test registering a custom backend."""
+    class TupleBackend(Backend):
+        name = "tuples"
+
+        def from_rows(self, columns, rows):
+            return tuple(map(tuple, rows))
+
+    register_backend("tuples", TupleBackend)
+    assert get_backend("tuples").from_rows(["a"], [[1]]) == ((1,),)
+
+@patch('epysuite.process.run')
+def test_records_runner_and_sink(mock_run, mock_episuite_dir, write_tabout, tmp_path):
+    """Test batch runs and Parquet sinks without a DataFrame library."""
+    mock_run.side_effect = write_tabout
+    runner = EPySuiteRunner(EPySuiteConfig(es_dir=mock_episuite_dir, data_format="records", chunk_size=2))
+    records = runner.get_data_batch([("71-43-2", "c1ccccc1"), ("64-17-5", "CCO")])
+    assert records == [
+        {"cas_rn": "71-43-2", "Chemical name": "71-43-2", "SMILES": "c1ccccc1", "STP Total Removal (%)": 8.5},
+        {"cas_rn": "64-17-5", "Chemical name": "64-17-5", "SMILES": "CCO", "STP Total Removal (%)": 3.5},
+    ]
+
+    pytest.importorskip("pyarrow")
+    with ParquetSink(tmp_path / "results") as sink:
+        sink.write(records)
+    assert frame_column(ParquetSink(tmp_path / "results").read("records"), "cas_rn") == ["71-43-2", "64-17-5"]
+
+def test_import_is_lazy():
+    """Test that importing epysuite loads no DataFrame library, asyncio or HTTP server."""
+    lazy = ["pandas", "polars", "pyarrow", "asyncio", "http.server", "epysuite.jobs", "epysuite.sinks"]
+    code = f"import sys, epysuite; print(sorted(set({lazy!r}) & set(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+    code = "import epysuite; print(epysuite.CsvSink.__module__, epysuite.AsyncEPySuiteRunner.__module__)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["epysuite.sinks", "epysuite.async_runner"]
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_parse_tabout_columns(tabout, format):
+    """Test reading only the requested columns, in request order."""
+    df = parse_tabout(tabout, format=format, columns=["Log Kow", "Chemical name", "Missing"])
+    assert frame_to_rows(df) == (["Log Kow", "Chemical name"], [[1.99, "71-43-2"], [None, "67-64-1"]])
+    assert frame_to_rows(parse_tabout(tabout, format=format, columns=["Missing"])) == ([], [])
+    assert frame_to_rows(get_backend(format).parse_text(tabout.read_bytes(), [])) == ([], [])
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_iter_tabout(tmp_path, format):
+    """Test that streamed chunks share the column types of the whole file."""
+    path = tmp_path / "tabout.txt"
+    path.write_text(
+        "Chemical name\tLog Kow\tEmpty\tLate\tMixed\n"
+        "71-43-2\t1.99\t\t\t 2\n"
+        "67-64-1\t\t\t\t3\n"
+        "50-00-0\t3\t\t 4.5\tx\n"
+    )
+    chunks = [frame_to_rows(chunk) for chunk in iter_tabout(path, format=format, chunk_rows=2)]
+    assert chunks == [
+        (["Chemical name", "Log Kow", "Late", "Mixed"], [["71-43-2", 1.99, None, "2"], ["67-64-1", None, None, "3"]]),
+        (["Chemical name", "Log Kow", "Late", "Mixed"], [["50-00-0", 3.0, 4.5, "x"]]),
+    ]
+    chunks = list(iter_tabout(path, format=format, columns=["Late", "Empty"], chunk_rows=2))
+    assert [frame_to_rows(chunk) for chunk in chunks] == [(["Late"], [[None], [None]]), (["Late"], [[4.5]])]
+
+def test_sink_tabout(tabout, tmp_path):
+    """Test streaming a tabout file into a sink keyed by chemical name."""
+    with CsvSink(tmp_path / "results.csv") as sink:
+        assert sink_tabout(tabout, sink, format="records", columns=["Log Kow"], chunk_rows=1) == 2
+    assert frame_to_rows(CsvSink(tmp_path / "results.csv").read("records")) == (
+        ["cas_rn", "Chemical name", "Log Kow"],
+        [["71-43-2", "71-43-2", 1.99], ["67-64-1", "67-64-1", None]],
+    )
+
+def test_pandas_dtypes(tmp_path, monkeypatch):
+    """Test compact pandas dtypes, downcasting and the fallback without pyarrow."""
+    pd = pytest.importorskip("pandas")
+    path = tmp_path / "tabout.txt"
+    path.write_text(
+        "Chemical name\tLog Kow\tHalf-life Units\tFlag\n"
+        "71-43-2\t1.99\tmg/L\tNA\n"
+        "67-64-1\t-0.24\tmg/L\tx\n"
+        "50-00-0\t 0.35 \tmg/L \t\n"
+    )
+    df = PandasBackend(categories=["Half-life Units"]).parse_tabout(path)
+    assert df["Log Kow"].dtype == "float64"
+    assert list(df["Half-life Units"].cat.categories) == ["mg/L"]
+    assert not isinstance(PandasBackend().parse_tabout(path)["Half-life Units"].dtype, pd.CategoricalDtype)
+    assert df["Flag"].tolist()[:2] == ["NA", "x"] and not isinstance(df["Flag"].dtype, pd.CategoricalDtype)
+    arrow = importlib.util.find_spec("pyarrow") is not None
+    assert df["Chemical name"].dtype == (pd.StringDtype("pyarrow") if arrow else object)
+    assert PandasBackend(downcast=True).parse_tabout(path)["Log Kow"].dtype == "float32"
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    df = PandasBackend().parse_tabout(path)
+    assert df["Log Kow"].dtype == "float64" and df["Chemical name"].dtype == object
+    assert frame_to_rows(df)[1][2] == ["50-00-0", 0.35, "mg/L", None]
+
+def test_pandas_dtypes_match_across_runs(fake_episuite_dir):
+    """Test that single, batch and streamed pandas results share their dtypes."""
+    pd = pytest.importorskip("pandas")
+    config = EPySuiteConfig(
+        es_dir=fake_episuite_dir,
+        data_format="pandas",
+        chunk_size=2,
+        category_columns=["Biowin Model", "Ready Biodegradability Prediction"]
+    )
+    runner = EPySuiteRunner(config)
+    records = [(f"{n}-00-{n % 10}", "C" * (n % 9 + 1)) for n in range(100, 108)]
+    single = runner.get_data(*records[0])
+    batch = runner.get_data_batch(records)
+    chunks = list(runner.iter_data(records))
+    combined = get_backend("pandas", **config.format_options).concat(chunks)
+    assert isinstance(batch["Biowin Model"].dtype, pd.CategoricalDtype)
+    for df in [single, *chunks, combined]:
+        assert all(str(df[col].dtype) == str(batch[col].dtype) for col in df.columns)
+    assert sorted(combined["Ready Biodegradability Prediction"].cat.categories) == ["No", "Yes"]
+
+def test_pandas_downcast_config(fake_episuite_dir, tabout):
+    """Test downcasting pandas results through the runner configuration and parse options."""
+    pytest.importorskip("pandas")
+    config = EPySuiteConfig(es_dir=fake_episuite_dir, data_format="pandas", downcast=True, chunk_size=2)
+    runner = EPySuiteRunner(config)
+    records = [("71-43-2", "c1ccccc1"), ("64-17-5", "CCO"), ("67-64-1", "CC(=O)C")]
+    for df in [runner.get_data(*records[0]), runner.get_data_batch(records), *runner.iter_data(records)]:
+        assert df["STP Total Removal (%)"].dtype == "float32"
+    assert EPySuiteRunner(replace(config, downcast=False)).get_data(*records[0])["Mol Wt"].dtype == "float64"
+    assert parse_tabout(tabout, format="pandas", downcast=True)["Log Kow"].dtype == "float32"
+    with pytest.raises(ConfigurationError, match="Invalid options"):
+        get_backend("polars", downcast=True)
@@ -0,0 +1,31 @@
+# tests/test_batch.py
+
+"""Test batch record handling."""
+
+from epysuite.batch import BatchRecord, group_records, normalize_smiles
+from epysuite.config import STPConfig
+
+
+def test_normalize_smiles():
+    """Test light SMILES normalization."""
+    assert normalize_smiles("  CCO ethanol") == "CCO"
+    assert normalize_smiles("[NA+].CC(=O)[O-]") == normalize_smiles("CC(=O)[O-].[Na+]")
+    assert normalize_smiles("CLc1ccccc1BR") == "Clc1ccccc1Br"
+    # Aromatic atoms and hydrogen counts keep their case
+    assert normalize_smiles("c1cc[nH]c1") == "c1cc[nH]c1"
+    assert normalize_smiles("[se]1cccc1") == "[se]1cccc1"
+    assert normalize_smiles("[NH4+]") == "[NH4+]"
+
+def test_group_records():
+    """Test grouping records by normalized SMILES and STP configuration."""
+    records = [
+        BatchRecord("64-17-5", "CCO"),
+        BatchRecord("1-00-0", " CCO "),
+        BatchRecord("2-00-0", "CCO", STPConfig(biowin=False)),
+        BatchRecord("71-43-2"),
+        BatchRecord("3-00-0"),
+        BatchRecord("71-43-2"),
+    ]
+    unique, groups = group_records(records, known={"3-00-0": "CCO"})
+    assert [record.cas_rn for record in unique] == ["64-17-5", "2-00-0", "71-43-2"]
+    assert groups == [0, 0, 1, 2, 0, 2]
@@ -0,0 +1,52 @@
+# tests/test_cache.py
+
+"""Test the result cache."""
+
+import time
+
+from epysuite.cache import ResultCache, SmilesTable, make_key
+
+
+def test_cache_roundtrip(tmp_path):
+    """Test storing and retrieving a result table."""
+    cache = ResultCache(tmp_path / "cache.db")
+    key = make_key("71-43-2", "c1ccccc1")
+    
+    assert cache.get(key) is None
+    cache.put(key, "71-43-2", ["SMILES", "STP Total Removal (%)"], [["c1ccccc1", 76.22]])
+    assert cache.get(key) == (["SMILES", "STP Total Removal (%)"], [["c1ccccc1", 76.22]])
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": cache.stats()["bytes"]}
+
+def test_cache_invalidate(tmp_path):
+    """Test explicit invalidation by CAS RN and in full."""
+    cache = ResultCache(tmp_path / "cache.db")
+    cache.put("a", "71-43-2", ["x"], [[1.0]])
+    cache.put("b", "71-43-2", ["x"], [[2.0]])
+    cache.put("c", "67-64-1", ["x"], [[3.0]])
+    
+    assert cache.invalidate(cas_rn="71-43-2") == 2
+    assert cache.get("c") is not None
+    assert cache.invalidate() == 1
+    assert cache.stats()["entries"] == 0
+
+def test_cache_eviction(tmp_path):
+    """Test age and size based eviction."""
+    cache = ResultCache(tmp_path / "cache.db", max_age=0.05)
+    cache.put("old", "1-00-0", ["x"], [[1.0]])
+    time.sleep(0.1)
+    assert cache.get("old") is None
+    
+    cache = ResultCache(tmp_path / "sized.db", max_bytes=100)
+    cache.put("first", "1-00-0", ["x"], [["a" * 40]])
+    cache.put("second", "2-00-0", ["x"], [["b" * 40]])
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
+
+def test_smiles_table(tmp_path):
+    """Test storing positive and negative CAS RN lookups."""
+    table = SmilesTable(tmp_path / "cache.db")
+    table.put_many({"71-43-2": "c1ccccc1", "0-00-0": None})
+    
+    assert table.get_many(["71-43-2", "0-00-0", "67-64-1"]) == {"71-43-2": "c1ccccc1", "0-00-0": None}
+    assert table.invalidate(negative_only=True) == 1
+    assert table.get_many(["0-00-0"]) == {}
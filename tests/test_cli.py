@@ -0,0 +1,72 @@
+# tests/test_cli.py
+
+"""Test the epysuite command-line interface."""
+
+import csv
+
+import pytest
+
+from epysuite.cli import main
+from epysuite.sinks import CsvSink, ParquetSink
+
+
+@pytest.fixture
+def inventory(tmp_path):
+    path = tmp_path / "inventory.csv"
+    path.write_text(
+        "cas_rn,smiles\n"
+        "71-43-2,c1ccccc1\n"
+        "64-17-5,CCO\n"
+        "67-64-1,\n"
+        "1-00-0,CFAIL\n"
+    )
+    return path
+
+def test_batch_to_csv_and_resume(fake_episuite_dir, inventory, tmp_path, capsys):
+    """Test a CSV batch job, refusing to overwrite it and resuming it."""
+    output = tmp_path / "results.csv"
+    args = ["batch", str(inventory), "-o", str(output), "--es-dir", str(fake_episuite_dir),
+            "-w", "2", "--columns", "SMILES,STP Total Removal (%)"]
+    assert main(args) == 0
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert sorted(row["cas_rn"] for row in rows) == ["64-17-5", "67-64-1", "71-43-2"]
+    assert set(rows[0]) == {"cas_rn", "SMILES", "STP Total Removal (%)"}
+    err = capsys.readouterr().err
+    assert "3 succeeded, 1 failed" in err
+    assert "ETA" in err
+
+    assert main(args) == 1
+    assert "--resume" in capsys.readouterr().err
+
+    assert main(args + ["--resume", "--quiet"]) == 0
+    err = capsys.readouterr().err
+    assert "3 of 4 chemicals already done" in err
+    assert "0 succeeded, 1 failed" in err
+    assert len(CsvSink(output).completed) == 3
+
+def test_batch_to_parquet_with_stp_options(fake_episuite_dir, inventory, tmp_path):
+    """Test a Parquet batch job with a fixed STP half-life."""
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "results"
+    args = ["batch", str(inventory), "-o", str(output), "--es-dir", str(fake_episuite_dir),
+            "--chunk-size", "2", "--no-biowin", "--halflife-hr", "1000", "-q"]
+    assert main(args) == 0
+    sink = ParquetSink(output)
+    assert sink.completed == {"71-43-2", "64-17-5", "67-64-1"}
+    df = sink.read("polars")
+    assert df["STP Biodegradation (%)"].max() < 1
+
+def test_batch_missing_column(fake_episuite_dir, tmp_path, capsys):
+    """Test that an inventory without the CAS column is rejected."""
+    path = tmp_path / "inventory.csv"
+    path.write_text("cas,smiles\n71-43-2,c1ccccc1\n")
+    assert main(["batch", str(path), "-o", str(tmp_path / "out.csv"), "--es-dir", str(fake_episuite_dir)]) == 1
+    assert "'cas_rn'" in capsys.readouterr().err
+
+def test_batch_relative_es_dir(fake_episuite_dir, inventory, tmp_path, monkeypatch):
+    """Test running with an installation given relative to the working directory."""
+    monkeypatch.chdir(fake_episuite_dir.parent)
+    output = tmp_path / "results.csv"
+    assert main(["batch", str(inventory), "-o", str(output), "--es-dir", fake_episuite_dir.name, "-q"]) == 0
+    assert len(CsvSink(output).completed) == 3
@@ -0,0 +1,52 @@
+# tests/test_fake_episuite.py
+
+import pytest
+
+from epysuite import EPySuiteConfig, EPySuiteRunner, STPConfig
+from epysuite.exceptions import ExecutionError, TimeoutError
+
+
+@pytest.fixture
+def runner(fake_episuite_dir):
+    return EPySuiteRunner(EPySuiteConfig(es_dir=fake_episuite_dir, timeout=2, data_format="polars"))
+
+
+def test_get_data_end_to_end(runner):
+    df = runner.get_data("71-43-2", smiles="c1ccccc1")
+    assert df["Chemical name"].to_list() == ["71-43-2"]
+    assert df["SMILES"].to_list() == ["c1ccccc1"]
+    assert "STP Total Removal (%)" in df.columns
+
+
+def test_smiles_lookup_end_to_end(runner):
+    df = runner.get_data("67-64-1")
+    assert df["SMILES"].to_list() == ["CC(=O)C"]
+
+
+def test_halflife_changes_stp_removal(runner):
+    fast = runner.get_data("71-43-2", smiles="c1ccccc1", stp_config=STPConfig(biowin=False, halflife_hr=1.0))
+    slow = runner.get_data("71-43-2", smiles="c1ccccc1", stp_config=STPConfig(biowin=False, halflife_hr=1000.0))
+    assert fast["STP Biodegradation (%)"][0] > slow["STP Biodegradation (%)"][0]
+
+
+def test_batch_end_to_end(runner):
+    records = [("71-43-2", "c1ccccc1"), ("64-17-5", "CCO"), ("1-00-0", "CFAIL")]
+    df = runner.get_data_batch(records, workers=2, chunk_size=2, on_error="skip")
+    assert sorted(df["cas_rn"].unique().to_list()) == ["64-17-5", "71-43-2"]
+    assert list(runner.last_batch.errors) == ["1-00-0"]
+
+
+def test_batch_dedup_identity_columns(runner):
+    records = [("71-43-2", "c1ccccc1"), ("108-88-3", "c1ccccc1")]
+    df = runner.get_data_batch(records)
+    assert runner.last_batch.unique == 1
+    assert df["Chemical name"].to_list() == ["71-43-2", "108-88-3"]
+    assert df["CAS Number"].to_list() == ["71-43-2", "108-88-3"]
+
+
+def test_failure_and_timeout(runner):
+    with pytest.raises(ExecutionError):
+        runner.get_data("1-00-0", smiles="CFAIL")
+    runner.config.timeout = 0.5
+    with pytest.raises(TimeoutError):
+        runner.get_data("2-00-0", smiles="CHANG")
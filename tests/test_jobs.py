@@ -0,0 +1,117 @@
+# tests/test_jobs.py
+
+"""Test the shared job queue and queue workers."""
+
+import sqlite3
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+from benchmarks.fake_episuite import install
+from epysuite.batch import BatchRecord
+from epysuite.cli import main
+from epysuite.config import EPySuiteConfig, STPConfig
+from epysuite.jobs import JobQueue
+from epysuite.runner import EPySuiteRunner
+from epysuite.utils import frame_column
+
+WORKER = """
+import sys
+from epysuite import EPySuiteConfig, EPySuiteRunner
+from epysuite.jobs import JobQueue
+runner = EPySuiteRunner(EPySuiteConfig(es_dir=sys.argv[1], data_format="records"))
+runner.work(JobQueue(sys.argv[2]), worker_id=sys.argv[3], poll=0.1)
+"""
+
+
+def test_claim_complete_and_reclaim(tmp_path):
+    """Test idempotent submits, leased claims and reclaiming expired leases."""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.2, max_attempts=2)
+    records = ["71-43-2", ("64-17-5", "CCO"), BatchRecord("67-64-1", None, STPConfig(halflife_hr=100))]
+    assert queue.submit(records) == 3
+    assert queue.submit(records) == 0
+
+    first = queue.claim("a", 2)
+    assert [job.record.cas_rn for job in first] == ["71-43-2", "64-17-5"]
+    second = queue.claim("b", 2)
+    assert len(second) == 1 and second[0].record.stp_config.halflife_hr == 100
+    assert queue.claim("b", 2) == []
+    assert queue.complete(second[0], "b", ["SMILES"], [["CC(=O)C"]])
+    assert not queue.complete(second[0], "b", ["SMILES"], [["CC(=O)C"]])
+
+    # Worker "a" crashed; its jobs come back once the lease expires
+    time.sleep(0.3)
+    reclaimed = queue.claim("c", 5)
+    assert [(job.record.cas_rn, job.attempts) for job in reclaimed] == [("71-43-2", 2), ("64-17-5", 2)]
+    assert queue.complete(reclaimed[0], "c", ["SMILES"], [["c1ccccc1"]])
+
+    # A job whose lease keeps expiring is given up on
+    time.sleep(0.3)
+    assert queue.claim("d", 5) == []
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 2, "failed": 1}
+    assert "Lease expired" in queue.failures()["64-17-5"]
+    assert frame_column(queue.results("records"), "cas_rn") == ["71-43-2", "67-64-1"]
+
+    assert queue.retry_failed() == 1
+    assert queue.counts()["pending"] == 1
+
+def test_worker_processes_drain_queue(fake_episuite_dir, tmp_path):
+    """Test several worker processes draining one queue with the fake executable."""
+    # Model latency keeps every worker busy long enough for the others to start
+    es_dir = install(fake_episuite_dir, latency=0.1, fail="FAIL")
+    path = tmp_path / "jobs.db"
+    queue = JobQueue(path)
+    cas_rns = [f"{n}-00-{n % 10}" for n in range(100, 124)]
+    queue.submit([(cas_rn, "C" * (n % 5 + 1)) for n, cas_rn in enumerate(cas_rns)] + [("1-00-0", "CFAIL")])
+
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WORKER, str(es_dir), str(path), f"w{n}"])
+        for n in range(3)
+    ]
+    assert [worker.wait(timeout=120) for worker in workers] == [0, 0, 0]
+
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 24, "failed": 1}
+    assert list(queue.failures()) == ["1-00-0"]
+    results = queue.results("records")
+    assert frame_column(results, "cas_rn") == cas_rns
+    assert frame_column(results, "SMILES")[:2] == ["C", "CC"]
+    with sqlite3.connect(str(path)) as conn:
+        names = {name.split(":")[0] for (name,) in conn.execute("SELECT worker FROM jobs")}
+    assert len(names) > 1
+
+def test_work_reclaims_crashed_worker(fake_episuite_dir, tmp_path):
+    """Test that a worker waits for and takes over the jobs of a crashed worker."""
+    queue = JobQueue(tmp_path / "jobs.db", lease_seconds=0.5)
+    queue.submit([("71-43-2", "c1ccccc1"), ("64-17-5", "CCO"), ("67-64-1", None)])
+    queue.claim("crashed", 1)
+
+    runner = EPySuiteRunner(EPySuiteConfig(es_dir=fake_episuite_dir, data_format="records", chunk_size=2))
+    assert runner.work(queue, worker_id="survivor", poll=0.1) == 3
+    assert runner.last_batch.total == 3
+    assert queue.counts()["done"] == 3
+
+@patch('epysuite.process.run')
+def test_work_shared_cas_rn(mock_run, mock_config, write_tabout, tmp_path):
+    """Test completing every job of a chunk when jobs share a CAS RN."""
+    mock_run.side_effect = write_tabout
+    queue = JobQueue(tmp_path / "jobs.db")
+    queue.submit([("1-00-0", "CC"), ("1-00-0", "CCC"), ("2-00-0", "C")])
+    assert EPySuiteRunner(mock_config).work(queue, chunk_size=3, poll=0.1) == 3
+    assert mock_run.call_count == 1
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 3, "failed": 0}
+    results = queue.results("records")
+    assert frame_column(results, "SMILES") == ["CC", "CCC", "C"]
+
+def test_queue_commands(fake_episuite_dir, tmp_path, capsys):
+    """Test the submit, work and collect commands."""
+    inventory = tmp_path / "inventory.csv"
+    inventory.write_text("cas_rn,smiles\n71-43-2,c1ccccc1\n64-17-5,CCO\n")
+    path = str(tmp_path / "jobs.db")
+    assert main(["submit", str(inventory), "--queue", path]) == 0
+    assert "Submitted 2 of 2" in capsys.readouterr().err
+    assert main(["work", path, "--es-dir", str(fake_episuite_dir), "-w", "2"]) == 0
+    assert "Completed 2 jobs" in capsys.readouterr().err
+    output = tmp_path / "results.csv"
+    assert main(["collect", path, "-o", str(output)]) == 0
+    assert output.read_text().splitlines()[1].startswith("71-43-2,")
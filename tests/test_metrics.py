@@ -0,0 +1,119 @@
+# tests/test_metrics.py
+
+"""Test EPYSuite metrics instrumentation."""
+
+import json
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from epysuite.config import EPySuiteConfig
+from epysuite.exceptions import TimeoutError
+from epysuite.metrics import MetricEvent, Metrics
+from epysuite.runner import EPySuiteRunner
+
+
+def test_histogram_export():
+    """Test JSON and Prometheus export of histograms and counters."""
+    metrics = Metrics()
+    metrics.observe("stage_seconds", 0.003, stage="parse")
+    metrics.observe("stage_seconds", 0.2, stage="parse")
+    metrics.increment("process_exits_total", program="epiwin1.exe", code="0")
+
+    snapshot = json.loads(metrics.to_json())
+    [parse] = snapshot["histograms"]["stage_seconds"]
+    assert parse["labels"] == {"stage": "parse"}
+    assert parse["count"] == 2
+    assert parse["buckets"]["0.001"] == 0
+    assert parse["buckets"]["0.005"] == 1
+    assert parse["buckets"]["+Inf"] == 2
+    assert snapshot["counters"]["process_exits_total"][0]["value"] == 1
+
+    text = metrics.to_prometheus()
+    assert "# TYPE epysuite_stage_seconds histogram" in text
+    assert 'epysuite_stage_seconds_bucket{stage="parse",le="+Inf"} 2' in text
+    assert 'epysuite_stage_seconds_count{stage="parse"} 2' in text
+    assert 'epysuite_process_exits_total{code="0",program="epiwin1.exe"} 1' in text
+
+    metrics.reset()
+    assert metrics.to_prometheus() == ""
+
+def test_hooks_receive_events():
+    """Test that hooks see every observation."""
+    events = []
+    metrics = Metrics(hooks=[events.append])
+    with metrics.time("clean_outputs"):
+        pass
+    metrics.increment("process_timeouts_total", program="epiwin1.exe")
+    assert [event.name for event in events] == ["stage_seconds", "process_timeouts_total"]
+    assert events[0].labels == {"stage": "clean_outputs"}
+    assert events[1] == MetricEvent("process_timeouts_total", 1, {"program": "epiwin1.exe"})
+
+@patch('epysuite.process.run')
+def test_runner_records_stages(mock_run, mock_episuite_dir, write_tabout):
+    """Test per-stage timings, exit codes and output sizes of a run."""
+    mock_run.side_effect = write_tabout
+    metrics = Metrics()
+    config = EPySuiteConfig(es_dir=mock_episuite_dir, cache_path=mock_episuite_dir / "cache.db")
+    runner = EPySuiteRunner(config, metrics=metrics)
+    runner.get_data("71-43-2", smiles="c1ccccc1")
+    runner.get_data("71-43-2", smiles="c1ccccc1")
+
+    snapshot = metrics.to_dict()
+    stages = {entry["labels"]["stage"]: entry["count"] for entry in snapshot["histograms"]["stage_seconds"]}
+    assert stages == {
+        "cache_read": 2,
+        "clean_outputs": 1,
+        "write_input": 1,
+        "run_episuite": 1,
+        "parse": 1,
+        "cache_write": 1,
+    }
+    [output] = snapshot["histograms"]["output_bytes"]
+    assert output["labels"] == {"file": "tabout.txt"}
+    assert output["sum"] > 0
+    assert snapshot["counters"]["process_exits_total"] == [
+        {"labels": {"code": "0", "program": "epiwin1.exe"}, "value": 1}
+    ]
+
+@patch('epysuite.process.run')
+def test_runner_skips_unchanged_staged_files(mock_run, mock_episuite_dir, write_tabout):
+    """Test skipping unchanged input files and removing only tracked outputs."""
+    mock_run.side_effect = write_tabout
+    (mock_episuite_dir / "stale.epi").write_text("stale")
+    metrics = Metrics()
+    runner = EPySuiteRunner(EPySuiteConfig(es_dir=mock_episuite_dir), metrics=metrics)
+    runner.get_data("71-43-2", smiles="c1ccccc1")
+    assert not (mock_episuite_dir / "stale.epi").exists()
+
+    # The directory is listed only once; later runs remove the outputs found then
+    (mock_episuite_dir / "stale.epi").write_text("stale")
+    (mock_episuite_dir / "other.epi").write_text("other")
+    runner.get_data("64-17-5", smiles="CCO")
+    assert not (mock_episuite_dir / "stale.epi").exists()
+    assert (mock_episuite_dir / "other.epi").exists()
+
+    # Only stpvalsx is unchanged for the second chemical
+    counters = metrics.to_dict()["counters"]
+    assert counters["staged_writes_skipped_total"][0]["value"] == 1
+
+@patch('epysuite.process.run')
+def test_runner_records_timeouts(mock_run, mock_config):
+    """Test that timeouts are counted and the stage is still timed."""
+    mock_run.side_effect = subprocess.TimeoutExpired(cmd="test", timeout=1)
+    metrics = Metrics()
+    runner = EPySuiteRunner(mock_config, metrics=metrics)
+    with pytest.raises(TimeoutError):
+        runner.get_data("71-43-2", smiles="c1ccccc1")
+
+    snapshot = metrics.to_dict()
+    assert snapshot["counters"]["process_timeouts_total"][0]["value"] == 1
+    assert "process_exits_total" not in snapshot["counters"]
+    stages = [entry["labels"]["stage"] for entry in snapshot["histograms"]["stage_seconds"]]
+    assert "run_episuite" in stages
+
+def test_runner_without_metrics(mock_config):
+    """Test that a runner without metrics uses the shared no-op timer."""
+    runner = EPySuiteRunner(mock_config)
+    assert runner._stage("parse") is runner._stage("run_episuite")
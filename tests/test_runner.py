@@ -3,13 +3,15 @@
 """Test EPYSuite runner."""
 
 import subprocess
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
-from epysuite.config import EPySuiteConfig
-from epysuite.exceptions import ConfigurationError, ExecutionError, TimeoutError
+from epysuite.config import EPySuiteConfig, ModelConfig, STPConfig
+from epysuite.exceptions import ConfigurationError, ExecutionError, SmilesNotFoundError, TimeoutError
 from epysuite.runner import EPySuiteRunner
+from epysuite.sinks import ParquetSink
 
 
 def test_runner_initialization(mock_config):
@@ -23,7 +25,7 @@ def test_runner_invalid_installation():
     with pytest.raises(ConfigurationError):
         EPySuiteRunner(config)
 
-@patch('subprocess.run')
+@patch('epysuite.process.run')
 def test_get_data_with_smiles(mock_run, mock_config):
     """Test getting data with provided SMILES."""
     runner = EPySuiteRunner(mock_config)
@@ -36,7 +38,7 @@ def test_get_data_with_smiles(mock_run, mock_config):
     assert len(df) == 1
     mock_run.assert_called_once()
 
-@patch('subprocess.run')
+@patch('epysuite.process.run')
 def test_get_data_timeout(mock_run, mock_config):
     """Test timeout handling."""
     runner = EPySuiteRunner(mock_config)
@@ -45,7 +47,7 @@ def test_get_data_timeout(mock_run, mock_config):
     with pytest.raises(TimeoutError):
         runner.get_data("123-45-6", smiles="CC")
 
-@patch('subprocess.run')
+@patch('epysuite.process.run')
 def test_get_data_execution_error(mock_run, mock_config):
     """Test execution error handling."""
     runner = EPySuiteRunner(mock_config)
@@ -54,7 +56,14 @@ def test_get_data_execution_error(mock_run, mock_config):
     with pytest.raises(ExecutionError):
         runner.get_data("123-45-6", smiles="CC")
 
-@patch('subprocess.run')
+def test_get_data_launch_error(mock_config):
+    """Test that an executable that cannot be started raises ExecutionError."""
+    runner = EPySuiteRunner(mock_config)
+    
+    with pytest.raises(ExecutionError, match="Could not start"):
+        runner.get_data("123-45-6", smiles="CC")
+
+@patch('epysuite.process.run')
 def test_smiles_lookup(mock_run, mock_config):
     """Test SMILES lookup."""
     runner = EPySuiteRunner(mock_config)
@@ -64,4 +73,241 @@ def test_smiles_lookup(mock_run, mock_config):
     (runner.config.es_dir / "cas_res.txt").write_text("CC\n")
     
     df = runner.get_data("123-45-6")
-    assert mock_run.call_count == 2  # One for SMILES lookup, one for data
\ No newline at end of file
+    assert mock_run.call_count == 2  # One for SMILES lookup, one for data
+
+@patch('epysuite.process.run')
+def test_get_data_batch(mock_run, mock_config, write_tabout):
+    """Test parallel batch runs in isolated workspaces."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    
+    df = runner.get_data_batch(
+        [("50-00-0", "C=O"), ("64-17-5", "CCO"), ("71-43-2", "c1ccccc1")],
+        workers=2
+    )
+    assert list(df["cas_rn"]) == ["50-00-0", "64-17-5", "71-43-2"]
+    assert list(df["SMILES"]) == ["C=O", "CCO", "c1ccccc1"]
+    # Every run happened in a workspace, never in the installation itself
+    assert all(call.kwargs["cwd"] != str(mock_config.es_dir) for call in mock_run.call_args_list)
+    assert not (mock_config.es_dir / "tabout.txt").exists()
+
+@patch('epysuite.process.run')
+def test_get_data_batch_skip_errors(mock_run, mock_config, write_tabout):
+    """Test skipping failed records in a batch."""
+    runner = EPySuiteRunner(mock_config)
+    
+    def side_effect(args, cwd, **kwargs):
+        if "CCO" in (Path(cwd) / "epi_inp.txt").read_text():
+            raise subprocess.CalledProcessError(1, "test")
+        return write_tabout(args, cwd, **kwargs)
+    mock_run.side_effect = side_effect
+    
+    df = runner.get_data_batch(
+        [("50-00-0", "C=O"), ("64-17-5", "CCO")],
+        workers=2,
+        on_error="skip"
+    )
+    assert list(df["cas_rn"]) == ["50-00-0"]
+    assert isinstance(runner.last_batch.errors["64-17-5"], ExecutionError)
+
+@patch('epysuite.process.run')
+def test_get_data_batch_chunked(mock_run, mock_config, write_tabout):
+    """Test packing several chemicals into one EPI Suite launch."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    records = [(f"{i}-00-0", "C" * (i + 1)) for i in range(5)]
+    
+    df = runner.get_data_batch(records, chunk_size=3)
+    assert mock_run.call_count == 2
+    assert list(df["cas_rn"]) == [cas for cas, _ in records]
+    assert list(df["SMILES"]) == [smiles for _, smiles in records]
+
+@patch('epysuite.process.run')
+def test_get_data_batch_chunk_bisection(mock_run, mock_config, write_tabout):
+    """Test isolating a bad structure inside a failing chunk."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    records = [("1-00-0", "C"), ("2-00-0", "C!"), ("3-00-0", "CC"), ("4-00-0", "CCC")]
+    
+    df = runner.get_data_batch(records, chunk_size=4, on_error="skip")
+    assert list(df["cas_rn"]) == ["1-00-0", "3-00-0", "4-00-0"]
+    assert list(runner.last_batch.errors) == ["2-00-0"]
+
+@patch('epysuite.process.run')
+def test_get_data_batch_dedup(mock_run, mock_config, write_tabout):
+    """Test running duplicate structures once and copying the result."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    records = [("64-17-5", "CCO"), ("50-00-0", "C=O"), ("1-00-0", "CCO "), ("2-00-0", "C!"), ("3-00-0", "C!")]
+    
+    df = runner.get_data_batch(records, on_error="skip")
+    assert mock_run.call_count == 3
+    assert list(df["cas_rn"]) == ["64-17-5", "50-00-0", "1-00-0"]
+    assert list(df["Chemical name"]) == ["64-17-5", "50-00-0", "1-00-0"]
+    assert list(df["STP Total Removal (%)"]) == [3.5, 3.5, 3.5]
+    # A failed structure fails every record sharing it
+    assert list(runner.last_batch.errors) == ["2-00-0", "3-00-0"]
+    assert runner.last_batch.unique == 3
+    assert runner.last_batch.dedup_ratio == 0.4
+    
+    mock_run.reset_mock()
+    runner.config.dedup = False
+    runner.get_data_batch(records, on_error="skip")
+    assert mock_run.call_count == 5
+
+@patch('epysuite.process.run')
+def test_get_data_batch_dedup_shared_cas_rn(mock_run, mock_config, write_tabout):
+    """Test matching rows to records by position when a chunk repeats a CAS RN."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    
+    df = runner.get_data_batch([("1-00-0", "CC"), ("1-00-0", "CCC"), ("2-00-0", "CC")], chunk_size=2)
+    assert mock_run.call_count == 1
+    assert list(df["cas_rn"]) == ["1-00-0", "1-00-0", "2-00-0"]
+    assert list(df["SMILES"]) == ["CC", "CCC", "CC"]
+    assert list(df["STP Total Removal (%)"]) == [2.5, 3.5, 2.5]
+
+@patch('epysuite.process.run')
+def test_get_data_cached(mock_run, mock_config, write_tabout, tmp_path):
+    """Test serving repeated runs from the result cache."""
+    mock_config.cache_path = tmp_path / "cache.db"
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    
+    first = runner.get_data("64-17-5", smiles="CCO")
+    (mock_config.es_dir / "tabout.txt").unlink()
+    second = runner.get_data("64-17-5", smiles="CCO")
+    assert mock_run.call_count == 1
+    assert list(second.columns) == list(first.columns)
+    assert list(second["SMILES"]) == ["CCO"]
+    
+    runner.get_data("64-17-5", smiles="CCO", stp_config=STPConfig(biowin=False, halflife_hr=2.0))
+    assert mock_run.call_count == 2
+    
+    runner.get_data_batch([("64-17-5", "CCO"), ("50-00-0", "C=O")], chunk_size=2)
+    assert mock_run.call_count == 3
+    assert runner.cache.stats()["hits"] == 2
+
+@patch('epysuite.process.run')
+def test_resolve_smiles(mock_run, mock_config, tmp_path):
+    """Test bulk SMILES lookup with a persistent CAS RN table."""
+    mock_config.cache_path = tmp_path / "cache.db"
+    known = {"71-43-2": "c1ccccc1", "67-64-1": "CC(=O)C"}
+    
+    def side_effect(args, cwd, **kwargs):
+        cas_rn = (Path(cwd) / "epi_inp.txt").read_text().splitlines()[1]
+        (Path(cwd) / "cas_res.txt").write_text(known.get(cas_rn, "") + "\n")
+        return Mock(returncode=0)
+    mock_run.side_effect = side_effect
+    
+    runner = EPySuiteRunner(mock_config)
+    resolved = runner.resolve_smiles(["71-43-2", "67-64-1", "0-00-0", "71-43-2"], workers=2)
+    assert resolved == {"71-43-2": "c1ccccc1", "67-64-1": "CC(=O)C", "0-00-0": None}
+    assert mock_run.call_count == 3
+    
+    # Hits and misses are both answered from the table
+    assert runner.resolve_smiles(["67-64-1", "0-00-0"]) == {"67-64-1": "CC(=O)C", "0-00-0": None}
+    with pytest.raises(SmilesNotFoundError):
+        runner.get_data("0-00-0")
+    assert mock_run.call_count == 3
+
+@patch('epysuite.process.run')
+def test_write_data_resume(mock_run, mock_config, write_tabout, tmp_path):
+    """Test streaming results to a sink and resuming a finished job."""
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    records = [(f"{i}-00-0", "C" * (i + 1)) for i in range(6)]
+    
+    frames = list(runner.iter_data(records[:3], workers=2))
+    assert sorted(cas for df in frames for cas in df["cas_rn"]) == ["0-00-0", "1-00-0", "2-00-0"]
+    
+    with ParquetSink(tmp_path / "out", rows_per_part=2) as sink:
+        runner.write_data(records[:4], sink, chunk_size=2)
+    assert mock_run.call_count == 5
+    
+    sink = ParquetSink(tmp_path / "out")
+    runner.write_data(records, sink, chunk_size=2)
+    assert mock_run.call_count == 6
+    assert sorted(sink.read(format="pandas")["cas_rn"]) == [cas for cas, _ in records]
+
+@patch('epysuite.process.run')
+def test_get_data_stp_fast_path(mock_run, mock_config, write_tabout):
+    """Test rerunning only STPWIN32 when just the STP configuration changes."""
+    mock_config.stp_fast_path = True
+    runner = EPySuiteRunner(mock_config)
+    
+    def side_effect(args, cwd, **kwargs):
+        if args[0].endswith("STPWIN32.exe"):
+            halflife = float((Path(cwd) / "stpvalsx").read_text().splitlines()[2])
+            (Path(cwd) / "tabout.txt").write_text(f"STP Total Removal (%)\n{100 - halflife}\n")
+            return Mock(returncode=0)
+        return write_tabout(args, cwd, **kwargs)
+    mock_run.side_effect = side_effect
+    
+    runner.get_data("64-17-5", smiles="CCO")
+    df = runner.get_data("64-17-5", smiles="CCO", stp_config=STPConfig(biowin=False, halflife_hr=4.0))
+    assert [call.args[0][0].endswith("STPWIN32.exe") for call in mock_run.call_args_list] == [False, True]
+    assert list(df["SMILES"]) == ["CCO"]
+    assert list(df["STP Total Removal (%)"]) == [96.0]
+    
+    # A different chemical needs the full suite again
+    runner.get_data("50-00-0", smiles="C=O", stp_config=STPConfig(biowin=False, halflife_hr=4.0))
+    assert not mock_run.call_args.args[0][0].endswith("STPWIN32.exe")
+
+@patch('epysuite.process.run')
+def test_sweep_halflife(mock_run, mock_config, write_tabout):
+    """Test sweeping STP half-lives while staging the chemical input once per workspace."""
+    runner = EPySuiteRunner(mock_config)
+    inputs = []
+    
+    def side_effect(args, cwd, **kwargs):
+        inputs.append((cwd, (Path(cwd) / "epi_inp.txt").stat().st_mtime_ns))
+        write_tabout(args, cwd, **kwargs)
+        halflife = float((Path(cwd) / "stpvalsx").read_text().splitlines()[2])
+        (Path(cwd) / "tabout.txt").write_text(f"Chemical name\tSTP Total Removal (%)\n64-17-5\t{100 - halflife}\n")
+        return Mock(returncode=0)
+    mock_run.side_effect = side_effect
+    
+    df = runner.sweep_halflife("64-17-5", smiles="CCO", halflives=[1, 2, 4, 8, 16], workers=2)
+    assert list(df["halflife_hr"]) == [1.0, 2.0, 4.0, 8.0, 16.0]
+    assert list(df["STP Total Removal (%)"]) == [99.0, 98.0, 96.0, 92.0, 84.0]
+    # Each workspace wrote the chemical input once
+    assert len(set(inputs)) == 2
+
+@patch('epysuite.process.run')
+def test_column_projection(mock_run, mock_config, write_tabout, tmp_path):
+    """Test parsing only the configured or requested columns."""
+    mock_config.cache_path = tmp_path / "cache.db"
+    mock_config.columns = ["STP Total Removal (%)"]
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    
+    df = runner.get_data("64-17-5", smiles="CCO")
+    assert list(df.columns) == ["STP Total Removal (%)"]
+    df = runner.get_data("64-17-5", smiles="CCO", columns=["SMILES", "Chemical name"])
+    assert list(df.columns) == ["SMILES", "Chemical name"]
+    assert mock_run.call_count == 2
+    
+    df = runner.get_data_batch([("64-17-5", "CCO"), ("50-00-0", "C=O"), ("71-43-2", "c1ccccc1")], chunk_size=3)
+    assert list(df.columns) == ["cas_rn", "STP Total Removal (%)"]
+    assert list(df["STP Total Removal (%)"]) == [3.5, 3.5, 8.5]
+    assert mock_run.call_count == 3
+
+@patch('epysuite.process.run')
+def test_model_config(mock_run, mock_config, write_tabout):
+    """Test rendering model options and the STP-only preset."""
+    template = (Path(__file__).parents[1] / "src/epysuite/templates/epi_inp.txt").read_text().splitlines()
+    assert [line.rstrip("\n") for line in ModelConfig().get_config_lines()] == template[3:]
+    
+    mock_config.model = ModelConfig.preset("stp_only", log_kow=2.13, river_depth_m=2.5)
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+    df = runner.get_data("71-43-2", smiles="c1ccccc1")
+    assert list(df.columns) == ["Chemical name", "SMILES", "STP Total Removal (%)"]
+    lines = (mock_config.es_dir / "epi_inp.txt").read_text().splitlines()
+    assert lines[7] == "2.13"
+    assert lines[9] == "2.5"
+    assert lines[10:] == template[10:]
+    
+    with pytest.raises(ConfigurationError):
+        ModelConfig.preset("everything")
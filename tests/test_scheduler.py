@@ -0,0 +1,93 @@
+# tests/test_scheduler.py
+
+"""Test adaptive timeouts, retries and quarantine."""
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from epysuite import process
+from epysuite.config import SchedulerPolicy
+from epysuite.runner import EPySuiteRunner
+from epysuite.scheduler import Scheduler
+
+
+def test_adaptive_timeout():
+    """Test that timeouts follow the runtime quantile once enough runs are seen."""
+    scheduler = Scheduler(SchedulerPolicy(min_samples=10, timeout_multiple=3.0, min_timeout=0.5), timeout=20)
+    assert scheduler.timeout("epiwin1.exe", chemicals=2) == 40
+    for _ in range(9):
+        scheduler.observe("epiwin1.exe", 0.2)
+    scheduler.observe("epiwin1.exe", 2.0, chemicals=2)
+    assert scheduler.timeout("epiwin1.exe") == pytest.approx(3.0)
+    assert scheduler.timeout("epiwin1.exe", chemicals=4) == pytest.approx(12.0)
+    assert scheduler.timeout("epiwin1.exe", attempt=1) == pytest.approx(6.0)
+    assert scheduler.timeout("epiwin1.exe", chemicals=4, attempt=3) == 80
+    assert scheduler.timeout("STPWIN32.exe") == 20
+
+@patch('epysuite.process.run')
+def test_retry_and_quarantine(mock_run, mock_config, write_tabout, tmp_path):
+    """Test retrying transient failures and quarantining records that keep failing."""
+    attempts = []
+    timed_out = []
+
+    def side_effect(args, cwd, **kwargs):
+        attempts.append(kwargs["timeout"])
+        if "C!" in open(os.path.join(cwd, "epi_inp.txt")).read():
+            raise subprocess.CalledProcessError(1, args)
+        if not timed_out:
+            timed_out.append(args)
+            raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+        return write_tabout(args, cwd, **kwargs)
+    mock_run.side_effect = side_effect
+
+    mock_config.scheduler = SchedulerPolicy(retries=1, backoff=0, quarantine_path=tmp_path / "quarantine.db")
+    records = [("64-17-5", "CCO"), ("2-00-0", "C!")]
+    runner = EPySuiteRunner(mock_config)
+    df = runner.get_data_batch(records, on_error="skip")
+    # The timed-out record succeeded on its retry; the broken one failed both attempts
+    assert list(df["cas_rn"]) == ["64-17-5"]
+    assert list(runner.last_batch.errors) == ["2-00-0"]
+    assert len(attempts) == 4
+
+    runner.get_data_batch(records, on_error="skip")
+    assert "2-00-0" in runner.scheduler.quarantine
+
+    # Later runs, even from a new runner, skip quarantined records
+    attempts.clear()
+    runner = EPySuiteRunner(mock_config)
+    df = runner.get_data_batch(records)
+    assert list(df["cas_rn"]) == ["64-17-5"]
+    assert runner.last_batch.quarantined == ["2-00-0"]
+    assert runner.last_batch.succeeded == 1
+    assert len(attempts) == 1
+
+    assert runner.scheduler.quarantine.release("2-00-0") == 1
+    assert "2-00-0" not in runner.scheduler.quarantine
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX process groups")
+def test_timeout_kills_process_tree(tmp_path):
+    """Test that a timed-out program's children are killed too."""
+    pid_file = tmp_path / "child.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n"
+    )
+    with pytest.raises(subprocess.TimeoutExpired):
+        process.run([sys.executable, "-c", script], cwd=str(tmp_path), timeout=2)
+
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            os.kill(child, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.05)
+    pytest.fail("child process survived the timeout")
@@ -0,0 +1,49 @@
+# tests/test_server.py
+
+"""Test the local EPY Suite server and client."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from epysuite.config import EPySuiteConfig, STPConfig
+from epysuite.exceptions import ExecutionError
+from epysuite.server import EPySuiteClient, EPySuiteServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="fake EPI Suite executables require POSIX")
+
+
+@pytest.fixture
+def server(tmp_path):
+    from benchmarks.fake_episuite import install
+    es_dir = install(tmp_path / "EPISUITE41", latency=0.3, fail="FAIL")
+    config = EPySuiteConfig(es_dir=es_dir, workers=2, cache_path=tmp_path / "cache.db")
+    with EPySuiteServer(config, port=0) as server:
+        yield server
+
+def test_client_get_data(server):
+    """Test that the client mirrors EPySuiteRunner.get_data."""
+    client = EPySuiteClient(server.url, data_format="polars")
+    df = client.get_data("71-43-2", smiles="c1ccccc1", stp_config=STPConfig(biowin=False, halflife_hr=5.0))
+    assert df["Chemical name"].to_list() == ["71-43-2"]
+    assert df.schema["STP Total Removal (%)"].is_numeric()
+
+    records = EPySuiteClient(server.url, data_format="records").get_data("71-43-2", "c1ccccc1", columns=["SMILES"])
+    assert records == [{"SMILES": "c1ccccc1"}]
+
+    with pytest.raises(ExecutionError):
+        client.get_data("1-00-0", smiles="CFAIL")
+
+def test_concurrent_requests_are_coalesced(server):
+    """Test that identical concurrent requests share one run and others queue for workspaces."""
+    client = EPySuiteClient(server.url, data_format="records")
+    requests = [("71-43-2", "c1ccccc1")] * 4 + [("64-17-5", "CCO"), ("50-00-0", "C=O")]
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        results = list(executor.map(lambda args: client.get_data(*args), requests))
+    assert [result[0]["Chemical name"] for result in results] == [cas for cas, _ in requests]
+
+    health = client.health()
+    assert health["requests"] == 6
+    assert health["coalesced"] >= 1
+    assert health["in_flight"] == 0
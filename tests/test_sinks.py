@@ -0,0 +1,52 @@
+# tests/test_sinks.py
+
+"""Test checkpointed result sinks."""
+
+import pandas as pd
+import polars as pl
+
+from epysuite.sinks import MANIFEST_NAME, CsvSink, ParquetSink
+
+
+def test_parquet_sink_parts(tmp_path):
+    """Test sealing buffered rows into part files."""
+    with ParquetSink(tmp_path / "out", rows_per_part=2) as sink:
+        sink.write(pl.DataFrame({"cas_rn": ["1-00-0"], "x": [1.0]}))
+        assert not list(sink.path.glob("part-*"))
+        sink.write(pl.DataFrame({"cas_rn": ["2-00-0", "3-00-0"], "x": [2.0, 3.0]}))
+        sink.write(pl.DataFrame({"cas_rn": ["4-00-0"], "x": [4.0]}))
+    
+    assert len(list(sink.path.glob("part-*.parquet"))) == 2
+    assert sink.read()["cas_rn"].to_list() == ["1-00-0", "2-00-0", "3-00-0", "4-00-0"]
+    assert ParquetSink(tmp_path / "out").completed == {"1-00-0", "2-00-0", "3-00-0", "4-00-0"}
+
+def test_parquet_sink_resume_after_crash(tmp_path):
+    """Test discarding parts and manifest lines that were never committed."""
+    with ParquetSink(tmp_path / "out") as sink:
+        sink.write(pd.DataFrame({"cas_rn": ["1-00-0"], "x": [1.0]}))
+    (sink.path / "part-00001.parquet").write_bytes(b"partial")
+    with open(sink.path / MANIFEST_NAME, "a") as file:
+        file.write('{"part": "part-00001.parq')
+    
+    sink = ParquetSink(tmp_path / "out")
+    assert sink.completed == {"1-00-0"}
+    assert not (sink.path / "part-00001.parquet").exists()
+    sink.write(pd.DataFrame({"cas_rn": ["2-00-0"], "x": [2.0]}))
+    sink.close()
+    assert list(sink.read(format="pandas")["cas_rn"]) == ["1-00-0", "2-00-0"]
+
+def test_csv_sink_widens_header(tmp_path):
+    """Test keeping columns that only appear in later frames."""
+    path = tmp_path / "results.csv"
+    with CsvSink(path) as sink:
+        sink.write(pl.DataFrame({"cas_rn": ["1-00-0"], "x": [1.0]}))
+        sink.write(pl.DataFrame({"cas_rn": ["2-00-0"], "x": [2.0], "Measured Log Kow": [4.69]}))
+        sink.write(pl.DataFrame({"cas_rn": ["3-00-0"], "x": [3.0]}))
+    
+    assert path.read_text().splitlines() == [
+        "cas_rn,x,Measured Log Kow", "1-00-0,1.0,", "2-00-0,2.0,4.69", "3-00-0,3.0,"
+    ]
+    assert not path.with_name("results.csv.tmp").exists()
+    sink = CsvSink(path)
+    assert sink.completed == {"1-00-0", "2-00-0", "3-00-0"}
+    assert sink.read("polars")["Measured Log Kow"].to_list() == [None, 4.69, None]
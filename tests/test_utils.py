@@ -6,7 +6,7 @@ import pytest
 from pathlib import Path
 import polars as pl
 import pandas as pd
-from epysuite.utils import read_file, write_file, parse_summary, clean_outputs
+from epysuite.utils import read_file, write_file, parse_summary, parse_tabout, clean_outputs, StagedFiles
 from epysuite.exceptions import FileHandlingError
 
 def test_read_file(tmp_path):
@@ -66,4 +66,43 @@ def test_clean_outputs(tmp_path):
     assert not list(tmp_path.glob("*.epi"))
     assert not (tmp_path / "tabout.txt").exists()
     # Check that other files remain
-    assert (tmp_path / "other.txt").exists()
\ No newline at end of file
+    assert (tmp_path / "other.txt").exists()
+
+def test_clean_outputs_named(tmp_path):
+    """Test removing exactly the named output files."""
+    (tmp_path / "tabout.txt").touch()
+    (tmp_path / "other.epi").touch()
+    assert clean_outputs(tmp_path, ["tabout.txt", "sumbrief.epi"]) == ["tabout.txt"]
+    assert not (tmp_path / "tabout.txt").exists()
+    assert (tmp_path / "other.epi").exists()
+
+def test_staged_files(tmp_path):
+    """Test skipping rewrites of unchanged staged files."""
+    path = tmp_path / "stpvalsx"
+    staged = StagedFiles()
+    assert staged.write(path, ["1\n", "2\n"])
+    assert not staged.write(path, ["1\n", "2\n"])
+    assert staged.write(path, ["1\n", "3\n"])
+    assert read_file(path) == ["1\n", "3\n"]
+    # Files changed behind its back are rewritten
+    path.write_text("edited\n")
+    assert staged.write(path, ["1\n", "3\n"])
+    path.unlink()
+    assert staged.write(path, ["1\n", "3\n"])
+    assert path.read_text() == "1\n3\n"
+
+def test_parse_tabout_polars(tmp_path):
+    """Test parsing tabout file to polars DataFrame."""
+    test_file = tmp_path / "tabout.txt"
+    test_file.write_text(
+        "Chemical name\tSMILES\tLog Kow\tEmpty\tBlank\tFlag\n"
+        "71-43-2\t c1ccccc1 \t 1.99\t\t  \tNA\n"
+        "67-64-1\tCC(=O)C\t\t\t\t1\n"
+    )
+    
+    df = parse_tabout(test_file, format="polars")
+    assert df.columns == ["Chemical name", "SMILES", "Log Kow", "Flag"]
+    assert df.schema["Log Kow"] == pl.Float64
+    assert df.schema["Flag"] == pl.String
+    assert df["SMILES"].to_list() == ["c1ccccc1", "CC(=O)C"]
+    assert df["Log Kow"].to_list() == [1.99, None]
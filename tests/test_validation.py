@@ -0,0 +1,108 @@
+# tests/test_validation.py
+
+"""Test pre-flight CAS RN and SMILES validation."""
+
+from unittest.mock import patch
+
+import pytest
+
+from epysuite.exceptions import ValidationError
+from epysuite.runner import EPySuiteRunner
+from epysuite.validation import check_cas, check_smiles, validate_records
+
+VALID_SMILES = [
+    "c1ccccc1", "CC(=O)O", "CLC(CL)CL", "[Na+].[Cl-]", "C[C@@H](O)C(=O)O", "C1CC%10CCC1%10",
+    "F/C=C/F", "[13CH4]", "O=C(O)c1ccccc1 benzoic acid", "Cn1cnc2c1c(=O)n(C)c(=O)n2C",
+]
+
+INVALID_SMILES = [
+    ("", "SMILES is empty"),
+    ("CC(C", "unclosed '('"),
+    ("CC)C", "unmatched ')'"),
+    ("C()C", "empty branch"),
+    ("c1cccc", "unclosed ring bond 1"),
+    ("C1CC2CC1", "unclosed ring bond 2"),
+    ("CC[NH4+", "unclosed or malformed bracket atom"),
+    ("CCx", "unexpected character 'x'"),
+    ("=CC", "SMILES cannot start with '='"),
+    ("CC#", "SMILES cannot end with '#'"),
+    ("C..C", "empty component between dots"),
+]
+
+
+def test_check_cas():
+    """Test CAS RN format and check-digit verification."""
+    for cas_rn in ["71-43-2", "64-17-5", "7732-18-5", " 50-00-0 ", "1336-36-3"]:
+        assert check_cas(cas_rn) is None
+    assert check_cas("71-43-3") == "check digit is 3, expected 2"
+    assert "form" in check_cas("71432")
+    assert "form" in check_cas("1-00-0")
+
+@pytest.mark.parametrize("smiles", VALID_SMILES)
+def test_check_smiles_valid(smiles):
+    """Test accepting well-formed SMILES."""
+    assert check_smiles(smiles) is None
+
+@pytest.mark.parametrize("smiles, reason", INVALID_SMILES)
+def test_check_smiles_invalid(smiles, reason):
+    """Test structured reasons for malformed SMILES."""
+    assert check_smiles(smiles) == reason
+
+def test_validate_records():
+    """Test splitting records into valid ones and errors."""
+    valid, invalid = validate_records(["71-43-2", ("64-17-5", "CCO"), ("71-43-3", "C"), ("67-64-1", "CC(C")])
+    assert [record.cas_rn for record in valid] == ["71-43-2", "64-17-5"]
+    assert list(invalid) == ["71-43-3", "67-64-1"]
+    error = invalid["67-64-1"]
+    assert (error.field, error.value, error.reason) == ("smiles", "CC(C", "unclosed '('")
+    assert str(error) == "Invalid SMILES 'CC(C': unclosed '('"
+
+@patch('epysuite.process.run')
+def test_runner_validation(mock_run, mock_config, write_tabout):
+    """Test rejecting invalid records before launching EPI Suite."""
+    mock_config.validate = True
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+
+    with pytest.raises(ValidationError, match="check digit"):
+        runner.get_data("64-17-6", smiles="CCO")
+    with pytest.raises(ValidationError, match="unclosed ring bond"):
+        runner.get_data("64-17-5", smiles="C1CC")
+    with pytest.raises(ValidationError):
+        runner.resolve_smiles(["64-17-6"])
+    assert runner.resolve_smiles(["64-17-6"], on_error="skip") == {}
+    mock_run.assert_not_called()
+
+    df = runner.get_data_batch([("64-17-5", "CCO"), ("64-17-6", "CCO"), ("50-00-0", "C=(")], on_error="skip")
+    assert list(df["cas_rn"]) == ["64-17-5"]
+    assert mock_run.call_count == 1
+    assert runner.last_batch.errors["64-17-6"].field == "cas_rn"
+    assert runner.last_batch.errors["50-00-0"].field == "smiles"
+    assert runner.last_batch.succeeded == 1
+
+    with pytest.raises(ValidationError):
+        runner.get_data_batch([("64-17-5", "CCO"), ("64-17-6", "CCO")])
+    assert mock_run.call_count == 1
+
+    frames = list(runner.iter_data([("64-17-5", "CCO"), ("64-17-6", "CCO")], on_error="skip"))
+    assert len(frames) == 1 and runner.last_batch.total == 2 and runner.last_batch.succeeded == 1
+
+@patch('epysuite.process.run')
+def test_runner_validation_shared_smiles(mock_run, mock_config, write_tabout):
+    """Test checking each distinct SMILES of a batch once and validating sweeps."""
+    mock_config.validate = True
+    runner = EPySuiteRunner(mock_config)
+    mock_run.side_effect = write_tabout
+
+    records = [("64-17-5", "CCO"), ("71-43-2", "CCO"), ("50-00-0", "C=O"), ("67-56-1", "CCO")]
+    with patch('epysuite.validation.check_smiles', wraps=check_smiles) as mock_check:
+        df = runner.get_data_batch(records, chunk_size=4)
+    assert mock_check.call_count == 2
+    assert list(df["cas_rn"]) == ["64-17-5", "71-43-2", "50-00-0", "67-56-1"]
+
+    mock_run.reset_mock()
+    with pytest.raises(ValidationError, match="unclosed '\\('"):
+        runner.sweep_halflife("64-17-5", smiles="CC(C", halflives=[1, 2])
+    with pytest.raises(ValidationError, match="check digit"):
+        runner.sweep_halflife("64-17-6", halflives=[1, 2])
+    mock_run.assert_not_called()
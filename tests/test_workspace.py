@@ -0,0 +1,53 @@
+# tests/test_workspace.py
+
+"""Test EPI Suite workspaces."""
+
+import pytest
+
+from epysuite.exceptions import ConfigurationError
+from epysuite.workspace import Workspace, WorkspacePool, tmpfs_root
+
+
+@pytest.mark.parametrize("link_mode", ["copy", "hardlink", "symlink"])
+def test_workspace_create(mock_config, tmp_path, link_mode):
+    """Test staging a workspace from the installation."""
+    (mock_config.es_dir / "tabout.txt").write_text("stale")
+    (mock_config.es_dir / "data").mkdir()
+    (mock_config.es_dir / "data" / "model.dat").write_text("model")
+    
+    with Workspace.create(mock_config, root=tmp_path / "ws", link_mode=link_mode) as workspace:
+        assert workspace.config.es_dir == workspace.path
+        assert workspace.config.app_path.exists()
+        assert (workspace.path / "data" / "model.dat").read_text() == "model"
+        # Input and output files are private to the workspace
+        assert not (workspace.path / "epi_inp.txt").exists()
+        assert not (workspace.path / "sumbrief.epi").exists()
+        assert not (workspace.path / "tabout.txt").exists()
+    
+    assert not workspace.path.exists()
+    assert (mock_config.es_dir / "epiwin1.exe").exists()
+
+def test_workspace_tmpfs(mock_config):
+    """Test staging a workspace in RAM with links to the installation."""
+    if tmpfs_root() is None:
+        pytest.skip("no /dev/shm on this platform")
+    mock_config.workspace_tmpfs = True
+    with Workspace.create(mock_config) as workspace:
+        assert workspace.path.parent == tmpfs_root()
+        assert workspace.config.app_path.exists()
+        if workspace.path.stat().st_dev != mock_config.es_dir.stat().st_dev:
+            assert workspace.config.app_path.is_symlink()
+
+def test_workspace_invalid_link_mode(mock_config):
+    """Test rejecting an unknown link mode."""
+    with pytest.raises(ConfigurationError):
+        Workspace.create(mock_config, link_mode="move")
+
+def test_workspace_pool(mock_config, tmp_path):
+    """Test borrowing workspaces from a pool."""
+    root = tmp_path / "ws"
+    with WorkspacePool(mock_config, 2, root=root) as pool:
+        assert pool.size == 2
+        with pool.workspace() as first, pool.workspace() as second:
+            assert first.path != second.path
+    assert not list(root.iterdir())